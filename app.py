@@ -2,6 +2,14 @@
 Tableau de Bord Handball - Application Principale
 """
 import streamlit as st
+import pandas as pd
+
+# Copy-on-write pour tout le tableau de bord : les sous-ensembles filtrés par les
+# onglets partagent les données chargées tant qu'ils ne sont pas modifiés, sans
+# .copy() défensif. Réglage global du processus, activé par chaque point d'entrée
+# (app.py et chaque page, qui peut être ouverte directement) et non par
+# src/database.py ; les modules src/analytics n'en dépendent pas.
+pd.set_option("mode.copy_on_write", True)
 
 # Configuration de la page
 st.set_page_config(
@@ -22,6 +30,15 @@ with st.sidebar:
     st.page_link("pages/3_📈_Team_Stats.py", label="Statistiques d'équipes", icon="📈")
     st.page_link("pages/4_👤_Player_Stats.py", label="Statistiques de joueurs", icon="👤")
     st.page_link("pages/5_🏟️_Club_Report.py", label="Rapport de Club", icon="🏟️")
+    st.page_link("pages/6_📋_Match_Detail.py", label="Détail du match", icon="📋")
+    
+    st.markdown("---")
+    try:
+        from src.pages.utils import league_selector
+        league_id = league_selector()
+    except Exception:
+        # La connexion Supabase est vérifiée dans la section statistiques rapides
+        league_id = None
     
     st.markdown("---")
     st.markdown("### 📈 À venir")
@@ -96,7 +113,7 @@ try:
         st.metric("Joueurs", len(players_df))
     
     with col4:
-        matches_df = get_matches()
+        matches_df = get_matches(league_id)
         st.metric("Matchs", len(matches_df))
 
 except Exception as e:
@@ -3,7 +3,12 @@ Page Classements - Voir les classements des équipes et joueurs
 """
 import streamlit as st
 import pandas as pd
-from src.database import get_matches, get_teams
+from src.database import get_team_standings, get_matches, get_teams
+from src.pages.utils import lazy_tabs, league_selector, build_team_form
+from src.pages.rankings import tab_matchday
+
+# Copy-on-write du tableau de bord (voir app.py)
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(page_title="Classements", page_icon="🏆", layout="wide")
 
@@ -26,6 +31,10 @@ with st.sidebar:
     st.page_link("pages/3_📈_Team_Stats.py", label="Statistiques d'équipes", icon="📈")
     st.page_link("pages/4_👤_Player_Stats.py", label="Statistiques de joueurs", icon="👤")
     st.page_link("pages/5_🏟️_Club_Report.py", label="Rapport de Club", icon="🏟️")
+    st.page_link("pages/6_📋_Match_Detail.py", label="Détail du match", icon="📋")
+    
+    st.markdown("---")
+    league_id = league_selector()
     
     st.markdown("---")
     st.info("**Page actuelle:** Classements")
@@ -33,183 +42,103 @@ with st.sidebar:
 st.title("🏆 Classements")
 
 try:
-    # Charger les données
-    matches_df = get_matches()
-    teams_df = get_teams()
+    # Charger les données (vue agrégée des classements)
+    standings_rows_df = get_team_standings(league_id)
+    matches_df = get_matches(league_id)
     
-    if matches_df.empty:
+    if standings_rows_df.empty:
         st.info("Aucune donnée de match disponible. Importez des matchs pour voir les classements !")
     else:
+        if league_id is None:
+            st.caption("Classements toutes compétitions confondues - choisissez une compétition dans la barre latérale.")
+        st.caption("Forme : 5 derniers matchs, du plus ancien au plus récent (V victoire, N nul, D défaite).")
+        
         # Créer des onglets pour les différents classements
-        tab1, tab2, tab3, tab4 = st.tabs(["📊 Classement général", "🏠 Classement domicile", "✈️ Classement extérieur", "⏱️ Classement mi-temps"])
+        # Seul l'onglet sélectionné est calculé et affiché
+        selected_tab = lazy_tabs([
+            "📊 Classement général",
+            "🏠 Classement domicile",
+            "✈️ Classement extérieur",
+            "⏱️ Classement mi-temps",
+            "📅 Classement par journée"
+        ], key="rankings_tab")
         
         # Fonction pour calculer les statistiques
-        def calculate_standings(matches_df, teams_df, match_type='all', score_type='final'):
-            team_stats = []
-            
-            for team_id in teams_df['id'].unique():
-                team_name = teams_df[teams_df['id'] == team_id]['name'].iloc[0]
-                
-                # Initialiser les compteurs
-                wins = 0
-                draws = 0
-                losses = 0
-                goals_for = 0
-                goals_against = 0
-                
-                # Sélectionner les colonnes de score appropriées
-                if score_type == 'halftime':
-                    home_score_col = 'ht_score_home'
-                    away_score_col = 'ht_score_away'
-                else:
-                    home_score_col = 'final_score_home'
-                    away_score_col = 'final_score_away'
-                
-                if match_type in ['all', 'home']:
-                    # Matchs à domicile
-                    home_matches = matches_df[matches_df['home_team_id'] == team_id]
-                    for _, match in home_matches.iterrows():
-                        if pd.notna(match[home_score_col]) and pd.notna(match[away_score_col]):
-                            goals_for += match[home_score_col]
-                            goals_against += match[away_score_col]
-                            
-                            if match[home_score_col] > match[away_score_col]:
-                                wins += 1
-                            elif match[home_score_col] == match[away_score_col]:
-                                draws += 1
-                            else:
-                                losses += 1
-                
-                if match_type in ['all', 'away']:
-                    # Matchs à l'extérieur
-                    away_matches = matches_df[matches_df['away_team_id'] == team_id]
-                    for _, match in away_matches.iterrows():
-                        if pd.notna(match[home_score_col]) and pd.notna(match[away_score_col]):
-                            goals_for += match[away_score_col]
-                            goals_against += match[home_score_col]
-                            
-                            if match[away_score_col] > match[home_score_col]:
-                                wins += 1
-                            elif match[away_score_col] == match[home_score_col]:
-                                draws += 1
-                            else:
-                                losses += 1
-                
-                games_played = wins + draws + losses
-                points = (wins * 3) + (draws * 2) + (losses * 1)  # Victoire = 3pts, Nul = 2pts, Défaite = 1pt
-                
-                if games_played > 0:
-                    team_stats.append({
-                        'Équipe': team_name,
-                        'Pts': points,
-                        'J': games_played,
-                        'V': wins,
-                        'N': draws,
-                        'D': losses,
-                        'BP': int(goals_for),
-                        'BC': int(goals_against),
-                        'Diff': int(goals_for - goals_against),
-                    })
+        # La vue team_standings contient une ligne par ligue, équipe, lieu et type de score
+        # La forme (5 derniers matchs) vient des matchs, calculée pour toutes les équipes à la fois
+        def calculate_standings(standings_rows_df, matches_df, match_type='all', score_type='final'):
+            rows = standings_rows_df[standings_rows_df['score_type'] == score_type]
+            if match_type in ['home', 'away']:
+                rows = rows[rows['venue'] == match_type]
             
-            if team_stats:
-                standings_df = pd.DataFrame(team_stats)
-                # Trier par points, puis différence de buts, puis buts pour
-                standings_df = standings_df.sort_values(
-                    by=['Pts', 'Diff', 'BP'], 
-                    ascending=[False, False, False]
-                ).reset_index(drop=True)
-                
-                # Ajouter la colonne rang
-                standings_df.insert(0, 'Rang', range(1, len(standings_df) + 1))
-                
-                return standings_df
-            else:
+            if rows.empty:
                 return None
-        
-        # Onglet 1: Classement général
-        with tab1:
-            st.markdown("### Classement général")
-            standings_df = calculate_standings(matches_df, teams_df, 'all')
             
-            if standings_df is not None:
-                st.dataframe(
-                    standings_df,
-                    use_container_width=True,
-                    hide_index=True
-                )
-                
-                st.download_button(
-                    label="📥 Télécharger le classement CSV",
-                    data=standings_df.to_csv(index=False).encode('utf-8'),
-                    file_name='classement_general.csv',
-                    mime='text/csv',
-                )
-            else:
-                st.info("Aucun match terminé trouvé.")
-        
-        # Onglet 2: Classement domicile
-        with tab2:
-            st.markdown("### Classement domicile")
-            home_standings_df = calculate_standings(matches_df, teams_df, 'home')
+            team_stats = rows.groupby(['team_id', 'team_name'], observed=True)[
+                ['played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against']
+            ].sum().reset_index()
+            team_stats = team_stats[team_stats['played'] > 0]
             
-            if home_standings_df is not None:
-                st.dataframe(
-                    home_standings_df,
-                    use_container_width=True,
-                    hide_index=True
-                )
-                
-                st.download_button(
-                    label="📥 Télécharger le classement domicile CSV",
-                    data=home_standings_df.to_csv(index=False).encode('utf-8'),
-                    file_name='classement_domicile.csv',
-                    mime='text/csv',
-                )
-            else:
-                st.info("Aucun match à domicile terminé trouvé.")
-        
-        # Onglet 3: Classement extérieur
-        with tab3:
-            st.markdown("### Classement extérieur")
-            away_standings_df = calculate_standings(matches_df, teams_df, 'away')
+            standings_df = pd.DataFrame({
+                'Équipe': team_stats['team_name'],
+                'Pts': team_stats['wins'] * 3 + team_stats['draws'] * 2 + team_stats['losses'] * 1,  # Victoire = 3pts, Nul = 2pts, Défaite = 1pt
+                'J': team_stats['played'],
+                'V': team_stats['wins'],
+                'N': team_stats['draws'],
+                'D': team_stats['losses'],
+                'BP': team_stats['goals_for'].astype(int),
+                'BC': team_stats['goals_against'].astype(int),
+                'Diff': (team_stats['goals_for'] - team_stats['goals_against']).astype(int),
+            })
             
-            if away_standings_df is not None:
-                st.dataframe(
-                    away_standings_df,
-                    use_container_width=True,
-                    hide_index=True
-                )
-                
-                st.download_button(
-                    label="📥 Télécharger le classement extérieur CSV",
-                    data=away_standings_df.to_csv(index=False).encode('utf-8'),
-                    file_name='classement_exterieur.csv',
-                    mime='text/csv',
-                )
-            else:
-                st.info("Aucun match à l'extérieur terminé trouvé.")
+            _, form_summary = build_team_form(matches_df, match_type if match_type in ['home', 'away'] else None, score_type)
+            standings_df['Forme'] = team_stats['team_id'].map(form_summary['form']).fillna('')
+            
+            # Trier par points, puis différence de buts, puis buts pour
+            standings_df = standings_df.sort_values(
+                by=['Pts', 'Diff', 'BP'], 
+                ascending=[False, False, False]
+            ).reset_index(drop=True)
+            
+            # Ajouter la colonne rang
+            standings_df.insert(0, 'Rang', range(1, len(standings_df) + 1))
+            
+            return standings_df
+        
+        # Onglets de classement : titre, matchs retenus, type de score, export et message sans données
+        standings_tabs = {
+            "📊 Classement général": ("Classement général", 'all', 'final', 'classement_general.csv', "📥 Télécharger le classement CSV", "Aucun match terminé trouvé."),
+            "🏠 Classement domicile": ("Classement domicile", 'home', 'final', 'classement_domicile.csv', "📥 Télécharger le classement domicile CSV", "Aucun match à domicile terminé trouvé."),
+            "✈️ Classement extérieur": ("Classement extérieur", 'away', 'final', 'classement_exterieur.csv', "📥 Télécharger le classement extérieur CSV", "Aucun match à l'extérieur terminé trouvé."),
+            "⏱️ Classement mi-temps": ("Classement mi-temps", 'all', 'halftime', 'classement_mi_temps.csv', "📥 Télécharger le classement mi-temps CSV", "Aucun match avec score mi-temps disponible."),
+        }
         
-        # Onglet 4: Classement mi-temps
-        with tab4:
-            st.markdown("### Classement mi-temps")
-            st.info("Classement basé sur les scores à la mi-temps")
-            halftime_standings_df = calculate_standings(matches_df, teams_df, 'all', 'halftime')
+        if selected_tab in standings_tabs:
+            title, match_type, score_type, file_name, download_label, empty_message = standings_tabs[selected_tab]
+            st.markdown(f"### {title}")
+            if score_type == 'halftime':
+                st.info("Classement basé sur les scores à la mi-temps")
+            
+            standings_df = calculate_standings(standings_rows_df, matches_df, match_type, score_type)
             
-            if halftime_standings_df is not None:
+            if standings_df is not None:
                 st.dataframe(
-                    halftime_standings_df,
+                    standings_df,
                     use_container_width=True,
                     hide_index=True
                 )
                 
                 st.download_button(
-                    label="📥 Télécharger le classement mi-temps CSV",
-                    data=halftime_standings_df.to_csv(index=False).encode('utf-8'),
-                    file_name='classement_mi_temps.csv',
+                    label=download_label,
+                    data=standings_df.to_csv(index=False).encode('utf-8'),
+                    file_name=file_name,
                     mime='text/csv',
                 )
             else:
-                st.info("Aucun match avec score mi-temps disponible.")
+                st.info(empty_message)
+        else:
+            # Classement à la journée N
+            tab_matchday.render(matches_df, get_teams())
 
 except Exception as e:
     st.error(f"Erreur lors du chargement des données de classement : {str(e)}")
@@ -3,16 +3,24 @@ Page Statistiques d'équipes - Statistiques détaillées des équipes
 """
 import streamlit as st
 import pandas as pd
-from src.database import get_matches, get_teams, get_player_stats
+from src.database import get_team_goal_stats, get_player_season_stats, get_matches, get_teams, get_action_buckets
 from src.pages.team_stats import (
     tab_goals_scored,
     tab_goals_conceded,
     tab_shooting_percentage,
     tab_saves,
     tab_7m_goals,
-    tab_sanctions
+    tab_sanctions,
+    tab_momentum,
+    tab_heatmap,
+    tab_power_play
 )
 from src.pages.team_stats.utils import calculate_goal_stats
+from src.pages.player_stats.utils import calculate_player_season_stats
+from src.pages.utils import lazy_tabs, league_selector
+
+# Copy-on-write du tableau de bord (voir app.py)
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(page_title="Statistiques d'équipes", page_icon="📈", layout="wide")
 
@@ -35,6 +43,10 @@ with st.sidebar:
     st.page_link("pages/3_📈_Team_Stats.py", label="Statistiques d'équipes", icon="📈")
     st.page_link("pages/4_👤_Player_Stats.py", label="Statistiques de joueurs", icon="👤")
     st.page_link("pages/5_🏟️_Club_Report.py", label="Rapport de Club", icon="🏟️")
+    st.page_link("pages/6_📋_Match_Detail.py", label="Détail du match", icon="📋")
+    
+    st.markdown("---")
+    league_id = league_selector()
     
     st.markdown("---")
     st.info("**Page actuelle:** Statistiques d'équipes")
@@ -43,44 +55,54 @@ st.title("📈 Statistiques d'équipes")
 st.write("Consultez les statistiques détaillées des équipes.")
 
 try:
-    # Charger les données
-    matches_df = get_matches()
-    teams_df = get_teams()
-    player_stats_df = get_player_stats()
+    # Charger les données (vues agrégées par saison)
+    goal_totals_df = get_team_goal_stats(league_id)
     
-    if matches_df.empty:
+    if goal_totals_df.empty:
         st.info("Aucune donnée de match disponible. Importez des matchs pour voir les statistiques !")
     else:
-        # Calculer les statistiques de buts pour les onglets qui en ont besoin
-        stats_df = calculate_goal_stats(matches_df, teams_df)
-        
         # Créer des onglets pour différentes statistiques
-        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+        # Seul l'onglet sélectionné est calculé et affiché
+        selected_tab = lazy_tabs([
             "⚽ Buts marqués", 
             "🥅 Buts encaissés", 
             "🎯 Pourcentage de réussite", 
             "🧤 Arrêts", 
             "🎯 Buts 7m", 
-            "⚠️ Sanctions"
-        ])
-        
-        with tab1:
-            tab_goals_scored.render(matches_df, teams_df, player_stats_df, stats_df)
-        
-        with tab2:
-            tab_goals_conceded.render(matches_df, teams_df, player_stats_df, stats_df)
-        
-        with tab3:
-            tab_shooting_percentage.render(matches_df, teams_df, player_stats_df, stats_df)
-        
-        with tab4:
-            tab_saves.render(matches_df, teams_df, player_stats_df, stats_df)
+            "⚠️ Sanctions",
+            "📈 Dynamique de match",
+            "🔥 Carte de chaleur",
+            "⚖️ Supériorité numérique"
+        ], key="team_stats_tab")
         
-        with tab5:
-            tab_7m_goals.render(matches_df, teams_df, player_stats_df, stats_df)
+        tab_modules = {
+            "⚽ Buts marqués": tab_goals_scored,
+            "🥅 Buts encaissés": tab_goals_conceded,
+            "🎯 Pourcentage de réussite": tab_shooting_percentage,
+            "🧤 Arrêts": tab_saves,
+            "🎯 Buts 7m": tab_7m_goals,
+            "⚠️ Sanctions": tab_sanctions
+        }
         
-        with tab6:
-            tab_sanctions.render(matches_df, teams_df, player_stats_df, stats_df)
+        if selected_tab == "📈 Dynamique de match":
+            # Calculé sur le déroulé des matchs, téléchargé seulement quand les matchs changent
+            tab_momentum.render(league_id, get_matches(league_id), get_teams())
+        elif selected_tab == "🔥 Carte de chaleur":
+            # Comptes par tranche précalculés à l'import (table action_buckets)
+            tab_heatmap.render(get_action_buckets(league_id), get_teams())
+        elif selected_tab == "⚖️ Supériorité numérique":
+            # Fenêtres d'exclusion calculées sur le déroulé, téléchargé seulement quand les matchs changent
+            tab_power_play.render(league_id, get_matches(league_id), get_teams())
+        else:
+            # Statistiques de buts par équipe (nombre de matchs joués pour tous les onglets)
+            stats_df = calculate_goal_stats(goal_totals_df)
+            
+            # Les totaux des joueurs ne servent qu'aux onglets basés sur les feuilles de match
+            season_stats = pd.DataFrame()
+            if selected_tab not in ("⚽ Buts marqués", "🥅 Buts encaissés"):
+                season_stats = calculate_player_season_stats(get_player_season_stats(league_id))
+            
+            tab_modules[selected_tab].render(stats_df, season_stats)
 
 except Exception as e:
     st.error(f"Erreur lors du chargement des statistiques : {e}")
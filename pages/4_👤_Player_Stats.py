@@ -2,7 +2,13 @@
 Page Statistiques de joueurs - Statistiques individuelles des joueurs
 """
 import streamlit as st
-from src.database import get_player_stats, get_matches, get_teams
+import pandas as pd
+from src.database import (
+    get_matches,
+    get_teams,
+    get_player_season_stats,
+    get_goalkeeper_season_stats
+)
 from src.pages.player_stats import (
     tab_goal_scorers,
     tab_goalkeepers,
@@ -12,6 +18,11 @@ from src.pages.player_stats import (
     tab_best_goalkeeper_performances,
     tab_sanctions
 )
+from src.pages.player_stats.utils import calculate_player_season_stats
+from src.pages.utils import lazy_tabs, league_selector
+
+# Copy-on-write du tableau de bord (voir app.py)
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(page_title="Statistiques de joueurs", page_icon="👤", layout="wide")
 
@@ -34,6 +45,10 @@ with st.sidebar:
     st.page_link("pages/3_📈_Team_Stats.py", label="Statistiques d'équipes", icon="📈")
     st.page_link("pages/4_👤_Player_Stats.py", label="Statistiques de joueurs", icon="👤")
     st.page_link("pages/5_🏟️_Club_Report.py", label="Rapport de Club", icon="🏟️")
+    st.page_link("pages/6_📋_Match_Detail.py", label="Détail du match", icon="📋")
+    
+    st.markdown("---")
+    league_id = league_selector()
     
     st.markdown("---")
     st.info("**Page actuelle:** Statistiques de joueurs")
@@ -42,52 +57,53 @@ st.title("👤 Statistiques de joueurs")
 st.write("Consultez les statistiques individuelles des joueurs.")
 
 try:
-    # Charger les données
-    player_stats_df = get_player_stats()
-    matches_df = get_matches()
-    teams_df = get_teams()
+    # Créer des onglets pour différentes statistiques
+    # Seul l'onglet sélectionné est calculé et affiché
+    selected_tab = lazy_tabs([
+        "⚽ Classement des buteurs", 
+        "🧤 Classement des gardiens", 
+        "🎯 Classement des 7m",
+        "🌟 Meilleures performances",
+        "🎯 Meilleures perf. 7m",
+        "🧤 Meilleures perf. gardiens",
+        "⚠️ Classement des sanctions"
+    ], key="player_stats_tab")
     
-    if player_stats_df.empty:
-        st.info("Aucune donnée de joueur disponible. Importez des matchs pour voir les statistiques !")
-    else:
-        # Créer des onglets pour différentes statistiques
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "⚽ Classement des buteurs", 
-            "🧤 Classement des gardiens", 
-            "🎯 Classement des 7m",
-            "🌟 Meilleures performances",
-            "🎯 Meilleures perf. 7m",
-            "🧤 Meilleures perf. gardiens",
-            "⚠️ Classement des sanctions"
-        ])
-        
-        # Onglet 1: Classement des buteurs
-        with tab1:
-            tab_goal_scorers.render(player_stats_df, matches_df, teams_df)
-        
-        # Onglet 2: Classement des gardiens
-        with tab2:
-            tab_goalkeepers.render(player_stats_df, matches_df, teams_df)
-        
-        # Onglet 3: Classement des 7m
-        with tab3:
-            tab_7m_ranking.render(player_stats_df, matches_df, teams_df)
-        
-        # Onglet 4: Meilleures performances
-        with tab4:
-            tab_best_performances.render(player_stats_df, matches_df, teams_df)
-        
-        # Onglet 5: Meilleures performances 7m
-        with tab5:
-            tab_best_7m_performances.render(player_stats_df, matches_df, teams_df)
+    # Classements de saison : lus dans les vues agrégées
+    season_tabs = {
+        "⚽ Classement des buteurs": tab_goal_scorers,
+        "🎯 Classement des 7m": tab_7m_ranking,
+        "⚠️ Classement des sanctions": tab_sanctions
+    }
+    # Meilleures performances : une ligne par joueur et par match
+    match_tabs = {
+        "🌟 Meilleures performances": tab_best_performances,
+        "🎯 Meilleures perf. 7m": tab_best_7m_performances,
+        "🧤 Meilleures perf. gardiens": tab_best_goalkeeper_performances
+    }
+    
+    no_data_message = "Aucune donnée de joueur disponible. Importez des matchs pour voir les statistiques !"
+    
+    if selected_tab in season_tabs:
+        season_totals_df = get_player_season_stats(league_id)
         
-        # Onglet 6: Meilleures performances gardiens
-        with tab6:
-            tab_best_goalkeeper_performances.render(player_stats_df, matches_df, teams_df)
+        if season_totals_df.empty:
+            st.info(no_data_message)
+        else:
+            season_tabs[selected_tab].render(calculate_player_season_stats(season_totals_df))
+    
+    elif selected_tab in match_tabs:
+        # Lignes joueur x match chargées par l'onglet, téléchargées seulement quand les matchs changent
+        matches_df = get_matches(league_id)
         
-        # Onglet 7: Classement des sanctions
-        with tab7:
-            tab_sanctions.render(player_stats_df, matches_df, teams_df)
+        if matches_df.empty:
+            st.info(no_data_message)
+        else:
+            match_tabs[selected_tab].render(league_id, matches_df, get_teams())
+    
+    else:
+        goalkeeper_totals_df = get_goalkeeper_season_stats(league_id)
+        tab_goalkeepers.render(goalkeeper_totals_df)
 
 except Exception as e:
     st.error(f"Erreur lors du chargement des statistiques : {str(e)}")
@@ -4,7 +4,13 @@ Page Rapport de Club - Rechercher et analyser les statistiques d'un club
 import streamlit as st
 import pandas as pd
 import traceback
-from src.database import get_matches, get_teams, get_player_stats
+from src.database import get_matches, get_teams, get_player_season_stats, get_head_to_head, get_team_ratings
+from src.pages.player_stats.utils import calculate_player_season_stats
+from src.pages.utils import league_selector, build_match_labels, build_team_form
+from src.pages.club_report import head_to_head, recent_form, rated_results
+
+# Copy-on-write du tableau de bord (voir app.py)
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(page_title="Rapport de Club", page_icon="🏟️", layout="wide")
 
@@ -27,6 +33,10 @@ with st.sidebar:
     st.page_link("pages/3_📈_Team_Stats.py", label="Statistiques d'équipes", icon="📈")
     st.page_link("pages/4_👤_Player_Stats.py", label="Statistiques de joueurs", icon="👤")
     st.page_link("pages/5_🏟️_Club_Report.py", label="Rapport de Club", icon="🏟️")
+    st.page_link("pages/6_📋_Match_Detail.py", label="Détail du match", icon="📋")
+    
+    st.markdown("---")
+    league_id = league_selector()
     
     st.markdown("---")
     st.info("**Page actuelle:** Rapport de Club")
@@ -36,9 +46,19 @@ st.write("Recherchez un club et consultez ses statistiques détaillées.")
 
 try:
     # Charger les données
-    matches_df = get_matches()
+    matches_df = get_matches(league_id)
     teams_df = get_teams()
-    player_stats_df = get_player_stats()
+    season_totals_df = get_player_season_stats(league_id)
+    head_to_head_df = get_head_to_head(league_id)
+    ratings_df = get_team_ratings(league_id)
+    
+    # Limiter la liste des clubs à ceux de la compétition sélectionnée
+    if league_id is not None and not teams_df.empty:
+        if matches_df.empty:
+            teams_df = teams_df.iloc[0:0]
+        else:
+            league_team_ids = pd.concat([matches_df['home_team_id'], matches_df['away_team_id']])
+            teams_df = teams_df[teams_df['id'].isin(league_team_ids)]
     
     if teams_df.empty:
         st.info("Aucune équipe disponible. Importez des matchs pour commencer !")
@@ -64,7 +84,7 @@ try:
             team_matches = matches_df[
                 (matches_df['home_team_id'] == team_id) | 
                 (matches_df['away_team_id'] == team_id)
-            ].copy()
+            ]
             
             if team_matches.empty:
                 st.info(f"Aucun match trouvé pour {selected_team}")
@@ -225,154 +245,19 @@ try:
                 
                 st.markdown("---")
                 
-                # === MEILLEURE VICTOIRE ET PIRE DÉFAITE ===
-                st.markdown("### 🏆 Meilleure Victoire & 😞 Pire Défaite")
-                
-                # Calculer le classement de toutes les équipes
-                def calculate_team_ranking(matches_df, teams_df):
-                    team_stats = {}
-                    
-                    for tid in teams_df['id'].unique():
-                        wins = 0
-                        draws = 0
-                        losses = 0
-                        goals_for = 0
-                        goals_against = 0
-                        
-                        # Matchs à domicile
-                        home_matches = matches_df[matches_df['home_team_id'] == tid]
-                        for _, match in home_matches.iterrows():
-                            if pd.notna(match['final_score_home']) and pd.notna(match['final_score_away']):
-                                goals_for += match['final_score_home']
-                                goals_against += match['final_score_away']
-                                if match['final_score_home'] > match['final_score_away']:
-                                    wins += 1
-                                elif match['final_score_home'] == match['final_score_away']:
-                                    draws += 1
-                                else:
-                                    losses += 1
-                        
-                        # Matchs à l'extérieur
-                        away_matches = matches_df[matches_df['away_team_id'] == tid]
-                        for _, match in away_matches.iterrows():
-                            if pd.notna(match['final_score_home']) and pd.notna(match['final_score_away']):
-                                goals_for += match['final_score_away']
-                                goals_against += match['final_score_home']
-                                if match['final_score_away'] > match['final_score_home']:
-                                    wins += 1
-                                elif match['final_score_away'] == match['final_score_home']:
-                                    draws += 1
-                                else:
-                                    losses += 1
-                        
-                        points = wins * 3 + draws * 2 + losses * 1
-                        goal_diff = goals_for - goals_against
-                        team_stats[tid] = {
-                            'points': points,
-                            'goal_diff': goal_diff,
-                            'goals_for': goals_for
-                        }
-                    
-                    # Trier les équipes par points, puis différence de buts, puis buts marqués
-                    sorted_teams = sorted(team_stats.items(), 
-                                        key=lambda x: (x[1]['points'], x[1]['goal_diff'], x[1]['goals_for']), 
-                                        reverse=True)
-                    
-                    # Créer un dictionnaire avec les rangs
-                    team_ranks = {}
-                    for rank, (tid, stats) in enumerate(sorted_teams, 1):
-                        team_ranks[tid] = rank
-                    
-                    return team_ranks
-                
-                team_rankings = calculate_team_ranking(matches_df, teams_df)
-                
-                # Fonction pour formater le rang avec suffixe ordinal
-                def format_rank(rank):
-                    if rank == 1:
-                        return "1er"
-                    else:
-                        return f"{rank}e"
-                
-                # Trouver la meilleure victoire et la pire défaite
-                best_win = None
-                worst_defeat = None
-                best_win_opponent_rank = float('inf')  # Plus petit rang = meilleure équipe
-                worst_defeat_opponent_rank = -1  # Plus grand rang = moins bonne équipe
-                
-                for _, match in team_matches.iterrows():
-                    if pd.notna(match['final_score_home']) and pd.notna(match['final_score_away']):
-                        is_home = match['home_team_id'] == team_id
-                        
-                        if is_home:
-                            team_score = match['final_score_home']
-                            opponent_score = match['final_score_away']
-                            opponent_id = match['away_team_id']
-                        else:
-                            team_score = match['final_score_away']
-                            opponent_score = match['final_score_home']
-                            opponent_id = match['home_team_id']
-                        
-                        opponent_rank = team_rankings.get(opponent_id, 999)
-                        opponent_name = teams_df[teams_df['id'] == opponent_id]['name'].iloc[0]
-                        
-                        # Victoire - chercher contre l'équipe la mieux classée (rang le plus bas)
-                        if team_score > opponent_score:
-                            if opponent_rank < best_win_opponent_rank:
-                                best_win_opponent_rank = opponent_rank
-                                best_win = {
-                                    'opponent': opponent_name,
-                                    'score_for': int(team_score),
-                                    'score_against': int(opponent_score),
-                                    'date': match['match_date'],
-                                    'is_home': is_home,
-                                    'opponent_rank': opponent_rank
-                                }
-                        
-                        # Défaite - chercher contre l'équipe la moins bien classée (rang le plus élevé)
-                        elif team_score < opponent_score:
-                            if opponent_rank > worst_defeat_opponent_rank:
-                                worst_defeat_opponent_rank = opponent_rank
-                                worst_defeat = {
-                                    'opponent': opponent_name,
-                                    'score_for': int(team_score),
-                                    'score_against': int(opponent_score),
-                                    'date': match['match_date'],
-                                    'is_home': is_home,
-                                    'opponent_rank': opponent_rank
-                                }
-                
-                col_win, col_defeat = st.columns(2)
+                # === FORME RÉCENTE ===
+                form_history, form_summary = build_team_form(matches_df)
+                recent_form.render(form_history, form_summary, team_id)
                 
-                with col_win:
-                    st.markdown("#### 🏆 Meilleure Victoire")
-                    if best_win:
-                        location = "🏠 Domicile" if best_win['is_home'] else "✈️ Extérieur"
-                        rank_text = format_rank(best_win['opponent_rank'])
-                        st.success(f"**{best_win['opponent']}** ({rank_text})")
-                        st.metric(
-                            "Score",
-                            f"{best_win['score_for']} - {best_win['score_against']}",
-                            delta=f"+{best_win['score_for'] - best_win['score_against']}"
-                        )
-                        st.caption(f"{location} • {pd.to_datetime(best_win['date']).strftime('%d/%m/%Y')}")
-                    else:
-                        st.info("Aucune victoire enregistrée")
+                st.markdown("---")
                 
-                with col_defeat:
-                    st.markdown("#### 😞 Pire Défaite")
-                    if worst_defeat:
-                        location = "🏠 Domicile" if worst_defeat['is_home'] else "✈️ Extérieur"
-                        rank_text = format_rank(worst_defeat['opponent_rank'])
-                        st.error(f"**{worst_defeat['opponent']}** ({rank_text})")
-                        st.metric(
-                            "Score",
-                            f"{worst_defeat['score_for']} - {worst_defeat['score_against']}",
-                            delta=f"{worst_defeat['score_for'] - worst_defeat['score_against']}"
-                        )
-                        st.caption(f"{location} • {pd.to_datetime(worst_defeat['date']).strftime('%d/%m/%Y')}")
-                    else:
-                        st.info("Aucune défaite enregistrée")
+                # === MEILLEURE VICTOIRE ET PIRE DÉFAITE ===
+                rated_results.render(
+                    rated_results.build_rated_results(form_history, ratings_df),
+                    ratings_df,
+                    team_id,
+                    teams_df
+                )
                 
                 st.markdown("---")
                 
@@ -459,43 +344,27 @@ try:
                 
                 st.markdown("---")
                 
+                # === FACE-À-FACE ===
+                head_to_head.render(
+                    head_to_head.build_head_to_head_index(head_to_head_df),
+                    team_id,
+                    teams_df,
+                    build_match_labels(matches_df, teams_df)
+                )
+                
+                st.markdown("---")
+                
                 # === STATISTIQUES DES JOUEURS ===
-                if not player_stats_df.empty:
+                if not season_totals_df.empty:
                     st.markdown("### 👥 Statistiques des Joueurs")
                     
-                    # Filtrer les stats des joueurs de cette équipe
-                    team_player_stats = player_stats_df[
-                        (player_stats_df['team_name'] == selected_team) & 
-                        (player_stats_df['is_official'] == False)
-                    ].copy()
+                    # Filtrer l'agrégat de saison sur les joueurs de cette équipe
+                    player_summary = calculate_player_season_stats(season_totals_df)
+                    player_summary = player_summary[player_summary['team_name'] == selected_team]
                     
-                    if not team_player_stats.empty:
-                        # Agréger par joueur
-                        player_summary = team_player_stats.groupby('player_name').agg({
-                            'match_id': 'nunique',
-                            'goals': 'sum',
-                            'shots': 'sum',
-                            'goals_7m': 'sum',
-                            'saves': 'sum',
-                            'yellow_cards': 'sum',
-                            'two_minutes': 'sum',
-                            'red_cards': 'sum',
-                            'blue_cards': 'sum'
-                        }).reset_index()
-                        
-                        # Total sanctions
-                        player_summary['total_sanctions'] = (
-                            player_summary['yellow_cards'] + 
-                            player_summary['two_minutes'] + 
-                            player_summary['red_cards'] + 
-                            player_summary['blue_cards']
-                        )
-                        
+                    if not player_summary.empty:
                         # Calculer l'efficacité
-                        player_summary['efficiency'] = player_summary.apply(
-                            lambda row: round(row['goals'] / row['shots'] * 100, 1) if row['shots'] > 0 else 0,
-                            axis=1
-                        )
+                        player_summary['efficiency'] = player_summary['efficiency'].round(1)
                         
                         # Créer les widgets Top 5
                         col_widget1, col_widget2 = st.columns(2)
@@ -503,10 +372,10 @@ try:
                         # Widget 1: Top 5 Buteurs
                         with col_widget1:
                             st.markdown("#### ⚽ Top 5 Buteurs")
-                            top_scorers = player_summary[player_summary['goals'] > 0].nlargest(5, 'goals').copy()
+                            top_scorers = player_summary[player_summary['goals'] > 0].nlargest(5, 'goals')
                             
                             if not top_scorers.empty:
-                                top_scorers_display = top_scorers[['player_name', 'goals', 'efficiency']].copy()
+                                top_scorers_display = top_scorers[['player_name', 'goals', 'efficiency']]
                                 top_scorers_display = top_scorers_display.rename(columns={
                                     'player_name': 'Joueur',
                                     'goals': 'Buts',
@@ -531,10 +400,10 @@ try:
                         # Widget 2: Top 5 Gardiens
                         with col_widget2:
                             st.markdown("#### 🧤 Top 5 Gardiens")
-                            top_goalkeepers = player_summary[player_summary['saves'] > 0].nlargest(5, 'saves').copy()
+                            top_goalkeepers = player_summary[player_summary['saves'] > 0].nlargest(5, 'saves')
                             
                             if not top_goalkeepers.empty:
-                                top_goalkeepers_display = top_goalkeepers[['player_name', 'saves']].copy()
+                                top_goalkeepers_display = top_goalkeepers[['player_name', 'saves']]
                                 top_goalkeepers_display = top_goalkeepers_display.rename(columns={
                                     'player_name': 'Joueur',
                                     'saves': 'Arrêts'
@@ -561,10 +430,10 @@ try:
                         # Widget 3: Top 5 Spécialistes 7m
                         with col_widget3:
                             st.markdown("#### 🎯 Top 5 Spécialistes 7m")
-                            top_7m = player_summary[player_summary['goals_7m'] > 0].nlargest(5, 'goals_7m').copy()
+                            top_7m = player_summary[player_summary['goals_7m'] > 0].nlargest(5, 'goals_7m')
                             
                             if not top_7m.empty:
-                                top_7m_display = top_7m[['player_name', 'goals_7m']].copy()
+                                top_7m_display = top_7m[['player_name', 'goals_7m']]
                                 top_7m_display = top_7m_display.rename(columns={
                                     'player_name': 'Joueur',
                                     'goals_7m': 'Buts 7m'
@@ -587,10 +456,10 @@ try:
                         # Widget 4: Top 5 Joueurs avec le plus de sanctions
                         with col_widget4:
                             st.markdown("#### ⚠️ Top 5 Sanctions")
-                            top_sanctions = player_summary[player_summary['total_sanctions'] > 0].nlargest(5, 'total_sanctions').copy()
+                            top_sanctions = player_summary[player_summary['total_sanctions'] > 0].nlargest(5, 'total_sanctions')
                             
                             if not top_sanctions.empty:
-                                top_sanctions_display = top_sanctions[['player_name', 'total_sanctions', 'yellow_cards', 'two_minutes', 'red_cards', 'blue_cards']].copy()
+                                top_sanctions_display = top_sanctions[['player_name', 'total_sanctions', 'yellow_cards', 'two_minutes', 'red_cards', 'blue_cards']]
                                 top_sanctions_display = top_sanctions_display.rename(columns={
                                     'player_name': 'Joueur',
                                     'total_sanctions': 'Total',
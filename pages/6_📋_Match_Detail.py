@@ -0,0 +1,135 @@
+"""
+Page Détail du match - Feuille de match et déroulé d'une rencontre
+"""
+import streamlit as st
+import pandas as pd
+import traceback
+from src.database import get_matches, get_teams, get_match_details, prefetch_match_details
+from src.pages.match_detail import tab_box_score, tab_timeline, tab_score_progression, tab_power_play
+from src.pages.match_detail.utils import build_team_fixtures, neighbour_match_ids
+from src.pages.utils import build_match_labels, lazy_tabs, league_selector
+
+# Copy-on-write du tableau de bord (voir app.py)
+pd.set_option("mode.copy_on_write", True)
+
+st.set_page_config(page_title="Détail du match", page_icon="📋", layout="wide")
+
+# Cacher la navigation par défaut de Streamlit
+st.markdown("""
+    <style>
+    [data-testid="stSidebarNav"] {
+        display: none;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+# Sidebar
+with st.sidebar:
+    st.markdown("## 🤾 Navigation")
+    st.markdown("---")
+    
+    st.page_link("app.py", label="Accueil", icon="🏠")
+    st.page_link("pages/2_🏆_Rankings.py", label="Classements", icon="🏆")
+    st.page_link("pages/3_📈_Team_Stats.py", label="Statistiques d'équipes", icon="📈")
+    st.page_link("pages/4_👤_Player_Stats.py", label="Statistiques de joueurs", icon="👤")
+    st.page_link("pages/5_🏟️_Club_Report.py", label="Rapport de Club", icon="🏟️")
+    st.page_link("pages/6_📋_Match_Detail.py", label="Détail du match", icon="📋")
+    
+    st.markdown("---")
+    league_id = league_selector()
+    
+    st.markdown("---")
+    st.info("**Page actuelle:** Détail du match")
+
+st.title("📋 Détail du match")
+st.write("Parcourez le calendrier d'un club et consultez la feuille de match de chaque rencontre.")
+
+try:
+    # Charger les données
+    matches_df = get_matches(league_id)
+    teams_df = get_teams()
+    
+    if matches_df.empty or teams_df.empty:
+        st.info("Aucun match disponible. Importez des matchs pour commencer !")
+    else:
+        match_labels = build_match_labels(matches_df, teams_df)
+        
+        # Clubs ayant au moins un match dans la compétition
+        league_team_ids = pd.concat([matches_df['home_team_id'], matches_df['away_team_id']])
+        teams_df = teams_df[teams_df['id'].isin(league_team_ids)]
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            team_names = sorted(teams_df['name'].unique().tolist())
+            selected_team = st.selectbox(
+                "Sélectionnez un club",
+                options=team_names,
+                key="match_detail_team"
+            )
+        
+        team_id = teams_df[teams_df['name'] == selected_team]['id'].iloc[0]
+        fixtures = build_team_fixtures(match_labels, matches_df, team_id)
+        
+        with col2:
+            # Calendrier du club, dernier match sélectionné par défaut
+            selected_match_id = st.selectbox(
+                "Sélectionnez un match",
+                options=fixtures.index.tolist(),
+                index=len(fixtures) - 1,
+                format_func=lambda match_id: fixtures.loc[match_id, 'label'],
+                key=f"match_detail_match_{team_id}"
+            )
+        
+        # Précharger en arrière-plan les matchs voisins du calendrier
+        prefetch_match_details(neighbour_match_ids(fixtures, selected_match_id))
+        
+        # Empreinte courante du match : un match ré-importé depuis sa mise en cache est rechargé
+        fingerprint = None
+        if 'fingerprint' in matches_df.columns:
+            fingerprint = matches_df.loc[matches_df['id'] == selected_match_id, 'fingerprint'].iloc[0]
+        details = get_match_details(selected_match_id, fingerprint if pd.notna(fingerprint) else None)
+        
+        if details["match"].empty:
+            st.warning("Ce match n'existe plus dans la base de données")
+        else:
+            match = details["match"].iloc[0]
+            match_label = match_labels.loc[selected_match_id]
+            home_team_name = match_label['home_team_name']
+            away_team_name = match_label['away_team_name']
+            
+            # === SCORE ===
+            st.markdown("---")
+            col_home, col_score, col_away = st.columns([2, 1, 2])
+            
+            with col_home:
+                st.markdown(f"### 🏠 {home_team_name}")
+            
+            with col_score:
+                if pd.notna(match['final_score_home']) and pd.notna(match['final_score_away']):
+                    st.markdown(f"## {int(match['final_score_home'])} - {int(match['final_score_away'])}")
+                if pd.notna(match['ht_score_home']) and pd.notna(match['ht_score_away']):
+                    st.caption(f"Mi-temps : {int(match['ht_score_home'])} - {int(match['ht_score_away'])}")
+                if match['match_date']:
+                    st.caption(pd.to_datetime(match['match_date']).strftime('%d/%m/%Y'))
+            
+            with col_away:
+                st.markdown(f"### ✈️ {away_team_name}")
+            
+            st.markdown("---")
+            
+            # Seul l'onglet sélectionné est calculé et affiché
+            match_tabs = {
+                "📝 Feuille de match": tab_box_score,
+                "⏱️ Déroulé du match": tab_timeline,
+                "📈 Évolution du score": tab_score_progression,
+                "⚖️ Supériorité numérique": tab_power_play
+            }
+            selected_tab = lazy_tabs(list(match_tabs), key="match_detail_tab")
+            match_tabs[selected_tab].render(details, home_team_name, away_team_name)
+
+except Exception as e:
+    st.error(f"Erreur lors du chargement du match : {str(e)}")
+    st.info("Veuillez vous assurer que votre connexion Supabase est correctement configurée.")
+    with st.expander("Détails de l'erreur"):
+        st.code(traceback.format_exc())
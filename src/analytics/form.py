@@ -0,0 +1,120 @@
+"""
+Form engine: recent results, streaks and rolling goal difference of every team.
+
+All teams are handled together on a long team-match table (one row per team
+and scored match, sorted by team and date): the form strings, streaks and
+rolling sums are shifted/grouped/rolling windows over that table instead of a
+loop over each team's matches. The functions are pure pandas (no Streamlit,
+no database); the pages cache them.
+"""
+import numpy as np
+import pandas as pd
+
+# Nombre de matchs de la forme récente
+FORM_MATCHES = 5
+
+RESULT_LETTERS = {1: 'V', 0: 'N', -1: 'D'}
+
+# Colonnes de score des matchs par type de score (comme la vue team_standings)
+SCORE_COLUMNS = {
+    'final': ('final_score_home', 'final_score_away'),
+    'halftime': ('ht_score_home', 'ht_score_away'),
+}
+
+
+def team_match_results(matches_df: pd.DataFrame, score_type: str = 'final') -> pd.DataFrame:
+    """
+    Long team-match table: each scored match seen from both teams.
+
+    Args:
+        matches_df: Matches with id, match_date, home_team_id, away_team_id and scores
+        score_type: 'final' or 'halftime' (see SCORE_COLUMNS)
+
+    Returns:
+        One row per team and match with match_id, match_date (datetime),
+        team_id, opponent_id, venue ('home'/'away'), goals_for, goals_against,
+        goal_diff and result (1 win, 0 draw, -1 loss), sorted by team, date
+        and match id
+    """
+    home_score, away_score = SCORE_COLUMNS[score_type]
+    scored = matches_df.dropna(subset=[home_score, away_score])
+    match_date = pd.to_datetime(scored['match_date'], errors='coerce')
+
+    sides = []
+    for venue, team, opponent, goals_for, goals_against in (
+        ('home', 'home_team_id', 'away_team_id', home_score, away_score),
+        ('away', 'away_team_id', 'home_team_id', away_score, home_score),
+    ):
+        sides.append(pd.DataFrame({
+            'match_id': scored['id'],
+            'match_date': match_date,
+            'team_id': scored[team],
+            'opponent_id': scored[opponent],
+            'venue': venue,
+            'goals_for': scored[goals_for].astype('int64'),
+            'goals_against': scored[goals_against].astype('int64'),
+        }))
+
+    results = pd.concat(sides, ignore_index=True)
+    results['goal_diff'] = results['goals_for'] - results['goals_against']
+    results['result'] = np.sign(results['goal_diff']).astype('int8')
+
+    return results.sort_values(['team_id', 'match_date', 'match_id'], kind='stable', na_position='last').reset_index(drop=True)
+
+
+def team_form(results_df: pd.DataFrame, last_n: int = FORM_MATCHES) -> pd.DataFrame:
+    """
+    Form after each match of a team_match_results table.
+
+    Adds to every row:
+        form: results of the last_n matches up to this one, oldest first ("VVNDV")
+        streak: length of the current run of identical results (result gives its kind)
+        rolling_goal_diff: goal difference over the last_n matches
+    """
+    results = results_df.reset_index(drop=True)
+    team = results['team_id']
+
+    # Chaîne de forme : lettre du match + lettres des last_n - 1 matchs précédents de l'équipe
+    letters = results['result'].map(RESULT_LETTERS)
+    form = letters
+    for offset in range(1, last_n):
+        form = letters.groupby(team, sort=False).shift(offset).fillna('') + form
+    results['form'] = form
+
+    # Séries : un nouveau bloc commence à chaque changement d'équipe ou de résultat
+    new_run = (team != team.shift()) | (results['result'] != results['result'].shift())
+    results['streak'] = results.groupby(new_run.cumsum()).cumcount() + 1
+
+    results['rolling_goal_diff'] = (
+        results.groupby('team_id', sort=False)['goal_diff']
+        .rolling(last_n, min_periods=1).sum()
+        .reset_index(level=0, drop=True)
+        .astype('int64')
+    )
+
+    return results
+
+
+def team_form_summary(form_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Current form of every team (last row of each team in a team_form table).
+
+    Returns a DataFrame indexed by team_id with form, result and streak (current
+    run), rolling_goal_diff, and the longest win and loss runs of the period
+    (longest_win_streak, longest_loss_streak)
+    """
+    current = form_df.groupby('team_id', sort=False).tail(1).set_index('team_id')
+
+    longest_runs = {
+        column: form_df[form_df['result'] == result].groupby('team_id')['streak'].max()
+        .reindex(current.index, fill_value=0).astype('int64')
+        for result, column in ((1, 'longest_win_streak'), (-1, 'longest_loss_streak'))
+    }
+
+    return current[['form', 'result', 'streak', 'rolling_goal_diff']].assign(**longest_runs)
+
+
+def streak_label(result: int, streak: int) -> str:
+    """Label of a current run, e.g. (1, 3) -> "3 victoires" """
+    kind = {1: 'victoire', 0: 'nul', -1: 'défaite'}[result]
+    return f"{streak} {kind}{'s' if streak > 1 else ''}"
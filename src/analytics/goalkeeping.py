@@ -0,0 +1,132 @@
+"""
+Goalkeeper save percentage: saves against the shots faced on target
+(saves + goals conceded) in each match.
+
+Each goal is charged to the goalkeeper on court when it was scored, read from
+the match timeline: the goalkeeper of the conceding team who made the last
+save before the goal (before their first save, the first goalkeeper to save).
+When the timeline does not identify every goalkeeper who saved for a team
+(no actions, unresolved players), the goals conceded of that team come from
+the final score, split in proportion to the saves. A goalkeeper who made no
+save does not appear in the timeline and is not ranked. The same rules are
+used by the goalkeeper_season_stats table (src/sql/create_views.sql).
+"""
+import numpy as np
+import pandas as pd
+
+GOALKEEPER_MATCH_COLUMNS = [
+    'match_id', 'team_name', 'player_id', 'player_name',
+    'saves', 'goals_conceded', 'shots_faced', 'save_percentage',
+]
+
+ON_COURT_COLUMNS = ['match_id', 'team_id', 'player_id', 'goals_conceded']
+
+
+def goalkeepers_on_court(actions_df: pd.DataFrame, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Goals conceded by each goalkeeper while on court, from the match timelines.
+
+    Args:
+        actions_df: actions rows with id, match_id, time_seconds, action_type,
+            team ('Home'/'Away') and player_id
+        matches_df: Matches with id, home_team_id and away_team_id
+
+    Returns:
+        One row per match and goalkeeper with at least one save of a known
+        player, with the ON_COURT_COLUMNS (goals_conceded may be 0)
+    """
+    timeline = actions_df[
+        actions_df['action_type'].isin(['Save', 'Goal', 'Goal_7m']) &
+        actions_df['team'].isin(['Home', 'Away']) &
+        actions_df['time_seconds'].notna()
+    ]
+    timeline = pd.DataFrame({
+        'match_id': timeline['match_id'].astype('int64'),
+        'side': timeline['team'].astype(str),
+        'is_save': (timeline['action_type'] == 'Save').to_numpy(),
+        'player_id': timeline['player_id'],
+        'time_seconds': timeline['time_seconds'].astype('int64'),
+        'id': timeline['id'],
+    }).sort_values(['match_id', 'time_seconds', 'id'], kind='stable')
+    timeline['position'] = np.arange(len(timeline))
+
+    saves = timeline[timeline['is_save'] & timeline['player_id'].notna()][['match_id', 'side', 'position', 'player_id']]
+    if saves.empty:
+        return pd.DataFrame(columns=ON_COURT_COLUMNS)
+
+    # Buts encaissés par l'autre équipe : gardien du dernier arrêt avant le but, sinon du premier arrêt après
+    goals = timeline[~timeline['is_save']][['match_id', 'side', 'position']]
+    goals = goals.assign(side=goals['side'].map({'Home': 'Away', 'Away': 'Home'}))
+    keeper_before = pd.merge_asof(goals, saves, on='position', by=['match_id', 'side'], direction='backward')
+    keeper_after = pd.merge_asof(goals, saves, on='position', by=['match_id', 'side'], direction='forward')
+    goals = goals.assign(player_id=keeper_before['player_id'].fillna(keeper_after['player_id']).to_numpy())
+
+    conceded = goals.dropna(subset=['player_id']).groupby(['match_id', 'side', 'player_id']).size()
+    keepers = saves.drop_duplicates(['match_id', 'side', 'player_id']).set_index(['match_id', 'side', 'player_id'])
+    keepers['goals_conceded'] = conceded.reindex(keepers.index, fill_value=0).astype('int64')
+    keepers = keepers.reset_index()
+
+    matches = matches_df.set_index('id').reindex(keepers['match_id'])
+    keepers['team_id'] = np.where(keepers['side'] == 'Home', matches['home_team_id'], matches['away_team_id'])
+
+    return keepers[ON_COURT_COLUMNS]
+
+
+def goalkeeper_match_stats(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame,
+                           on_court_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Saves, goals conceded and save percentage of every goalkeeper performance.
+
+    Args:
+        player_stats_df: player_stats rows (any number of matches) with match_id,
+            team_id, team_name, player_id, player_name, is_official and saves
+        matches_df: Matches with id, home_team_id, away_team_id and the final scores
+        on_court_df: Output of goalkeepers_on_court (None: final score split only)
+
+    Returns:
+        One row per goalkeeper and match with at least one save, with the
+        GOALKEEPER_MATCH_COLUMNS (goals_conceded and shots_faced may be fractional)
+    """
+    keepers = player_stats_df[(player_stats_df['is_official'] == False) & (player_stats_df['saves'] > 0)]
+
+    # Buts encaissés par l'équipe du gardien : score final de l'adversaire
+    matches = matches_df.set_index('id').reindex(keepers['match_id'])
+    team_id = keepers['team_id'].to_numpy()
+    team_conceded = pd.Series(np.select(
+        [team_id == matches['home_team_id'].to_numpy(), team_id == matches['away_team_id'].to_numpy()],
+        [matches['final_score_away'].to_numpy(dtype=float), matches['final_score_home'].to_numpy(dtype=float)],
+        default=np.nan
+    ), index=keepers.index)
+
+    # Matchs sans score final ou équipe non identifiée : pas de tirs subis connus
+    keepers = keepers[team_conceded.notna()]
+    team_conceded = team_conceded[keepers.index]
+    if keepers.empty:
+        return pd.DataFrame(columns=GOALKEEPER_MATCH_COLUMNS)
+
+    saves = keepers['saves'].astype('int64')
+    team_saves = saves.groupby([keepers['match_id'], keepers['team_id']]).transform('sum')
+    goals_conceded = team_conceded * saves / team_saves
+
+    if on_court_df is not None and not on_court_df.empty:
+        # Buts du déroulé quand tous les gardiens de l'équipe y sont identifiés
+        keeper_key = pd.MultiIndex.from_arrays([keepers['match_id'], keepers['team_id'], keepers['player_id']])
+        on_court_goals = pd.Series(
+            on_court_df.set_index(['match_id', 'team_id', 'player_id'])['goals_conceded'].reindex(keeper_key).to_numpy(dtype=float),
+            index=keepers.index
+        )
+        team_covered = on_court_goals.notna().groupby([keepers['match_id'], keepers['team_id']]).transform('all')
+        goals_conceded = goals_conceded.where(~team_covered, on_court_goals)
+
+    stats = pd.DataFrame({
+        'match_id': keepers['match_id'],
+        'team_name': keepers['team_name'],
+        'player_id': keepers['player_id'],
+        'player_name': keepers['player_name'],
+        'saves': saves,
+        'goals_conceded': goals_conceded,
+        'shots_faced': saves + goals_conceded,
+    })
+    stats['save_percentage'] = (100 * stats['saves'] / stats['shots_faced']).round(1)
+
+    return stats.reset_index(drop=True)
@@ -0,0 +1,64 @@
+"""
+Heatmap engine: action counts per 5-minute interval, read from the
+action_buckets table that read-match.py fills at each import.
+
+The functions are pure pandas (no Streamlit, no database); the pages cache them.
+"""
+import pandas as pd
+
+BUCKET_MINUTES = 5
+
+# Intervalles réglementaires (0'-5' ... 55'-60'), les prolongations s'ajoutent après
+REGULATION_BUCKETS = list(range(60 // BUCKET_MINUTES))
+
+# Indicateurs affichés et types d'action qui les composent
+HEATMAP_METRICS = {
+    'Buts': ['Goal', 'Goal_7m'],
+    'Tirs': ['Goal', 'Goal_7m', 'Shot'],
+    'Arrêts': ['Save'],
+    '2 minutes': ['Suspension_2min'],
+}
+
+
+def bucket_label(bucket: int) -> str:
+    """Label of an interval, e.g. 0 -> "0-5'" """
+    start = bucket * BUCKET_MINUTES
+    return f"{start}-{start + BUCKET_MINUTES}'"
+
+
+def heatmap_counts(buckets_df: pd.DataFrame, action_types: list, by: str) -> pd.DataFrame:
+    """
+    Sum the interval counts of some action types per row key and interval.
+
+    Args:
+        buckets_df: action_buckets rows (team_id, player_id, player_name, action_type, bucket, count)
+        action_types: Action types to count (see HEATMAP_METRICS)
+        by: Row key of the heatmap ('team_id' or a player column)
+
+    Returns:
+        Wide DataFrame indexed by the row key with one column per interval
+        (regulation intervals always present, empty intervals at 0)
+    """
+    selected = buckets_df[buckets_df['action_type'].isin(action_types) & buckets_df[by].notna()]
+    counts = selected.pivot_table(index=by, columns='bucket', values='count', aggfunc='sum', fill_value=0, observed=True)
+
+    buckets = sorted(set(REGULATION_BUCKETS) | set(counts.columns))
+    return counts.reindex(columns=buckets, fill_value=0).astype('int64')
+
+
+def heatmap_long(counts: pd.DataFrame, row_labels: pd.Series = None) -> pd.DataFrame:
+    """
+    Reshape a heatmap_counts table to one row per key and interval, for charting.
+
+    Args:
+        counts: Output of heatmap_counts
+        row_labels: Optional mapping from the row key to a display label (team names)
+
+    Returns:
+        DataFrame with row, bucket, interval and count columns
+    """
+    long = counts.rename_axis(index='row', columns='bucket').stack().rename('count').reset_index()
+    if row_labels is not None:
+        long['row'] = long['row'].map(row_labels)
+    long['interval'] = long['bucket'].map(bucket_label)
+    return long
@@ -0,0 +1,172 @@
+"""
+Power-play engine: numerical superiority / inferiority windows opened by the
+2-minute suspensions, and the goals scored and conceded in each state.
+
+The windows of every match of a season are handled together with interval
+arithmetic (sorted boundaries, cumulative sums and an as-of join of the goals),
+overlapping suspensions included. The functions are pure pandas (no Streamlit,
+no database); the pages cache them.
+"""
+import numpy as np
+import pandas as pd
+
+SUSPENSION_SECONDS = 2 * 60
+
+# Durée réglementaire d'un match (2 x 30 minutes)
+MATCH_SECONDS = 60 * 60
+
+GOAL_ACTION_TYPES = ['Goal', 'Goal_7m']
+
+POWER_PLAY_COLUMNS = [
+    'suspensions',
+    'seconds_superiority', 'seconds_inferiority',
+    'goals_superiority', 'conceded_superiority',
+    'goals_inferiority', 'conceded_inferiority',
+    'goals_even', 'conceded_even',
+]
+
+
+def strength_states(actions_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Number of players of each side serving a suspension, over time.
+
+    Args:
+        actions_df: Actions with match_id, time_seconds, action_type and team
+            ('Home'/'Away' for player actions)
+
+    Returns:
+        One row per match and state change with match_id, time_seconds (start
+        of the state), end_seconds, home_off and away_off. Every match with
+        actions starts with a 0/0 state at second 0.
+    """
+    timed = actions_df.dropna(subset=['time_seconds'])
+    match_end = timed.groupby('match_id')['time_seconds'].max().astype('int64').clip(lower=MATCH_SECONDS)
+
+    suspensions = timed[(timed['action_type'] == 'Suspension_2min') & timed['team'].isin(['Home', 'Away'])]
+    start = suspensions['time_seconds'].astype('int64')
+    is_home = (suspensions['team'] == 'Home').to_numpy(dtype=int)
+
+    # Bornes des fenêtres : +1 au début, -1 à la fin (fenêtres [début, fin[ qui se cumulent)
+    boundaries = pd.concat([
+        pd.DataFrame({'match_id': match_end.index, 'time_seconds': 0, 'home_off': 0, 'away_off': 0}),
+        pd.DataFrame({'match_id': suspensions['match_id'], 'time_seconds': start,
+                      'home_off': is_home, 'away_off': 1 - is_home}),
+        pd.DataFrame({'match_id': suspensions['match_id'], 'time_seconds': start + SUSPENSION_SECONDS,
+                      'home_off': -is_home, 'away_off': is_home - 1}),
+    ], ignore_index=True)
+
+    states = boundaries.groupby(['match_id', 'time_seconds'], as_index=False)[['home_off', 'away_off']].sum()
+    states[['home_off', 'away_off']] = states.groupby('match_id')[['home_off', 'away_off']].cumsum()
+
+    # Fin de chaque état : début du suivant, bornée à la fin du match
+    state_match_end = states['match_id'].map(match_end)
+    states['end_seconds'] = states.groupby('match_id')['time_seconds'].shift(-1)
+    states['end_seconds'] = states['end_seconds'].fillna(state_match_end).clip(upper=state_match_end).astype('int64')
+
+    # Les exclusions prononcées en fin de match débordent : états après le coup de sifflet ignorés
+    states = states[states['time_seconds'] < state_match_end]
+
+    return states[['match_id', 'time_seconds', 'end_seconds', 'home_off', 'away_off']].reset_index(drop=True)
+
+
+def power_play_summary(actions_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Time spent and goals scored/conceded in each numerical state, per match and side.
+
+    Args:
+        actions_df: Actions of any number of matches (see strength_states)
+
+    Returns:
+        DataFrame indexed by (match_id, side) with side 'home'/'away' and the
+        POWER_PLAY_COLUMNS; superiority means the opponent has more players
+        suspended, "even" includes both sides short-handed at once
+    """
+    index = pd.MultiIndex.from_arrays([[], []], names=['match_id', 'side'])
+    if actions_df.empty:
+        return pd.DataFrame(columns=POWER_PLAY_COLUMNS, index=index)
+
+    states = strength_states(actions_df)
+    if states.empty:
+        return pd.DataFrame(columns=POWER_PLAY_COLUMNS, index=index)
+
+    # Temps passé dans chaque état, du point de vue de l'équipe à domicile
+    duration = states['end_seconds'] - states['time_seconds']
+    home_advantage = np.sign(states['away_off'] - states['home_off'])
+    seconds = pd.DataFrame({
+        'match_id': states['match_id'],
+        'home_superiority': duration.where(home_advantage > 0, 0),
+        'home_inferiority': duration.where(home_advantage < 0, 0),
+    }).groupby('match_id').sum()
+
+    # État au moment de chaque but (jointure as-of sur le début d'état)
+    goals = actions_df[
+        actions_df['action_type'].isin(GOAL_ACTION_TYPES) &
+        actions_df['team'].isin(['Home', 'Away']) &
+        actions_df['time_seconds'].notna()
+    ]
+    goals = pd.DataFrame({
+        'match_id': goals['match_id'],
+        'time_seconds': goals['time_seconds'].astype('int64'),
+        'home_goal': (goals['team'] == 'Home').to_numpy(),
+    }).sort_values('time_seconds', kind='stable')
+    goals = pd.merge_asof(
+        goals, states.sort_values('time_seconds', kind='stable'),
+        on='time_seconds', by='match_id', direction='backward'
+    )
+    goal_advantage = np.sign(goals['away_off'] - goals['home_off'])
+
+    home_goals = goals['home_goal']
+    per_goal = pd.DataFrame({
+        'match_id': goals['match_id'],
+        'home_goals_superiority': (home_goals & (goal_advantage > 0)).astype(int),
+        'home_goals_inferiority': (home_goals & (goal_advantage < 0)).astype(int),
+        'home_goals_even': (home_goals & (goal_advantage == 0)).astype(int),
+        'away_goals_superiority': (~home_goals & (goal_advantage < 0)).astype(int),
+        'away_goals_inferiority': (~home_goals & (goal_advantage > 0)).astype(int),
+        'away_goals_even': (~home_goals & (goal_advantage == 0)).astype(int),
+    }).groupby('match_id').sum()
+
+    suspensions = actions_df[(actions_df['action_type'] == 'Suspension_2min') & actions_df['team'].isin(['Home', 'Away'])]
+    suspension_counts = suspensions.groupby(['match_id', suspensions['team'].astype(str)]).size().unstack(fill_value=0)
+
+    per_match = seconds.join(per_goal, how='left').join(suspension_counts, how='left').fillna(0)
+    for team in ('Home', 'Away'):
+        if team not in per_match.columns:
+            per_match[team] = 0
+
+    sides = []
+    for side, other, team in (('home', 'away', 'Home'), ('away', 'home', 'Away')):
+        own_superiority = 'home_superiority' if side == 'home' else 'home_inferiority'
+        own_inferiority = 'home_inferiority' if side == 'home' else 'home_superiority'
+        sides.append(pd.DataFrame({
+            'side': side,
+            'suspensions': per_match[team],
+            'seconds_superiority': per_match[own_superiority],
+            'seconds_inferiority': per_match[own_inferiority],
+            'goals_superiority': per_match[f'{side}_goals_superiority'],
+            'conceded_superiority': per_match[f'{other}_goals_inferiority'],
+            'goals_inferiority': per_match[f'{side}_goals_inferiority'],
+            'conceded_inferiority': per_match[f'{other}_goals_superiority'],
+            'goals_even': per_match[f'{side}_goals_even'],
+            'conceded_even': per_match[f'{other}_goals_even'],
+        }, index=per_match.index))
+
+    summary = pd.concat(sides).set_index('side', append=True).sort_index()
+    return summary[POWER_PLAY_COLUMNS].astype('int64')
+
+
+def team_power_play(summary_df: pd.DataFrame, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attach the team of each side to a power_play_summary table.
+
+    Returns a long table with match_id, team_id and the POWER_PLAY_COLUMNS.
+    """
+    summary = summary_df.reset_index()
+    teams = matches_df.set_index('id')[['home_team_id', 'away_team_id']]
+    summary = summary[summary['match_id'].isin(teams.index)]
+
+    home_team = summary['match_id'].map(teams['home_team_id'])
+    away_team = summary['match_id'].map(teams['away_team_id'])
+    summary['team_id'] = home_team.where(summary['side'] == 'home', away_team)
+
+    return summary[['match_id', 'team_id'] + POWER_PLAY_COLUMNS]
@@ -0,0 +1,162 @@
+"""
+Score progression engine: score differential, leads and scoring runs of every
+match, computed in one vectorized pass over the actions of a whole season.
+
+The functions are pure pandas (no Streamlit, no database); the pages cache them.
+"""
+import numpy as np
+import pandas as pd
+
+# Durée réglementaire d'un match (2 x 30 minutes)
+MATCH_SECONDS = 60 * 60
+
+MOMENTUM_COLUMNS = [
+    'goals', 'lead_changes', 'ties',
+    'largest_lead_home', 'largest_lead_away',
+    'seconds_leading_home', 'seconds_leading_away', 'seconds_tied',
+    'longest_run_home', 'longest_run_away',
+]
+
+
+def score_events(actions_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn the actions of one or many matches into their goal events.
+
+    Args:
+        actions_df: Actions with match_id, time_seconds, score_home, score_away
+            (and id to order events of the same second)
+
+    Returns:
+        One row per goal, ordered by match and time, with match_id, time_seconds,
+        score_home, score_away, scorer ('home'/'away') and diff (home - away)
+    """
+    columns = ['match_id', 'time_seconds', 'score_home', 'score_away', 'scorer', 'diff']
+    if actions_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    order = ['match_id', 'time_seconds', 'id'] if 'id' in actions_df.columns else ['match_id', 'time_seconds']
+    timeline = actions_df.dropna(subset=['time_seconds']).sort_values(order, kind='stable')
+
+    # Score courant : reporté sur les actions sans score, 0-0 avant le premier but
+    by_match = timeline.groupby('match_id', sort=False)
+    score_home = by_match['score_home'].ffill().fillna(0).astype('int64')
+    score_away = by_match['score_away'].ffill().fillna(0).astype('int64')
+
+    # Un but = le score d'une équipe augmente par rapport à l'action précédente du match
+    first_of_match = timeline['match_id'].ne(timeline['match_id'].shift())
+    home_goal = score_home.diff().where(~first_of_match, score_home).gt(0)
+    away_goal = score_away.diff().where(~first_of_match, score_away).gt(0)
+    is_goal = home_goal | away_goal
+
+    events = pd.DataFrame({
+        'match_id': timeline['match_id'],
+        'time_seconds': timeline['time_seconds'].astype('int64'),
+        'score_home': score_home,
+        'score_away': score_away,
+        'scorer': np.where(home_goal, 'home', 'away'),
+        'diff': score_home - score_away,
+    })[is_goal]
+
+    return events.reset_index(drop=True)[columns]
+
+
+def match_momentum(actions_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarise the score progression of every match in bulk.
+
+    Args:
+        actions_df: Actions of any number of matches (see score_events)
+
+    Returns:
+        DataFrame indexed by match_id with the MOMENTUM_COLUMNS:
+        - lead_changes: times the leading team changed (ties in between ignored)
+        - ties: times the score was levelled after 0-0
+        - largest_lead_home / largest_lead_away: biggest margin of each team
+        - seconds_leading_home / seconds_leading_away / seconds_tied
+        - longest_run_home / longest_run_away: most consecutive goals of a team
+    """
+    events = score_events(actions_df)
+    if events.empty:
+        return pd.DataFrame(columns=MOMENTUM_COLUMNS, index=pd.Index([], name='match_id'))
+
+    match_ids = events['match_id']
+    new_match = match_ids.ne(match_ids.shift())
+
+    # Changements de leader : signe de l'écart, les égalités reprennent le leader précédent
+    leader = np.sign(events['diff']).replace(0, np.nan)
+    previous_leader = leader.groupby(match_ids).ffill().groupby(match_ids).shift()
+    lead_change = leader.notna() & previous_leader.notna() & leader.ne(previous_leader)
+    tie = events['diff'].eq(0)
+
+    # Durée de chaque état du score : jusqu'au but suivant, ou jusqu'à la fin du match
+    match_end = events.groupby('match_id')['time_seconds'].transform('max').clip(lower=MATCH_SECONDS)
+    next_time = events.groupby('match_id')['time_seconds'].shift(-1).fillna(match_end)
+    duration = next_time - events['time_seconds']
+    first_goal_time = events['time_seconds'].where(new_match, 0)  # 0-0 jusqu'au premier but
+
+    # Séries : goals consécutifs de la même équipe
+    run_id = (new_match | events['scorer'].ne(events['scorer'].shift())).cumsum()
+    run_length = events.groupby(run_id)['scorer'].transform('size')
+
+    per_event = pd.DataFrame({
+        'match_id': match_ids,
+        'goals': 1,
+        'lead_changes': lead_change.astype(int),
+        'ties': tie.astype(int),
+        'largest_lead_home': events['diff'].clip(lower=0),
+        'largest_lead_away': (-events['diff']).clip(lower=0),
+        'seconds_leading_home': duration.where(events['diff'] > 0, 0),
+        'seconds_leading_away': duration.where(events['diff'] < 0, 0),
+        'seconds_tied': duration.where(tie, 0) + first_goal_time,
+        'longest_run_home': run_length.where(events['scorer'] == 'home', 0),
+        'longest_run_away': run_length.where(events['scorer'] == 'away', 0),
+    })
+
+    momentum = per_event.groupby('match_id').agg({
+        'goals': 'sum',
+        'lead_changes': 'sum',
+        'ties': 'sum',
+        'largest_lead_home': 'max',
+        'largest_lead_away': 'max',
+        'seconds_leading_home': 'sum',
+        'seconds_leading_away': 'sum',
+        'seconds_tied': 'sum',
+        'longest_run_home': 'max',
+        'longest_run_away': 'max',
+    })
+
+    return momentum[MOMENTUM_COLUMNS].astype('int64')
+
+
+def team_momentum(momentum_df: pd.DataFrame, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Restate the match momentum from each team's point of view.
+
+    Args:
+        momentum_df: Output of match_momentum
+        matches_df: Matches with id, home_team_id and away_team_id
+
+    Returns:
+        Long table with one row per match and team: match_id, team_id, largest_lead,
+        largest_deficit, seconds_leading, seconds_trailing, seconds_tied,
+        longest_run, longest_run_conceded and lead_changes
+    """
+    momentum = momentum_df.join(matches_df.set_index('id')[['home_team_id', 'away_team_id']], how='inner')
+    momentum = momentum.rename_axis('match_id').reset_index()
+
+    sides = []
+    for side, other in (('home', 'away'), ('away', 'home')):
+        sides.append(pd.DataFrame({
+            'match_id': momentum['match_id'],
+            'team_id': momentum[f'{side}_team_id'],
+            'largest_lead': momentum[f'largest_lead_{side}'],
+            'largest_deficit': momentum[f'largest_lead_{other}'],
+            'seconds_leading': momentum[f'seconds_leading_{side}'],
+            'seconds_trailing': momentum[f'seconds_leading_{other}'],
+            'seconds_tied': momentum['seconds_tied'],
+            'longest_run': momentum[f'longest_run_{side}'],
+            'longest_run_conceded': momentum[f'longest_run_{other}'],
+            'lead_changes': momentum['lead_changes'],
+        }))
+
+    return pd.concat(sides, ignore_index=True)
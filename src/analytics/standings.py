@@ -0,0 +1,64 @@
+"""
+Standings engine: the league table after every matchday, in one pass.
+
+A matchday is a date with at least one scored match. The results of each
+matchday are summed per team and accumulated with cumulative sums over the
+date-sorted team-match table (see src/analytics/form.py), which yields every
+historical table at once instead of recomputing the standings for each date.
+Same rules as the Rankings page: 3 points for a win, 2 for a draw, 1 for a
+loss, ties broken by goal difference then goals scored. The functions are pure
+pandas (no Streamlit, no database); the pages cache them.
+"""
+import pandas as pd
+
+STANDINGS_COUNT_COLUMNS = ['played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against']
+
+
+def standings_history(results_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Standings of every team after each matchday.
+
+    Args:
+        results_df: team_match_results table (matches without a date are ignored)
+
+    Returns:
+        One row per matchday and team that has played, with matchday (1, 2, ...),
+        match_date, team_id, the STANDINGS_COUNT_COLUMNS, goal_diff, points and
+        rank, sorted by matchday and rank
+    """
+    dated = results_df.dropna(subset=['match_date'])
+    if dated.empty:
+        return pd.DataFrame(columns=['matchday', 'match_date', 'team_id'] + STANDINGS_COUNT_COLUMNS + ['goal_diff', 'points', 'rank'])
+
+    results = pd.DataFrame({
+        'match_date': dated['match_date'],
+        'team_id': dated['team_id'],
+        'played': 1,
+        'wins': (dated['result'] == 1).astype('int64'),
+        'draws': (dated['result'] == 0).astype('int64'),
+        'losses': (dated['result'] == -1).astype('int64'),
+        'goals_for': dated['goals_for'],
+        'goals_against': dated['goals_against'],
+    })
+
+    # Totaux de chaque journée (dates x équipes, 0 les jours sans match), cumulés dans le temps
+    per_day = results.groupby(['match_date', 'team_id'])[STANDINGS_COUNT_COLUMNS].sum()
+    dates = per_day.index.get_level_values('match_date').unique().sort_values()
+    teams = per_day.index.get_level_values('team_id').unique()
+    grid = pd.MultiIndex.from_product([dates, teams], names=['match_date', 'team_id'])
+    totals = per_day.reindex(grid, fill_value=0).groupby(level='team_id').cumsum().reset_index()
+
+    # Équipes qui n'ont pas encore joué : absentes du classement de la journée
+    totals = totals[totals['played'] > 0]
+    totals['matchday'] = totals['match_date'].map(pd.Series(range(1, len(dates) + 1), index=dates))
+    totals['goal_diff'] = totals['goals_for'] - totals['goals_against']
+    totals['points'] = totals['wins'] * 3 + totals['draws'] * 2 + totals['losses'] * 1
+
+    totals = totals.sort_values(
+        ['matchday', 'points', 'goal_diff', 'goals_for'],
+        ascending=[True, False, False, False],
+        kind='stable'
+    )
+    totals['rank'] = totals.groupby('matchday').cumcount() + 1
+
+    return totals[['matchday', 'match_date', 'team_id'] + STANDINGS_COUNT_COLUMNS + ['goal_diff', 'points', 'rank']].reset_index(drop=True)
@@ -1,8 +1,13 @@
 """
 Database connection and utility functions for Supabase
 """
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client, Client
 from src.config import SUPABASE_URL, SUPABASE_KEY
+from src.dtypes import compact_dtypes
 import pandas as pd
 
 
@@ -19,20 +24,32 @@ def query_to_dataframe(table_name: str, query_params: dict = None) -> pd.DataFra
     Args:
         table_name: Name of the table to query
         query_params: Optional dictionary with query parameters like filters, limit, etc.
+            - "select": columns to fetch (default "*")
+            - "filters": list of (operator, column, value) applied server-side,
+              e.g. [("eq", "league_id", 3), ("in_", "match_id", [1, 2])]
+            - "order", "limit"
     
     Returns:
-        pandas DataFrame with query results
+        pandas DataFrame with query results, with the compact column types of
+        src/dtypes.py (category names, int16/int32 counts, bool flags)
     """
     client = get_supabase_client()
+    query_params = query_params or {}
+    columns = query_params.get("select", "*")
+    
+    def apply_filters(query):
+        for operator, column, value in query_params.get("filters", []):
+            query = getattr(query, operator)(column, value)
+        return query
     
     # If a specific limit is requested, use single query
-    if query_params and "limit" in query_params:
-        query = client.table(table_name).select("*")
+    if "limit" in query_params:
+        query = apply_filters(client.table(table_name).select(columns))
         query = query.limit(query_params["limit"])
         if "order" in query_params:
             query = query.order(query_params["order"])
         response = query.execute()
-        return pd.DataFrame(response.data)
+        return compact_dtypes(pd.DataFrame(response.data), table_name)
     
     # Otherwise, fetch all rows with pagination
     all_data = []
@@ -40,9 +57,9 @@ def query_to_dataframe(table_name: str, query_params: dict = None) -> pd.DataFra
     offset = 0
     
     while True:
-        query = client.table(table_name).select("*").range(offset, offset + page_size - 1)
+        query = apply_filters(client.table(table_name).select(columns)).range(offset, offset + page_size - 1)
         
-        if query_params and "order" in query_params:
+        if "order" in query_params:
             query = query.order(query_params["order"])
         
         response = query.execute()
@@ -59,7 +76,7 @@ def query_to_dataframe(table_name: str, query_params: dict = None) -> pd.DataFra
         
         offset += page_size
     
-    return pd.DataFrame(all_data)
+    return compact_dtypes(pd.DataFrame(all_data), table_name)
 
 
 def get_leagues() -> pd.DataFrame:
@@ -72,49 +89,204 @@ def get_teams() -> pd.DataFrame:
     return query_to_dataframe("teams")
 
 
-def get_players() -> pd.DataFrame:
-    """Get all players"""
-    return query_to_dataframe("players")
+def get_players(team_id: int = None) -> pd.DataFrame:
+    """Get all players (of one team if team_id is given)"""
+    if team_id is None:
+        return query_to_dataframe("players")
+    return query_to_dataframe("players", {"filters": [("eq", "team_id", team_id)]})
+
+
+def league_query_params(league_id: int = None) -> dict:
+    """Query parameters restricting a table/view with a league_id column to one league"""
+    if league_id is None:
+        return None
+    return {"filters": [("eq", "league_id", league_id)]}
+
+
+def get_matches(league_id: int = None) -> pd.DataFrame:
+    """Get all matches (of one league if league_id is given)"""
+    return query_to_dataframe("matches", league_query_params(league_id))
+
+
+def query_league_matches(table_name: str, league_id: int = None, columns: str = "*") -> pd.DataFrame:
+    """
+    Get the rows of a per-match table (player_stats, actions), of one league if
+    league_id is given
+    
+    These tables have no league column: the league's match ids are fetched first,
+    then the rows are filtered server-side on match_id in chunks to keep request
+    URLs short.
+    """
+    if league_id is None:
+        return query_to_dataframe(table_name, {"select": columns})
+    
+    match_ids = query_to_dataframe("matches", {
+        "select": "id",
+        "filters": [("eq", "league_id", league_id)]
+    })
+    if match_ids.empty:
+        return pd.DataFrame()
+    
+    match_ids = match_ids["id"].tolist()
+    chunk_size = 200
+    chunks = [
+        query_to_dataframe(table_name, {
+            "select": columns,
+            "filters": [("in_", "match_id", match_ids[start:start + chunk_size])]
+        })
+        for start in range(0, len(match_ids), chunk_size)
+    ]
+    # Les catégories diffèrent d'un bloc à l'autre : re-typer après la concaténation
+    return compact_dtypes(pd.concat(chunks, ignore_index=True), table_name)
+
+
+def get_player_stats(league_id: int = None) -> pd.DataFrame:
+    """Get all player statistics (of one league if league_id is given)"""
+    return query_league_matches("player_stats", league_id)
+
+
+def get_actions(league_id: int = None, columns: str = "*") -> pd.DataFrame:
+    """Get all match actions (of one league if league_id is given)"""
+    return query_league_matches("actions", league_id, columns)
+
+
+def get_action_buckets(league_id: int = None) -> pd.DataFrame:
+    """Get the action counts per 5-minute interval (of one league if league_id is given)"""
+    return query_league_matches("action_buckets", league_id)
+
+
+def get_head_to_head(league_id: int = None) -> pd.DataFrame:
+    """Get the head-to-head record of every pair of teams (of one league if league_id is given)"""
+    return query_to_dataframe("head_to_head", league_query_params(league_id))
+
+
+def get_team_ratings(league_id: int = None) -> pd.DataFrame:
+    """Get the Elo ratings of the teams before and after each match (of one league if league_id is given)"""
+    return query_to_dataframe("team_ratings", league_query_params(league_id))
+
 
+def get_team_standings(league_id: int = None) -> pd.DataFrame:
+    """Get the team standings aggregates (team_standings table)"""
+    return query_to_dataframe("team_standings", league_query_params(league_id))
 
-def get_matches() -> pd.DataFrame:
-    """Get all matches"""
-    return query_to_dataframe("matches")
 
+def get_team_goal_stats(league_id: int = None) -> pd.DataFrame:
+    """Get the goals scored/conceded per team (team_goal_stats table)"""
+    return query_to_dataframe("team_goal_stats", league_query_params(league_id))
 
-def get_player_stats() -> pd.DataFrame:
-    """Get all player statistics"""
-    return query_to_dataframe("player_stats")
 
+def get_player_season_stats(league_id: int = None) -> pd.DataFrame:
+    """Get the season totals per player (player_season_stats table)"""
+    return query_to_dataframe("player_season_stats", league_query_params(league_id))
 
-def get_actions() -> pd.DataFrame:
-    """Get all match actions"""
-    return query_to_dataframe("actions")
 
+def get_goalkeeper_season_stats(league_id: int = None) -> pd.DataFrame:
+    """Get the season totals per goalkeeper (goalkeeper_season_stats table)"""
+    return query_to_dataframe("goalkeeper_season_stats", league_query_params(league_id))
 
-def get_match_details(match_id: int) -> dict:
+
+# Détails de match : cache LRU partagé par les sessions, alimenté aussi par le
+# préchargement en arrière-plan des matchs voisins. Une entrée expire après
+# MATCH_DETAILS_TTL_SECONDS, ou dès que l'empreinte du match a changé (ré-import
+# d'une feuille corrigée avec read-match.py --update)
+MATCH_DETAILS_CACHE_SIZE = 64
+MATCH_DETAILS_TTL_SECONDS = 10 * 60
+_match_details_cache = OrderedDict()
+_match_details_pending = {}
+_match_details_lock = threading.Lock()
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="match-prefetch")
+
+
+def _fetch_match_details(match_id: int) -> dict:
+    """Run the match, player stats and actions queries of a match concurrently"""
+    client = get_supabase_client()
+    queries = {
+        "match": client.table("matches").select("*").eq("id", match_id),
+        "stats": client.table("player_stats").select("*").eq("match_id", match_id),
+        "actions": client.table("actions").select("*").eq("match_id", match_id).order("time_seconds").order("id"),
+    }
+    
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = {key: executor.submit(query.execute) for key, query in queries.items()}
+        data = {key: future.result().data for key, future in futures.items()}
+    
+    return {
+        "match": pd.DataFrame(data["match"]) if data["match"] else pd.DataFrame(),
+        "stats": compact_dtypes(pd.DataFrame(data["stats"]), "player_stats") if data["stats"] else pd.DataFrame(),
+        "actions": compact_dtypes(pd.DataFrame(data["actions"]), "actions") if data["actions"] else pd.DataFrame()
+    }
+
+
+def _is_fresh(entry: tuple, fingerprint: str = None) -> bool:
+    """Whether a (loaded_at, details) cache entry can still be served"""
+    loaded_at, details = entry
+    if time.monotonic() - loaded_at > MATCH_DETAILS_TTL_SECONDS:
+        return False
+    if fingerprint is None or details["match"].empty or "fingerprint" not in details["match"].columns:
+        return True
+    return details["match"]["fingerprint"].iloc[0] == fingerprint
+
+
+def _load_match_details(match_id: int) -> dict:
+    """Fetch a match and store it in the LRU cache, evicting the least recently used"""
+    try:
+        details = _fetch_match_details(match_id)
+        with _match_details_lock:
+            _match_details_cache[match_id] = (time.monotonic(), details)
+            _match_details_cache.move_to_end(match_id)
+            while len(_match_details_cache) > MATCH_DETAILS_CACHE_SIZE:
+                _match_details_cache.popitem(last=False)
+        return details
+    finally:
+        with _match_details_lock:
+            _match_details_pending.pop(match_id, None)
+
+
+def get_match_details(match_id: int, fingerprint: str = None) -> dict:
     """
     Get detailed information about a specific match including stats and actions
     
+    The three queries run concurrently and the result is kept in an LRU cache of
+    MATCH_DETAILS_CACHE_SIZE matches for MATCH_DETAILS_TTL_SECONDS; a match being
+    prefetched is awaited rather than fetched twice.
+    
     Args:
         match_id: ID of the match
+        fingerprint: Current fingerprint of the match (matches.fingerprint); a
+            cached entry loaded with another fingerprint is fetched again
     
     Returns:
         Dictionary with match info, player stats, and actions
     """
-    client = get_supabase_client()
-    
-    # Get match info
-    match = client.table("matches").select("*").eq("id", match_id).execute()
+    with _match_details_lock:
+        details = None
+        entry = _match_details_cache.get(match_id)
+        if entry is not None and _is_fresh(entry, fingerprint):
+            details = entry[1]
+            _match_details_cache.move_to_end(match_id)
+        elif entry is not None:
+            del _match_details_cache[match_id]
+        pending = _match_details_pending.get(match_id)
     
-    # Get player stats for this match
-    stats = client.table("player_stats").select("*").eq("match_id", match_id).execute()
+    if details is None and pending is not None:
+        try:
+            details = pending.result()
+        except Exception:
+            details = None  # Préchargement en échec : nouvelle tentative ci-dessous
+        if details is not None and not _is_fresh((time.monotonic(), details), fingerprint):
+            details = None  # Préchargé avant un ré-import du match
+    if details is None:
+        details = _load_match_details(match_id)
     
-    # Get actions for this match
-    actions = client.table("actions").select("*").eq("match_id", match_id).order("period, time").execute()
-    
-    return {
-        "match": pd.DataFrame(match.data) if match.data else pd.DataFrame(),
-        "stats": pd.DataFrame(stats.data) if stats.data else pd.DataFrame(),
-        "actions": pd.DataFrame(actions.data) if actions.data else pd.DataFrame()
-    }
+    # Copies légères : les modifications de l'appelant ne touchent pas le cache
+    return {key: df.copy(deep=False) for key, df in details.items()}
+
+
+def prefetch_match_details(match_ids: list):
+    """Load the details of matches not cached yet in the background (best effort)"""
+    with _match_details_lock:
+        for match_id in match_ids:
+            entry = _match_details_cache.get(match_id)
+            if (entry is not None and _is_fresh(entry)) or match_id in _match_details_pending:
+                continue
+            _match_details_pending[match_id] = _prefetch_executor.submit(_load_match_details, match_id)
@@ -0,0 +1,107 @@
+"""
+Compact column types for the DataFrames loaded from Supabase
+"""
+import pandas as pd
+
+
+# Totaux d'une ligne de player_stats (un match) : tiennent dans un int16
+MATCH_COUNT_COLUMNS = [
+    'goals', 'shots', 'goals_7m', 'saves',
+    'yellow_cards', 'two_minutes', 'red_cards', 'blue_cards'
+]
+
+# Types par table/vue : les noms (équipes, joueurs, types d'action) se répètent
+# sur des milliers de lignes et sont stockés une seule fois en category.
+# Les agrégats de saison restent en int32, ils sont encore sommés entre ligues.
+# Les colonnes en majuscule (Int16, Int32) sont nullables ; les buts encaissés
+# répartis entre gardiens peuvent être fractionnaires (float32).
+TABLE_DTYPES = {
+    "player_stats": {
+        'team_name': 'category',
+        'player_name': 'category',
+        'player_number': 'Int16',
+        'is_official': 'bool',
+        'is_captain': 'bool',
+        **{column: 'int16' for column in MATCH_COUNT_COLUMNS},
+    },
+    "actions": {
+        'period': 'int16',
+        'time': 'category',
+        'time_seconds': 'Int16',
+        'score': 'category',
+        'score_home': 'Int16',
+        'score_away': 'Int16',
+        'action_type': 'category',
+        'team': 'category',
+        'player_number': 'category',
+        'player_name': 'category',
+        'player_id': 'Int64',
+    },
+    "action_buckets": {
+        'player_id': 'Int64',
+        'player_name': 'category',
+        'action_type': 'category',
+        'bucket': 'int16',
+        'count': 'int32',
+    },
+    "head_to_head": {
+        **{column: 'int32' for column in ['matches', 'team_a_wins', 'draws', 'team_b_wins', 'team_a_goals', 'team_b_goals']},
+    },
+    "team_ratings": {
+        'rating_before': 'float32',
+        'rating': 'float32',
+    },
+    "team_standings": {
+        'team_name': 'category',
+        'venue': 'category',
+        'score_type': 'category',
+        **{column: 'int32' for column in ['played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against']},
+    },
+    "team_goal_stats": {
+        'team_name': 'category',
+        'played': 'int32',
+        'goals_for': 'int32',
+        'goals_against': 'int32',
+        **{column: 'Int32' for column in ['home_goals_for', 'away_goals_for', 'home_goals_against', 'away_goals_against']},
+    },
+    "player_season_stats": {
+        'player_id': 'Int64',
+        'player_name': 'category',
+        'team_name': 'category',
+        **{column: 'int32' for column in ['matches_played'] + MATCH_COUNT_COLUMNS},
+    },
+    "goalkeeper_season_stats": {
+        'player_id': 'Int64',
+        'player_name': 'category',
+        'team_name': 'category',
+        **{column: 'int32' for column in ['matches_played', 'matches_with_saves', 'saves', 'best_saves']},
+        'goals_conceded': 'float32',
+        'shots_faced': 'float32',
+    },
+}
+
+
+def compact_dtypes(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """
+    Cast the columns of a loaded table to the compact types of TABLE_DTYPES.
+
+    Missing counts become 0 and missing flags False, as the table defaults;
+    columns absent from df (partial select) are skipped.
+
+    Args:
+        df: DataFrame loaded from table_name
+        table_name: Table or view the rows come from
+
+    Returns:
+        The DataFrame with its columns cast in place
+    """
+    for column, dtype in TABLE_DTYPES.get(table_name, {}).items():
+        if column not in df.columns:
+            continue
+        if dtype in ('int16', 'int32'):
+            df[column] = pd.to_numeric(df[column]).fillna(0).astype(dtype)
+        elif dtype == 'bool':
+            df[column] = df[column].astype('boolean').fillna(False).astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
@@ -0,0 +1,41 @@
+"""
+Vectorized rate calculations shared by the statistics pages
+"""
+import numpy as np
+import pandas as pd
+
+
+def safe_rate(numerator: pd.Series, denominator: pd.Series, scale: float = 1, decimals: int = 2) -> pd.Series:
+    """
+    Divide two columns element-wise, returning 0 where the denominator is not positive.
+
+    Vectorized replacement for
+    `df.apply(lambda row: round(row[a] / row[b], 2) if row[b] > 0 else 0, axis=1)`.
+
+    Args:
+        numerator: Column to divide
+        denominator: Column to divide by (matches played, shots...)
+        scale: Multiplier applied to the ratio (100 for a percentage)
+        decimals: Number of decimals to round to, or None to keep the raw ratio
+
+    Returns:
+        pandas Series aligned on the numerator index
+    """
+    num = np.asarray(numerator, dtype=float)
+    den = np.asarray(denominator, dtype=float)
+
+    rate = np.divide(num, den, out=np.zeros_like(num), where=den > 0) * scale
+    if decimals is not None:
+        rate = np.round(rate, decimals)
+
+    return pd.Series(rate, index=getattr(numerator, 'index', None))
+
+
+def per_match(total: pd.Series, matches: pd.Series, decimals: int = 2) -> pd.Series:
+    """Average per match (0 for teams/players without a match)"""
+    return safe_rate(total, matches, decimals=decimals)
+
+
+def percentage(part: pd.Series, total: pd.Series, decimals: int = 2) -> pd.Series:
+    """Percentage of part over total (0 when total is 0)"""
+    return safe_rate(part, total, scale=100, decimals=decimals)
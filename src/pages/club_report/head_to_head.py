@@ -0,0 +1,96 @@
+"""
+Section: Face-à-face (bilan contre un adversaire)
+"""
+import streamlit as st
+import pandas as pd
+
+HEAD_TO_HEAD_COUNT_COLUMNS = ['matches', 'team_a_wins', 'draws', 'team_b_wins', 'team_a_goals', 'team_b_goals']
+
+
+@st.cache_data(show_spinner=False)
+def build_head_to_head_index(head_to_head_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index the head_to_head rows by pair of teams (team_a_id, team_b_id).
+
+    The table holds one row per league and pair: the rows of a pair in several
+    leagues are summed and their last meetings pooled.
+    """
+    if head_to_head_df.empty:
+        return None
+
+    pairs = head_to_head_df.groupby(['team_a_id', 'team_b_id'])
+    index = pairs[HEAD_TO_HEAD_COUNT_COLUMNS].sum()
+    index['last_match_ids'] = pairs['last_match_ids'].sum()
+
+    return index
+
+
+def pair_record(head_to_head_index: pd.DataFrame, team_id: int, opponent_id: int) -> dict:
+    """Record of team_id against opponent_id, seen from team_id (None when they never met)"""
+    pair = (min(team_id, opponent_id), max(team_id, opponent_id))
+    if head_to_head_index is None or pair not in head_to_head_index.index:
+        return None
+
+    row = head_to_head_index.loc[pair]
+    side, other = ('a', 'b') if team_id == pair[0] else ('b', 'a')
+
+    return {
+        'matches': int(row['matches']),
+        'wins': int(row[f'team_{side}_wins']),
+        'draws': int(row['draws']),
+        'losses': int(row[f'team_{other}_wins']),
+        'goals_for': int(row[f'team_{side}_goals']),
+        'goals_against': int(row[f'team_{other}_goals']),
+        'last_match_ids': list(row['last_match_ids']),
+    }
+
+
+def render(head_to_head_index: pd.DataFrame, team_id: int, teams_df: pd.DataFrame, match_labels: pd.DataFrame):
+    """Render the head-to-head section of a club"""
+    st.markdown("### 🤝 Face-à-face")
+
+    if head_to_head_index is None:
+        st.info("Aucun face-à-face enregistré")
+        return
+
+    # Adversaires rencontrés (paires contenant l'équipe)
+    pairs = head_to_head_index.index.to_frame(index=False)
+    opponent_ids = pd.concat([
+        pairs.loc[pairs['team_a_id'] == team_id, 'team_b_id'],
+        pairs.loc[pairs['team_b_id'] == team_id, 'team_a_id'],
+    ])
+    opponents = teams_df[teams_df['id'].isin(opponent_ids)].set_index('id')['name'].sort_values()
+
+    if opponents.empty:
+        st.info("Aucun face-à-face enregistré pour ce club")
+        return
+
+    opponent_id = st.selectbox(
+        "Adversaire",
+        options=opponents.index.tolist(),
+        format_func=lambda opponent: opponents[opponent],
+        key="head_to_head_opponent"
+    )
+
+    record = pair_record(head_to_head_index, team_id, opponent_id)
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Rencontres", record['matches'])
+    with col2:
+        st.metric("Victoires", record['wins'])
+    with col3:
+        st.metric("Nuls", record['draws'])
+    with col4:
+        st.metric("Défaites", record['losses'])
+    with col5:
+        goal_diff = record['goals_for'] - record['goals_against']
+        st.metric("Buts pour / contre", f"{record['goals_for']} - {record['goals_against']}", delta=goal_diff)
+
+    # Dernières rencontres (les plus récentes en premier)
+    last_meetings = match_labels.reindex(record['last_match_ids']).dropna(subset=['label'])
+    if not last_meetings.empty:
+        st.markdown("#### Dernières rencontres")
+        last_meetings = last_meetings.sort_values('match_date', ascending=False, na_position='last').head(5)
+        for label in last_meetings['label']:
+            st.markdown(f"- {label.replace(chr(10), ' ')}")
@@ -0,0 +1,81 @@
+"""
+Section: Meilleure Victoire & Pire Défaite (jugées par la cote Elo de l'adversaire)
+"""
+import streamlit as st
+import pandas as pd
+
+
+@st.cache_data(show_spinner=False)
+def build_rated_results(form_history: pd.DataFrame, ratings_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Team-match results (build_team_form history) with the Elo rating of the
+    opponent before each match; None when no rating is stored.
+    """
+    if ratings_df.empty:
+        return None
+
+    ratings_before = ratings_df.set_index(['match_id', 'team_id'])['rating_before']
+    opponent_key = pd.MultiIndex.from_arrays([form_history['match_id'], form_history['opponent_id']])
+
+    rated = form_history[['match_id', 'match_date', 'team_id', 'opponent_id', 'venue', 'goals_for', 'goals_against', 'result']].assign(
+        opponent_rating=ratings_before.reindex(opponent_key).to_numpy()
+    )
+    return rated.dropna(subset=['opponent_rating'])
+
+
+def current_rating(ratings_df: pd.DataFrame, team_id: int) -> float:
+    """Latest Elo rating of a team (None without ratings)"""
+    team_ratings = ratings_df[ratings_df['team_id'] == team_id]
+    if team_ratings.empty:
+        return None
+    return team_ratings.sort_values(['match_date', 'match_id'])['rating'].iloc[-1]
+
+
+def render_result(result: pd.Series, team_names: pd.Series, outcome: str):
+    """Render a win ('success') or a defeat ('error') with the opponent's rating at the time"""
+    location = "🏠 Domicile" if result['venue'] == 'home' else "✈️ Extérieur"
+    opponent = team_names.get(result['opponent_id'], 'N/A')
+    getattr(st, outcome)(f"**{opponent}** (Elo {result['opponent_rating']:.0f})")
+
+    goal_diff = int(result['goals_for'] - result['goals_against'])
+    st.metric(
+        "Score",
+        f"{int(result['goals_for'])} - {int(result['goals_against'])}",
+        delta=f"{goal_diff:+d}"
+    )
+    match_date = result['match_date'].strftime('%d/%m/%Y') if pd.notna(result['match_date']) else 'N/A'
+    st.caption(f"{location} • {match_date}")
+
+
+def render(rated_results: pd.DataFrame, ratings_df: pd.DataFrame, team_id: int, teams_df: pd.DataFrame):
+    """Render the best win / worst defeat section of a club"""
+    st.markdown("### 🏆 Meilleure Victoire & 😞 Pire Défaite")
+
+    if rated_results is None:
+        st.info("Aucune cote Elo disponible (voir src/sql/migrations/007_team_ratings.sql)")
+        return
+
+    rating = current_rating(ratings_df, team_id)
+    if rating is not None:
+        st.caption(f"Victoire contre l'adversaire le mieux coté, défaite contre le moins bien coté (cote Elo avant le match). Cote Elo actuelle du club : {rating:.0f}")
+
+    team_results = rated_results[rated_results['team_id'] == team_id]
+    wins = team_results[team_results['result'] == 1]
+    defeats = team_results[team_results['result'] == -1]
+    team_names = teams_df.set_index('id')['name']
+
+    col_win, col_defeat = st.columns(2)
+
+    with col_win:
+        st.markdown("#### 🏆 Meilleure Victoire")
+        if not wins.empty:
+            render_result(wins.loc[wins['opponent_rating'].idxmax()], team_names, 'success')
+        else:
+            st.info("Aucune victoire enregistrée")
+
+    with col_defeat:
+        st.markdown("#### 😞 Pire Défaite")
+        if not defeats.empty:
+            render_result(defeats.loc[defeats['opponent_rating'].idxmin()], team_names, 'error')
+        else:
+            st.info("Aucune défaite enregistrée")
@@ -0,0 +1,49 @@
+"""
+Section: Forme récente (derniers résultats, séries, différence de buts glissante)
+"""
+import streamlit as st
+import pandas as pd
+import altair as alt
+from src.analytics.form import FORM_MATCHES, streak_label
+
+
+def render(form_history: pd.DataFrame, form_summary: pd.DataFrame, team_id: int):
+    """Render the recent form section of a club (tables from build_team_form)"""
+    st.markdown("### 📉 Forme récente")
+
+    if team_id not in form_summary.index:
+        st.info("Aucun match terminé pour ce club")
+        return
+
+    team_form = form_summary.loc[team_id]
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric(f"{FORM_MATCHES} derniers matchs", team_form['form'])
+    with col2:
+        st.metric("Série en cours", streak_label(team_form['result'], team_form['streak']))
+    with col3:
+        st.metric("Plus longue série de victoires", int(team_form['longest_win_streak']))
+    with col4:
+        st.metric("Plus longue série de défaites", int(team_form['longest_loss_streak']))
+    with col5:
+        rolling_goal_diff = int(team_form['rolling_goal_diff'])
+        st.metric(f"Diff. buts ({FORM_MATCHES} derniers)", rolling_goal_diff, delta=rolling_goal_diff)
+
+    # Différence de buts glissante, match après match
+    history = form_history[form_history['team_id'] == team_id]
+    chart_data = pd.DataFrame({
+        'Match': range(1, len(history) + 1),
+        'Date': history['match_date'].dt.strftime('%d/%m/%Y').fillna('N/A'),
+        'Forme': history['form'],
+        'diff': history['rolling_goal_diff'],
+    })
+
+    chart = alt.Chart(chart_data).mark_line(point=True).encode(
+        x=alt.X('Match:Q', title='Match', axis=alt.Axis(tickMinStep=1)),
+        y=alt.Y('diff:Q', title=f"Diff. buts sur {FORM_MATCHES} matchs"),
+        tooltip=['Match:Q', 'Date:N', 'Forme:N', alt.Tooltip('diff:Q', title='Diff. buts')]
+    )
+    zero_line = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(color='gray', strokeDash=[4, 4]).encode(y='y:Q')
+
+    st.altair_chart(chart + zero_line, use_container_width=True)
@@ -0,0 +1,65 @@
+"""
+Tab: Feuille de match
+"""
+import streamlit as st
+import pandas as pd
+from src.metrics import percentage
+
+
+@st.cache_data(show_spinner=False)
+def build_box_score(stats_df: pd.DataFrame, team_id: int) -> pd.DataFrame:
+    """Build the player statistics table of one team in a match (None when empty)"""
+    if stats_df.empty:
+        return None
+
+    players = stats_df[(stats_df['team_id'] == team_id) & (stats_df['is_official'] == False)]
+    if players.empty:
+        return None
+
+    players = players.sort_values(['goals', 'shots'], ascending=False)
+
+    # Numéro de maillot (absent des matchs importés avant son ajout)
+    shirt_numbers = players['player_number'] if 'player_number' in players.columns else pd.Series(pd.NA, index=players.index)
+
+    return pd.DataFrame({
+        'N°': shirt_numbers.astype('Int16'),
+        'Joueur': players['player_name'],
+        'Buts': players['goals'],
+        'Tirs': players['shots'],
+        'Eff. %': percentage(players['goals'], players['shots'], decimals=1),
+        '7m': players['goals_7m'],
+        'Arrêts': players['saves'],
+        '🟨': players['yellow_cards'],
+        '⏱️': players['two_minutes'],
+        '🟥': players['red_cards'],
+        '🟦': players['blue_cards'],
+    }).reset_index(drop=True)
+
+
+def render(details: dict, home_team_name: str, away_team_name: str):
+    """Render the box score tab (one table per team)"""
+    match = details["match"].iloc[0]
+
+    col_home, col_away = st.columns(2)
+    for column, team_id, team_name in (
+        (col_home, match['home_team_id'], home_team_name),
+        (col_away, match['away_team_id'], away_team_name),
+    ):
+        with column:
+            st.markdown(f"#### {team_name}")
+            box_score = build_box_score(details["stats"], team_id)
+
+            if box_score is None:
+                st.info("Aucune statistique de joueur pour cette équipe")
+                continue
+
+            st.dataframe(
+                box_score,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "N°": st.column_config.NumberColumn("N°", width="small"),
+                    "Joueur": st.column_config.TextColumn("Joueur", width="medium"),
+                    "Eff. %": st.column_config.NumberColumn("Eff. %", format="%.1f%%"),
+                }
+            )
@@ -0,0 +1,72 @@
+"""
+Tab: Supériorité numérique
+"""
+import streamlit as st
+import pandas as pd
+from src.analytics.power_play import power_play_summary, strength_states
+
+
+@st.cache_data(show_spinner=False)
+def build_power_play(actions_df: pd.DataFrame):
+    """
+    Build the power-play summary and the suspension windows of a match.
+
+    Returns (summary, windows) with the power_play_summary rows of the match
+    indexed by side and the states with at least one player suspended, or
+    (None, None) when the actions carry no time.
+    """
+    if actions_df.empty or 'time_seconds' not in actions_df.columns:
+        return None, None
+
+    summary = power_play_summary(actions_df)
+    if summary.empty:
+        return None, None
+
+    windows = strength_states(actions_df)
+    windows = windows[(windows['home_off'] > 0) | (windows['away_off'] > 0)]
+
+    return summary.droplevel('match_id'), windows
+
+
+def format_clock(seconds: int) -> str:
+    """Format a number of seconds as the MM:SS match clock"""
+    return f"{int(seconds) // 60:02d}:{int(seconds) % 60:02d}"
+
+
+def render(details: dict, home_team_name: str, away_team_name: str):
+    """Render the power-play tab"""
+    summary, windows = build_power_play(details["actions"])
+
+    if summary is None:
+        st.info("Aucun déroulé chronométré pour ce match")
+        return
+
+    team_names = {'home': home_team_name, 'away': away_team_name}
+    table = pd.DataFrame({
+        'Équipe': summary.index.map(team_names),
+        'Exclusions': summary['suspensions'],
+        'Min. en supériorité': (summary['seconds_superiority'] / 60).round(1),
+        'Buts en supériorité': summary['goals_superiority'],
+        'Encaissés en supériorité': summary['conceded_superiority'],
+        'Min. en infériorité': (summary['seconds_inferiority'] / 60).round(1),
+        'Buts en infériorité': summary['goals_inferiority'],
+        'Encaissés en infériorité': summary['conceded_inferiority'],
+    }).loc[['home', 'away']]
+
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    if windows.empty:
+        st.caption("Aucune exclusion de 2 minutes dans ce match")
+        return
+
+    st.markdown("#### Périodes d'exclusion")
+    st.dataframe(
+        pd.DataFrame({
+            'Début': windows['time_seconds'].map(format_clock),
+            'Fin': windows['end_seconds'].map(format_clock),
+            f'Exclus {home_team_name}': windows['home_off'],
+            f'Exclus {away_team_name}': windows['away_off'],
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
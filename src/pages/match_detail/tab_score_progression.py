@@ -0,0 +1,67 @@
+"""
+Tab: Évolution du score
+"""
+import streamlit as st
+import pandas as pd
+import altair as alt
+from src.analytics.score_progression import score_events, match_momentum
+
+
+@st.cache_data(show_spinner=False)
+def build_score_progression(actions_df: pd.DataFrame):
+    """
+    Build the score differential series and the momentum summary of a match.
+
+    Returns (events, momentum) with one row per goal and the match_momentum
+    row of the match, or (None, None) when the actions carry no score.
+    """
+    if actions_df.empty or 'score_home' not in actions_df.columns:
+        return None, None
+
+    events = score_events(actions_df)
+    if events.empty:
+        return None, None
+
+    # Point de départ à 0-0 pour la courbe
+    start = pd.DataFrame({'time_seconds': [0], 'score_home': [0], 'score_away': [0], 'diff': [0]})
+    events = pd.concat([start, events[['time_seconds', 'score_home', 'score_away', 'diff']]], ignore_index=True)
+    events['Minute'] = events['time_seconds'] / 60
+    events['Score'] = events['score_home'].astype(str) + ' - ' + events['score_away'].astype(str)
+
+    momentum = match_momentum(actions_df).iloc[0]
+
+    return events, momentum
+
+
+def render(details: dict, home_team_name: str, away_team_name: str):
+    """Render the score progression tab"""
+    events, momentum = build_score_progression(details["actions"])
+
+    if events is None:
+        st.info("Aucun score enregistré dans le déroulé de ce match")
+        return
+
+    # Résumé de la dynamique du match
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Changements de leader", int(momentum['lead_changes']))
+        st.metric("Égalités", int(momentum['ties']))
+    with col2:
+        st.metric(f"Plus grand écart {home_team_name}", f"+{int(momentum['largest_lead_home'])}")
+        st.metric(f"Plus grand écart {away_team_name}", f"+{int(momentum['largest_lead_away'])}")
+    with col3:
+        st.metric(f"Temps en tête {home_team_name}", f"{int(momentum['seconds_leading_home']) // 60} min")
+        st.metric(f"Temps en tête {away_team_name}", f"{int(momentum['seconds_leading_away']) // 60} min")
+    with col4:
+        st.metric(f"Meilleure série {home_team_name}", f"{int(momentum['longest_run_home'])} buts")
+        st.metric(f"Meilleure série {away_team_name}", f"{int(momentum['longest_run_away'])} buts")
+
+    # Écart au score (positif = avantage à l'équipe à domicile)
+    chart = alt.Chart(events).mark_line(interpolate='step-after', point=True).encode(
+        x=alt.X('Minute:Q', title='Minute', scale=alt.Scale(domain=[0, max(60, events['Minute'].max())])),
+        y=alt.Y('diff:Q', title=f"Écart ({home_team_name} - {away_team_name})"),
+        tooltip=[alt.Tooltip('Minute:Q', format='.1f'), 'Score:N', alt.Tooltip('diff:Q', title='Écart')]
+    )
+    zero_line = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(color='gray', strokeDash=[4, 4]).encode(y='y:Q')
+
+    st.altair_chart(chart + zero_line, use_container_width=True)
@@ -0,0 +1,71 @@
+"""
+Tab: Déroulé du match
+"""
+import streamlit as st
+import pandas as pd
+from src.pages.match_detail.utils import ACTION_LABELS
+
+
+@st.cache_data(show_spinner=False)
+def build_timeline(actions_df: pd.DataFrame, stats_df: pd.DataFrame, home_team_name: str, away_team_name: str) -> pd.DataFrame:
+    """
+    Build the chronological list of the match actions (None when empty).
+
+    Players are named as on the match sheet, through the player_id of the
+    action; the name rebuilt from the action text is kept when it has none.
+    """
+    if actions_df.empty:
+        return None
+
+    # Équipe : JR/JV pour les joueurs, Recevant/Visiteur pour les temps morts
+    team_names = {
+        'Home': home_team_name, 'Recevant': home_team_name,
+        'Away': away_team_name, 'Visiteur': away_team_name,
+    }
+    action_types = actions_df['action_type'].astype(str)
+
+    player_names = actions_df['player_name'].astype(object)
+    if 'player_id' in actions_df.columns and not stats_df.empty:
+        sheet_names = stats_df.dropna(subset=['player_id']).drop_duplicates('player_id').set_index('player_id')['player_name'].astype(str)
+        player_names = actions_df['player_id'].map(sheet_names).astype(object).fillna(player_names)
+
+    return pd.DataFrame({
+        'Période': actions_df['period'],
+        'Temps': actions_df['time'],
+        'Score': actions_df['score'],
+        'Équipe': actions_df['team'].astype(str).map(team_names),
+        'Action': action_types.map(ACTION_LABELS).fillna(actions_df['action'].astype(str)),
+        'N°': actions_df['player_number'],
+        'Joueur': player_names,
+    }).reset_index(drop=True)
+
+
+def render(details: dict, home_team_name: str, away_team_name: str):
+    """Render the timeline tab"""
+    timeline = build_timeline(details["actions"], details["stats"], home_team_name, away_team_name)
+
+    if timeline is None:
+        st.info("Aucune action enregistrée pour ce match")
+        return
+
+    # Filtrer par type d'action
+    action_filter = st.multiselect(
+        "Filtrer par action",
+        options=sorted(timeline['Action'].unique().tolist()),
+        key="timeline_action_filter"
+    )
+    if action_filter:
+        timeline = timeline[timeline['Action'].isin(action_filter)]
+
+    st.dataframe(
+        timeline,
+        use_container_width=True,
+        hide_index=True,
+        height=600,
+        column_config={
+            "Période": st.column_config.NumberColumn("Période", width="small"),
+            "Temps": st.column_config.TextColumn("Temps", width="small"),
+            "Score": st.column_config.TextColumn("Score", width="small"),
+            "N°": st.column_config.TextColumn("N°", width="small"),
+        }
+    )
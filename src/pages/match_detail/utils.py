@@ -0,0 +1,49 @@
+"""
+Utility functions for the match detail page
+"""
+import streamlit as st
+import pandas as pd
+
+# Libellés français des types d'action (parse_action_details de read-match.py)
+ACTION_LABELS = {
+    'Goal': 'But',
+    'Goal_7m': 'But 7m',
+    'Shot': 'Tir',
+    'Save': 'Arrêt',
+    'Suspension_2min': '2 minutes',
+    'Warning': 'Avertissement',
+    'Timeout': 'Temps mort',
+    'Concussion_Protocol': 'Protocole commotion',
+}
+
+
+@st.cache_data(show_spinner=False)
+def build_team_fixtures(match_labels: pd.DataFrame, matches_df: pd.DataFrame, team_id: int) -> pd.DataFrame:
+    """
+    Build the fixture list of a team, in chronological order.
+
+    Args:
+        match_labels: Match dimension table (build_match_labels)
+        matches_df: Matches of the selected competition
+        team_id: Team to list the matches of
+
+    Returns:
+        DataFrame indexed by match_id with the match date and a one-line label
+    """
+    team_matches = matches_df[(matches_df['home_team_id'] == team_id) | (matches_df['away_team_id'] == team_id)]
+    fixtures = match_labels.loc[team_matches['id'], ['match_date', 'label']]
+    fixtures['label'] = fixtures['label'].str.replace('\n', ' ', regex=False)
+
+    return fixtures.sort_values('match_date', kind='stable')
+
+
+def neighbour_match_ids(fixtures: pd.DataFrame, match_id: int, distance: int = 2) -> list:
+    """Matches listed just before and after match_id in the fixture list, nearest first"""
+    match_ids = fixtures.index.tolist()
+    position = match_ids.index(match_id)
+    neighbours = []
+    for offset in range(1, distance + 1):
+        for index in (position + offset, position - offset):
+            if 0 <= index < len(match_ids):
+                neighbours.append(match_ids[index])
+    return neighbours
@@ -3,58 +3,46 @@ Tab: Classement des 7m
 """
 import streamlit as st
 import pandas as pd
+from src.pages.utils import to_csv_bytes
 
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_7m_table(season_stats: pd.DataFrame) -> pd.DataFrame:
+    """Build the 7m goals ranking table (None when there is no player)"""
+    if season_stats.empty:
+        return None
+    
+    # Filtrer les joueurs avec au moins 1 but 7m
+    player_7m_stats = season_stats[season_stats['goals_7m'] > 0]
+    
+    # Moyenne de buts 7m par match
+    player_7m_stats['Moy 7m/match'] = player_7m_stats['goals_7m_per_match'].round(2)
+    
+    # Renommer les colonnes
+    player_7m_stats = player_7m_stats.rename(columns={
+        'player_name': 'Joueur',
+        'team_name': 'Équipe',
+        'goals_7m': 'Buts 7m',
+        'matches_played': 'Matchs'
+    })
+    
+    # Trier par buts 7m (ordre décroissant)
+    player_7m_stats = player_7m_stats.sort_values('Buts 7m', ascending=False).reset_index(drop=True)
+    player_7m_stats.insert(0, 'Rang', range(1, len(player_7m_stats) + 1))
+    
+    # Réorganiser les colonnes
+    player_7m_stats = player_7m_stats[['Rang', 'Joueur', 'Équipe', 'Buts 7m', 'Moy 7m/match', 'Matchs']]
+    
+    return player_7m_stats
+
+
+def render(season_stats: pd.DataFrame):
     """Render the 7m goals ranking tab"""
     st.markdown("### 🎯 Classement des buts sur 7 mètres")
     
-    # Filtrer les joueurs (non officiels)
-    players_7m = player_stats_df[player_stats_df['is_official'] == False].copy()
+    player_7m_stats = build_7m_table(season_stats)
     
-    if not players_7m.empty:
-        # D'abord, calculer le nombre de matchs joués par joueur
-        matches_per_player_7m = players_7m.groupby(['player_name', 'team_name']).agg({
-            'match_id': 'nunique'
-        }).reset_index()
-        matches_per_player_7m = matches_per_player_7m.rename(columns={'match_id': 'matches_played'})
-        
-        # Grouper par joueur et équipe, sommer les statistiques
-        player_7m_stats = players_7m.groupby(['player_name', 'team_name']).agg({
-            'goals_7m': 'sum'
-        }).reset_index()
-        
-        # Fusionner avec le nombre de matchs
-        player_7m_stats = player_7m_stats.merge(
-            matches_per_player_7m,
-            on=['player_name', 'team_name'],
-            how='left'
-        )
-        
-        # Filtrer les joueurs avec au moins 1 but 7m
-        player_7m_stats = player_7m_stats[player_7m_stats['goals_7m'] > 0].copy()
-        
-        # Calculer la moyenne de buts 7m par match
-        player_7m_stats['Moy 7m/match'] = player_7m_stats.apply(
-            lambda row: round(row['goals_7m'] / row['matches_played'], 2) if row['matches_played'] > 0 else 0,
-            axis=1
-        )
-        
-        # Renommer les colonnes
-        player_7m_stats = player_7m_stats.rename(columns={
-            'player_name': 'Joueur',
-            'team_name': 'Équipe',
-            'goals_7m': 'Buts 7m',
-            'matches_played': 'Matchs'
-        })
-        
-        # Trier par buts 7m (ordre décroissant)
-        player_7m_stats = player_7m_stats.sort_values('Buts 7m', ascending=False).reset_index(drop=True)
-        player_7m_stats.insert(0, 'Rang', range(1, len(player_7m_stats) + 1))
-        
-        # Réorganiser les colonnes
-        player_7m_stats = player_7m_stats[['Rang', 'Joueur', 'Équipe', 'Buts 7m', 'Moy 7m/match', 'Matchs']]
-        
+    if player_7m_stats is not None:
         # Options de pagination
         st.markdown("#### Options d'affichage")
         col1, col2 = st.columns([1, 3])
@@ -78,7 +66,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         
         # Appliquer le filtre d'équipe
         if selected_team_7m != 'Toutes les équipes':
-            filtered_7m_stats = player_7m_stats[player_7m_stats['Équipe'] == selected_team_7m].copy()
+            filtered_7m_stats = player_7m_stats[player_7m_stats['Équipe'] == selected_team_7m]
             filtered_7m_stats['Rang'] = range(1, len(filtered_7m_stats) + 1)
         else:
             filtered_7m_stats = player_7m_stats
@@ -141,7 +129,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         # Option de téléchargement
         st.download_button(
             label="📥 Télécharger les statistiques des 7m CSV",
-            data=filtered_7m_stats.to_csv(index=False).encode('utf-8'),
+            data=to_csv_bytes(filtered_7m_stats),
             file_name='stats_7m.csv',
             mime='text/csv',
         )
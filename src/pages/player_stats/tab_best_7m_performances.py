@@ -3,73 +3,63 @@ Tab: Meilleures performances 7m
 """
 import streamlit as st
 import pandas as pd
+from src.pages.player_stats.utils import load_player_match_stats
+from src.pages.utils import to_csv_bytes, build_match_labels
 
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_best_7m_performances_table(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+    """
+    Build the best 7m performances table (7m goals in a single match).
+
+    Returns the top 100 table and the total number of performances, or
+    (None, 0) when there is no data to rank.
+    """
+    # Joueurs non officiels de la compétition (téléchargés seulement quand les matchs changent)
+    field_players_7m = load_player_match_stats(league_id, matches_df)
+    if field_players_7m.empty or matches_df.empty:
+        return None, 0
+    
+    # Filtrer les performances avec au moins 1 but 7m
+    performances_7m = field_players_7m[field_players_7m['goals_7m'] > 0]
+    if performances_7m.empty:
+        return pd.DataFrame(), 0
+    
+    # Garder les 100 meilleures avant le formatage
+    total_performances = len(performances_7m)
+    performances_7m = performances_7m.nlargest(100, 'goals_7m')
+    
+    # Libellé du match par recherche dans la table des matchs (indexée par match_id)
+    match_labels = build_match_labels(matches_df, teams_df)
+    performances_7m['Match'] = performances_7m['match_id'].map(match_labels['label']).fillna('N/A')
+    
+    # Renommer les colonnes
+    performances_7m = performances_7m.rename(columns={
+        'player_name': 'Joueur',
+        'team_name': 'Équipe',
+        'goals_7m': 'Buts 7m'
+    })
+    
+    # Sélectionner et réorganiser les colonnes
+    performances_7m_display = performances_7m[['Joueur', 'Équipe', 'Buts 7m', 'Match']]
+    
+    # Les performances sont déjà triées par buts 7m (ordre décroissant)
+    performances_7m_display = performances_7m_display.reset_index(drop=True)
+    performances_7m_display.insert(0, 'Rang', range(1, len(performances_7m_display) + 1))
+    
+    return performances_7m_display, total_performances
+
+
+def render(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
     """Render the best 7m performances tab"""
     st.markdown("### 🎯 Meilleures performances 7m")
     
-    # Filtrer les joueurs de champ (non officiels)
-    field_players_7m = player_stats_df[player_stats_df['is_official'] == False].copy()
+    performances_7m_display, total_performances = build_best_7m_performances_table(league_id, matches_df, teams_df)
     
-    if not field_players_7m.empty and not matches_df.empty:
-        # Filtrer les performances avec au moins 1 but 7m
-        performances_7m = field_players_7m[field_players_7m['goals_7m'] > 0].copy()
-        
-        if not performances_7m.empty:
-            # Fusionner avec les informations des matchs
-            performances_7m = performances_7m.merge(
-                matches_df[['id', 'home_team_id', 'away_team_id', 'match_date', 
-                            'final_score_home', 'final_score_away']],
-                left_on='match_id',
-                right_on='id',
-                how='left'
-            )
-            
-            # Ajouter les noms des équipes
-            performances_7m = performances_7m.merge(
-                teams_df[['id', 'name']],
-                left_on='home_team_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_home')
-            ).rename(columns={'name': 'home_team_name'})
-            
-            performances_7m = performances_7m.merge(
-                teams_df[['id', 'name']],
-                left_on='away_team_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_away')
-            ).rename(columns={'name': 'away_team_name'})
-            
-            # Créer la colonne "Match" avec le format demandé
-            def format_match_info_7m(row):
-                if pd.notna(row.get('home_team_name')) and pd.notna(row.get('away_team_name')):
-                    # Construire la chaîne du match sur deux lignes
-                    match_line = f"{row['home_team_name']} {int(row['final_score_home'])} - {int(row['final_score_away'])} {row['away_team_name']}"
-                    date_line = pd.to_datetime(row['match_date']).strftime('%d/%m/%Y')
-                    return f"{match_line}\n({date_line})"
-                return "N/A"
-            
-            performances_7m['Match'] = performances_7m.apply(format_match_info_7m, axis=1)
-            
-            # Renommer les colonnes
-            performances_7m = performances_7m.rename(columns={
-                'player_name': 'Joueur',
-                'team_name': 'Équipe',
-                'goals_7m': 'Buts 7m'
-            })
-            
-            # Sélectionner et réorganiser les colonnes
-            performances_7m_display = performances_7m[['Joueur', 'Équipe', 'Buts 7m', 'Match']].copy()
-            
-            # Trier par buts 7m (ordre décroissant) et garder seulement les 100 meilleures
-            performances_7m_display = performances_7m_display.sort_values('Buts 7m', ascending=False).head(100).reset_index(drop=True)
-            performances_7m_display.insert(0, 'Rang', range(1, len(performances_7m_display) + 1))
-            
+    if performances_7m_display is not None:
+        if total_performances > 0:
             # Afficher un message informatif
-            st.info(f"🎯 Affichage des 100 meilleures performances 7m (sur {len(performances_7m)} performances totales)")
+            st.info(f"🎯 Affichage des 100 meilleures performances 7m (sur {total_performances} performances totales)")
             
             # Options de pagination
             st.markdown("#### Options d'affichage")
@@ -94,7 +84,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             
             # Appliquer le filtre d'équipe
             if selected_team_perf_7m != 'Toutes les équipes':
-                filtered_perf_7m_stats = performances_7m_display[performances_7m_display['Équipe'] == selected_team_perf_7m].copy()
+                filtered_perf_7m_stats = performances_7m_display[performances_7m_display['Équipe'] == selected_team_perf_7m]
                 filtered_perf_7m_stats['Rang'] = range(1, len(filtered_perf_7m_stats) + 1)
             else:
                 filtered_perf_7m_stats = performances_7m_display
@@ -161,7 +151,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             # Option de téléchargement
             st.download_button(
                 label="📥 Télécharger les performances 7m CSV",
-                data=filtered_perf_7m_stats.to_csv(index=False).encode('utf-8'),
+                data=to_csv_bytes(filtered_perf_7m_stats),
                 file_name='meilleures_performances_7m.csv',
                 mime='text/csv',
             )
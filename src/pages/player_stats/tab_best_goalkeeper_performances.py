@@ -3,73 +3,108 @@ Tab: Meilleures performances gardiens
 """
 import streamlit as st
 import pandas as pd
+from src.analytics.goalkeeping import goalkeeper_match_stats, goalkeepers_on_court
+from src.database import get_actions
+from src.pages.player_stats.utils import load_player_match_stats
+from src.pages.utils import to_csv_bytes, build_match_labels
 
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+# Classements proposés : pourcentage d'arrêts du match ou nombre d'arrêts
+SORT_OPTIONS = ["% arrêts", "Arrêts"]
+
+# Colonnes du déroulé nécessaires pour savoir quel gardien était sur le terrain (chargement allégé)
+GOALKEEPER_ACTION_COLUMNS = "id,match_id,time_seconds,action_type,team,player_id"
+
+
+@st.cache_data(show_spinner=False)
+def build_goalkeepers_on_court(league_id: int, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Goals conceded by each goalkeeper while on court in every match of the season.
+
+    The actions of the league are downloaded on a cache miss only and just the
+    per-goalkeeper totals are kept. matches_df is part of the cache key: an
+    import or re-import changes it and triggers a reload.
+    """
+    actions_df = get_actions(league_id, GOALKEEPER_ACTION_COLUMNS)
+    if actions_df.empty:
+        return None
+    return goalkeepers_on_court(actions_df, matches_df)
+
+
+@st.cache_data(show_spinner=False)
+def build_best_goalkeeper_performances_table(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame,
+                                             sort_by: str = "% arrêts", min_shots_faced: int = 0):
+    """
+    Build the best goalkeeper performances table (saves and save percentage in a single match).
+
+    Returns the top 100 table and the total number of performances, or
+    (None, 0) when there is no data to rank.
+    """
+    # Joueurs non officiels de la compétition (téléchargés seulement quand les matchs changent)
+    all_players = load_player_match_stats(league_id, matches_df)
+    if all_players.empty or matches_df.empty:
+        return None, 0
+    
+    # Performances avec au moins 1 arrêt, buts encaissés attribués au gardien sur le terrain
+    performances = goalkeeper_match_stats(all_players, matches_df, build_goalkeepers_on_court(league_id, matches_df))
+    performances = performances[performances['shots_faced'] >= min_shots_faced]
+    if performances.empty:
+        return pd.DataFrame(), 0
+    
+    # Garder les 100 meilleures avant le formatage
+    total_performances = len(performances)
+    sort_columns = ['save_percentage', 'saves'] if sort_by == "% arrêts" else ['saves', 'save_percentage']
+    performances = performances.sort_values(sort_columns, ascending=False, kind='stable').head(100)
+    
+    # Libellé du match par recherche dans la table des matchs (indexée par match_id)
+    match_labels = build_match_labels(matches_df, teams_df)
+    performances['Match'] = performances['match_id'].map(match_labels['label']).fillna('N/A')
+    performances['shots_faced'] = performances['shots_faced'].round().astype(int)
+    
+    # Renommer les colonnes
+    performances = performances.rename(columns={
+        'player_name': 'Gardien',
+        'team_name': 'Équipe',
+        'saves': 'Arrêts',
+        'shots_faced': 'Tirs subis',
+        'save_percentage': '% arrêts'
+    })
+    
+    # Sélectionner et réorganiser les colonnes
+    performances_display = performances[['Gardien', 'Équipe', '% arrêts', 'Arrêts', 'Tirs subis', 'Match']]
+    
+    # Les performances sont déjà triées selon le critère choisi (ordre décroissant)
+    performances_display = performances_display.reset_index(drop=True)
+    performances_display.insert(0, 'Rang', range(1, len(performances_display) + 1))
+    
+    return performances_display, total_performances
+
+
+def render(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
     """Render the best goalkeeper performances tab"""
     st.markdown("### 🧤 Meilleures performances gardiens")
     
-    # Filtrer les joueurs non officiels
-    all_players = player_stats_df[player_stats_df['is_official'] == False].copy()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        sort_by = st.radio("Classer par", options=SORT_OPTIONS, horizontal=True, key="gk_performance_sort")
+    with col2:
+        # Un pourcentage sur quelques tirs ne veut rien dire : seuil de tirs subis
+        min_shots_faced = st.number_input(
+            "Tirs subis minimum",
+            min_value=0,
+            value=15 if sort_by == "% arrêts" else 0,
+            step=5,
+            key=f"gk_performance_min_shots_{sort_by}"
+        )
     
-    if not all_players.empty and not matches_df.empty:
-        # Filtrer les performances avec au moins 1 arrêt
-        performances = all_players[all_players['saves'] > 0].copy()
-        
-        if not performances.empty:
-            # Fusionner avec les informations des matchs
-            performances = performances.merge(
-                matches_df[['id', 'home_team_id', 'away_team_id', 'match_date', 
-                            'final_score_home', 'final_score_away']],
-                left_on='match_id',
-                right_on='id',
-                how='left'
-            )
-            
-            # Ajouter les noms des équipes
-            performances = performances.merge(
-                teams_df[['id', 'name']],
-                left_on='home_team_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_home')
-            ).rename(columns={'name': 'home_team_name'})
-            
-            performances = performances.merge(
-                teams_df[['id', 'name']],
-                left_on='away_team_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_away')
-            ).rename(columns={'name': 'away_team_name'})
-            
-            # Créer la colonne "Match" avec le format demandé
-            def format_match_info(row):
-                if pd.notna(row.get('home_team_name')) and pd.notna(row.get('away_team_name')):
-                    # Construire la chaîne du match sur deux lignes
-                    match_line = f"{row['home_team_name']} {int(row['final_score_home'])} - {int(row['final_score_away'])} {row['away_team_name']}"
-                    date_line = pd.to_datetime(row['match_date']).strftime('%d/%m/%Y')
-                    return f"{match_line}\n({date_line})"
-                return "N/A"
-            
-            performances['Match'] = performances.apply(format_match_info, axis=1)
-            
-            # Renommer les colonnes
-            performances = performances.rename(columns={
-                'player_name': 'Gardien',
-                'team_name': 'Équipe',
-                'saves': 'Arrêts'
-            })
-            
-            # Sélectionner et réorganiser les colonnes
-            performances_display = performances[['Gardien', 'Équipe', 'Arrêts', 'Match']].copy()
-            
-            # Trier par arrêts (ordre décroissant) et garder seulement les 100 meilleures
-            performances_display = performances_display.sort_values('Arrêts', ascending=False).head(100).reset_index(drop=True)
-            performances_display.insert(0, 'Rang', range(1, len(performances_display) + 1))
-            
+    performances_display, total_performances = build_best_goalkeeper_performances_table(
+        league_id, matches_df, teams_df, sort_by, min_shots_faced
+    )
+    
+    if performances_display is not None:
+        if total_performances > 0:
             # Afficher un message informatif
-            st.info(f"🧤 Affichage des 100 meilleures performances gardien (sur {len(performances)} performances totales)")
+            st.info(f"🧤 Affichage des 100 meilleures performances gardien (sur {total_performances} performances totales)")
             
             # Options de pagination
             st.markdown("#### Options d'affichage")
@@ -94,7 +129,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             
             # Appliquer le filtre d'équipe
             if selected_team_perf != 'Toutes les équipes':
-                filtered_perf = performances_display[performances_display['Équipe'] == selected_team_perf].copy()
+                filtered_perf = performances_display[performances_display['Équipe'] == selected_team_perf]
                 filtered_perf['Rang'] = range(1, len(filtered_perf) + 1)
             else:
                 filtered_perf = performances_display
@@ -139,11 +174,22 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
                         help="Équipe",
                         width="medium"
                     ),
+                    "% arrêts": st.column_config.NumberColumn(
+                        "% arrêts",
+                        help="Arrêts / tirs subis (arrêts + buts encaissés)",
+                        format="%.1f%%",
+                        width="small"
+                    ),
                     "Arrêts": st.column_config.NumberColumn(
                         "Arrêts",
                         help="Nombre d'arrêts dans le match",
                         width="small"
                     ),
+                    "Tirs subis": st.column_config.NumberColumn(
+                        "Tirs subis",
+                        help="Arrêts + buts encaissés dans le match",
+                        width="small"
+                    ),
                     "Match": st.column_config.TextColumn(
                         "Match",
                         help="Informations du match",
@@ -161,15 +207,20 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
                 st.metric(
                     "Meilleure performance",
                     f"{best_perf['Gardien']}",
-                    f"{int(best_perf['Arrêts'])} arrêts"
+                    f"{best_perf['% arrêts']:.1f}% ({int(best_perf['Arrêts'])}/{int(best_perf['Tirs subis'])})"
                 )
             
             with col2:
-                avg_saves = filtered_perf['Arrêts'].mean()
-                st.metric(
-                    "Moyenne top 100",
-                    f"{avg_saves:.1f} arrêts"
-                )
+                if sort_by == "% arrêts":
+                    st.metric(
+                        "Moyenne top 100",
+                        f"{filtered_perf['% arrêts'].mean():.1f}% d'arrêts"
+                    )
+                else:
+                    st.metric(
+                        "Moyenne top 100",
+                        f"{filtered_perf['Arrêts'].mean():.1f} arrêts"
+                    )
             
             with col3:
                 total_performances = len(filtered_perf)
@@ -188,11 +239,11 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             # Bouton de téléchargement
             st.download_button(
                 label="📥 Télécharger les statistiques CSV",
-                data=filtered_perf.to_csv(index=False).encode('utf-8'),
+                data=to_csv_bytes(filtered_perf),
                 file_name='meilleures_performances_gardiens.csv',
                 mime='text/csv',
             )
         else:
-            st.info("Aucune performance de gardien enregistrée.")
+            st.info("Aucune performance de gardien n'atteint ce nombre de tirs subis." if min_shots_faced > 0 else "Aucune performance de gardien enregistrée.")
     else:
         st.info("Aucune donnée disponible.")
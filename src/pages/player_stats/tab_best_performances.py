@@ -3,81 +3,69 @@ Tab: Meilleures performances
 """
 import streamlit as st
 import pandas as pd
+from src.metrics import percentage
+from src.pages.player_stats.utils import load_player_match_stats
+from src.pages.utils import to_csv_bytes, build_match_labels
 
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_best_performances_table(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+    """
+    Build the best individual performances table (goals in a single match).
+
+    Returns the top 100 table and the total number of performances, or
+    (None, 0) when there is no data to rank.
+    """
+    # Joueurs non officiels de la compétition (téléchargés seulement quand les matchs changent)
+    field_players = load_player_match_stats(league_id, matches_df)
+    if field_players.empty or matches_df.empty:
+        return None, 0
+    
+    # Filtrer les performances avec au moins 1 but
+    performances = field_players[field_players['goals'] > 0]
+    if performances.empty:
+        return pd.DataFrame(), 0
+    
+    # Garder les 100 meilleures avant le formatage
+    total_performances = len(performances)
+    performances = performances.nlargest(100, 'goals')
+    
+    # Libellé du match par recherche dans la table des matchs (indexée par match_id)
+    match_labels = build_match_labels(matches_df, teams_df)
+    performances['Match'] = performances['match_id'].map(match_labels['label']).fillna('N/A')
+    
+    # Calculer l'efficacité
+    performances['Efficacité'] = percentage(performances['goals'], performances['shots'])
+    
+    # Renommer les colonnes
+    performances = performances.rename(columns={
+        'player_name': 'Joueur',
+        'team_name': 'Équipe',
+        'goals': 'Buts',
+        'shots': 'Tirs'
+    })
+    
+    # Sélectionner et réorganiser les colonnes
+    performances_display = performances[['Joueur', 'Équipe', 'Buts', 'Tirs', 
+                                          'Efficacité', 'Match']]
+    
+    # Les performances sont déjà triées par buts (ordre décroissant)
+    performances_display = performances_display.reset_index(drop=True)
+    performances_display.insert(0, 'Rang', range(1, len(performances_display) + 1))
+    
+    return performances_display, total_performances
+
+
+def render(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
     """Render the best performances tab"""
     st.markdown("### 🌟 Meilleures performances individuelles")
     
-    # Filtrer les joueurs de champ (non officiels, non gardiens)
-    field_players = player_stats_df[player_stats_df['is_official'] == False].copy()
+    performances_display, total_performances = build_best_performances_table(league_id, matches_df, teams_df)
     
-    if not field_players.empty and not matches_df.empty:
-        # Filtrer les performances avec au moins 1 but
-        performances = field_players[field_players['goals'] > 0].copy()
-        
-        if not performances.empty:
-            # Fusionner avec les informations des matchs
-            performances = performances.merge(
-                matches_df[['id', 'home_team_id', 'away_team_id', 'match_date', 
-                            'final_score_home', 'final_score_away']],
-                left_on='match_id',
-                right_on='id',
-                how='left'
-            )
-            
-            # Ajouter les noms des équipes
-            performances = performances.merge(
-                teams_df[['id', 'name']],
-                left_on='home_team_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_home')
-            ).rename(columns={'name': 'home_team_name'})
-            
-            performances = performances.merge(
-                teams_df[['id', 'name']],
-                left_on='away_team_id',
-                right_on='id',
-                how='left',
-                suffixes=('', '_away')
-            ).rename(columns={'name': 'away_team_name'})
-            
-            # Créer la colonne "Match" avec le format demandé
-            def format_match_info(row):
-                if pd.notna(row.get('home_team_name')) and pd.notna(row.get('away_team_name')):
-                    # Construire la chaîne du match sur deux lignes
-                    match_line = f"{row['home_team_name']} {int(row['final_score_home'])} - {int(row['final_score_away'])} {row['away_team_name']}"
-                    date_line = pd.to_datetime(row['match_date']).strftime('%d/%m/%Y')
-                    return f"{match_line}\n({date_line})"
-                return "N/A"
-            
-            performances['Match'] = performances.apply(format_match_info, axis=1)
-            
-            # Calculer l'efficacité
-            performances['Efficacité'] = performances.apply(
-                lambda row: round(row['goals'] / row['shots'] * 100, 2) if row['shots'] > 0 else 0,
-                axis=1
-            )
-            
-            # Renommer les colonnes
-            performances = performances.rename(columns={
-                'player_name': 'Joueur',
-                'team_name': 'Équipe',
-                'goals': 'Buts',
-                'shots': 'Tirs'
-            })
-            
-            # Sélectionner et réorganiser les colonnes
-            performances_display = performances[['Joueur', 'Équipe', 'Buts', 'Tirs', 
-                                                  'Efficacité', 'Match']].copy()
-            
-            # Trier par buts (ordre décroissant) et garder seulement les 100 meilleures
-            performances_display = performances_display.sort_values('Buts', ascending=False).head(100).reset_index(drop=True)
-            performances_display.insert(0, 'Rang', range(1, len(performances_display) + 1))
-            
+    if performances_display is not None:
+        if total_performances > 0:
             # Afficher un message informatif
-            st.info(f"🌟 Affichage des 100 meilleures performances (sur {len(performances)} performances totales)")
+            st.info(f"🌟 Affichage des 100 meilleures performances (sur {total_performances} performances totales)")
             
             # Options de pagination
             st.markdown("#### Options d'affichage")
@@ -102,7 +90,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             
             # Appliquer le filtre d'équipe
             if selected_team_perf != 'Toutes les équipes':
-                filtered_perf_stats = performances_display[performances_display['Équipe'] == selected_team_perf].copy()
+                filtered_perf_stats = performances_display[performances_display['Équipe'] == selected_team_perf]
                 filtered_perf_stats['Rang'] = range(1, len(filtered_perf_stats) + 1)
             else:
                 filtered_perf_stats = performances_display
@@ -169,7 +157,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             # Option de téléchargement
             st.download_button(
                 label="📥 Télécharger les performances CSV",
-                data=filtered_perf_stats.to_csv(index=False).encode('utf-8'),
+                data=to_csv_bytes(filtered_perf_stats),
                 file_name='meilleures_performances.csv',
                 mime='text/csv',
             )
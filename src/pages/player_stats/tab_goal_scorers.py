@@ -3,68 +3,49 @@ Tab: Classement des buteurs
 """
 import streamlit as st
 import pandas as pd
+from src.pages.utils import to_csv_bytes
 
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_goal_scorers_table(season_stats: pd.DataFrame) -> pd.DataFrame:
+    """Build the goal scorers ranking table (None when there is no player)"""
+    if season_stats.empty:
+        return None
+    
+    # Filtrer les joueurs avec au moins 1 but
+    player_goals_stats = season_stats[season_stats['goals'] > 0]
+    
+    # Pourcentage de réussite et moyenne de buts par match
+    player_goals_stats['% Réussite'] = player_goals_stats['efficiency'].round(2)
+    player_goals_stats['Moy buts/match'] = player_goals_stats['goals_per_match'].round(2)
+    
+    # Renommer les colonnes
+    player_goals_stats = player_goals_stats.rename(columns={
+        'player_name': 'Joueur',
+        'team_name': 'Équipe',
+        'goals': 'Buts',
+        'shots': 'Tirs',
+        'matches_played': 'Matchs'
+    })
+    
+    # Trier par buts (ordre décroissant)
+    player_goals_stats = player_goals_stats.sort_values('Buts', ascending=False).reset_index(drop=True)
+    player_goals_stats.insert(0, 'Rang', range(1, len(player_goals_stats) + 1))
+    
+    # Réorganiser les colonnes
+    player_goals_stats = player_goals_stats[['Rang', 'Joueur', 'Équipe', 'Buts', 'Moy buts/match', 
+                                              '% Réussite', 'Tirs', 'Matchs']]
+    
+    return player_goals_stats
+
+
+def render(season_stats: pd.DataFrame):
     """Render the goal scorers ranking tab"""
     st.markdown("### ⚽ Classement général des buteurs")
     
-    # Filtrer les joueurs (non officiels)
-    players = player_stats_df[player_stats_df['is_official'] == False].copy()
+    player_goals_stats = build_goal_scorers_table(season_stats)
     
-    if not players.empty:
-        # D'abord, calculer le nombre de matchs joués par joueur en comptant tous les matchs
-        # où ils ont une entrée dans player_stats (peu importe les stats)
-        matches_per_player = players.groupby(['player_name', 'team_name']).agg({
-            'match_id': 'nunique'
-        }).reset_index()
-        matches_per_player = matches_per_player.rename(columns={'match_id': 'matches_played'})
-        
-        # Grouper par joueur et équipe, sommer les statistiques
-        player_goals_stats = players.groupby(['player_name', 'team_name']).agg({
-            'goals': 'sum',
-            'shots': 'sum'
-        }).reset_index()
-        
-        # Fusionner avec le nombre de matchs
-        player_goals_stats = player_goals_stats.merge(
-            matches_per_player,
-            on=['player_name', 'team_name'],
-            how='left'
-        )
-        
-        # Filtrer les joueurs avec au moins 1 but
-        player_goals_stats = player_goals_stats[player_goals_stats['goals'] > 0].copy()
-        
-        # Calculer le pourcentage de réussite
-        player_goals_stats['% Réussite'] = player_goals_stats.apply(
-            lambda row: round(row['goals'] / row['shots'] * 100, 2) if row['shots'] > 0 else 0,
-            axis=1
-        )
-        
-        # Calculer la moyenne de buts par match
-        player_goals_stats['Moy buts/match'] = player_goals_stats.apply(
-            lambda row: round(row['goals'] / row['matches_played'], 2) if row['matches_played'] > 0 else 0,
-            axis=1
-        )
-        
-        # Renommer les colonnes
-        player_goals_stats = player_goals_stats.rename(columns={
-            'player_name': 'Joueur',
-            'team_name': 'Équipe',
-            'goals': 'Buts',
-            'shots': 'Tirs',
-            'matches_played': 'Matchs'
-        })
-        
-        # Trier par buts (ordre décroissant)
-        player_goals_stats = player_goals_stats.sort_values('Buts', ascending=False).reset_index(drop=True)
-        player_goals_stats.insert(0, 'Rang', range(1, len(player_goals_stats) + 1))
-        
-        # Réorganiser les colonnes
-        player_goals_stats = player_goals_stats[['Rang', 'Joueur', 'Équipe', 'Buts', 'Moy buts/match', 
-                                                  '% Réussite', 'Tirs', 'Matchs']]
-        
+    if player_goals_stats is not None:
         # Options de pagination
         st.markdown("#### Options d'affichage")
         col1, col2 = st.columns([1, 3])
@@ -88,7 +69,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         
         # Appliquer le filtre d'équipe
         if selected_team != 'Toutes les équipes':
-            filtered_stats = player_goals_stats[player_goals_stats['Équipe'] == selected_team].copy()
+            filtered_stats = player_goals_stats[player_goals_stats['Équipe'] == selected_team]
             filtered_stats['Rang'] = range(1, len(filtered_stats) + 1)
         else:
             filtered_stats = player_goals_stats
@@ -158,7 +139,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         # Option de téléchargement
         st.download_button(
             label="📥 Télécharger les statistiques complètes CSV",
-            data=filtered_stats.to_csv(index=False).encode('utf-8'),
+            data=to_csv_bytes(filtered_stats),
             file_name='stats_buteurs.csv',
             mime='text/csv',
         )
@@ -3,66 +3,89 @@ Tab: Classement des gardiens
 """
 import streamlit as st
 import pandas as pd
+from src.metrics import per_match, percentage
+from src.pages.utils import to_csv_bytes
 
+# Classements proposés : pourcentage d'arrêts (sur les tirs subis) ou volume d'arrêts
+SORT_OPTIONS = ["% arrêts", "Arrêts"]
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+
+@st.cache_data(show_spinner=False)
+def build_goalkeepers_table(goalkeeper_totals_df: pd.DataFrame, sort_by: str = "% arrêts", min_shots_faced: int = 0) -> pd.DataFrame:
+    """
+    Build the goalkeepers ranking table (None when there is no goalkeeper,
+    empty when none reaches min_shots_faced).
+
+    The save percentage is computed on the shots faced (saves + goals conceded)
+    of the matches with a final score; goalkeepers who faced fewer than
+    min_shots_faced shots are left out.
+    """
+    if goalkeeper_totals_df.empty:
+        return None
+    
+    # La vue goalkeeper_season_stats contient une ligne par ligue : sommer par gardien
+    # (ses matchs joués comptent aussi les matchs sans arrêt)
+    goalkeeper_stats = goalkeeper_totals_df.groupby(['player_id', 'player_name', 'team_name'], observed=True, dropna=False)[
+        ['saves', 'matches_played', 'goals_conceded', 'shots_faced']
+    ].sum().reset_index()
+    goalkeeper_stats = goalkeeper_stats[goalkeeper_stats['shots_faced'] >= min_shots_faced]
+    if goalkeeper_stats.empty:
+        return pd.DataFrame()
+    
+    # Moyenne d'arrêts par match
+    goalkeeper_stats['Moy arrêts/match'] = per_match(goalkeeper_stats['saves'], goalkeeper_stats['matches_played'])
+    
+    # Pourcentage d'arrêts sur les tirs subis (arrêts des matchs avec score final)
+    goalkeeper_stats['% arrêts'] = percentage(
+        goalkeeper_stats['shots_faced'] - goalkeeper_stats['goals_conceded'],
+        goalkeeper_stats['shots_faced'],
+        decimals=1
+    )
+    goalkeeper_stats['shots_faced'] = goalkeeper_stats['shots_faced'].round().astype(int)
+    
+    # Renommer les colonnes
+    goalkeeper_stats = goalkeeper_stats.rename(columns={
+        'player_name': 'Gardien',
+        'team_name': 'Équipe',
+        'saves': 'Arrêts',
+        'shots_faced': 'Tirs subis',
+        'matches_played': 'Matchs'
+    })
+    
+    # Trier par le critère choisi (ordre décroissant, arrêts en départage)
+    goalkeeper_stats = goalkeeper_stats.sort_values(
+        [sort_by, 'Arrêts'], ascending=False
+    ).reset_index(drop=True)
+    goalkeeper_stats.insert(0, 'Rang', range(1, len(goalkeeper_stats) + 1))
+    
+    # Réorganiser les colonnes
+    goalkeeper_stats = goalkeeper_stats[['Rang', 'Gardien', 'Équipe', '% arrêts', 'Arrêts', 'Tirs subis', 'Moy arrêts/match', 'Matchs']]
+    
+    return goalkeeper_stats
+
+
+def render(goalkeeper_totals_df: pd.DataFrame):
     """Render the goalkeepers ranking tab"""
     st.markdown("### 🧤 Classement des gardiens")
     
-    # Filtrer les joueurs (non officiels) pour identifier les gardiens
-    # Un gardien est quelqu'un qui a au moins un arrêt dans sa carrière
-    all_players = player_stats_df[player_stats_df['is_official'] == False].copy()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        sort_by = st.radio("Classer par", options=SORT_OPTIONS, horizontal=True, key="goalkeeper_sort")
+    with col2:
+        # Un pourcentage sur quelques tirs ne veut rien dire : seuil de tirs subis
+        min_shots_faced = st.number_input(
+            "Tirs subis minimum",
+            min_value=0,
+            value=50 if sort_by == "% arrêts" else 0,
+            step=10,
+            key=f"goalkeeper_min_shots_{sort_by}"
+        )
     
-    # Identifier les gardiens (joueurs qui ont fait au moins 1 arrêt)
-    goalkeeper_ids = all_players[all_players['saves'] > 0][['player_name', 'team_name']].drop_duplicates()
+    goalkeeper_stats = build_goalkeepers_table(goalkeeper_totals_df, sort_by, min_shots_faced)
     
-    if not goalkeeper_ids.empty:
-        # Filtrer toutes les statistiques des gardiens (même les matchs sans arrêt)
-        goalkeepers = all_players.merge(
-            goalkeeper_ids,
-            on=['player_name', 'team_name'],
-            how='inner'
-        )
-        
-        # D'abord, calculer le nombre de matchs joués (tous les matchs, pas seulement ceux avec arrêts)
-        matches_per_goalkeeper = goalkeepers.groupby(['player_name', 'team_name']).agg({
-            'match_id': 'nunique'
-        }).reset_index()
-        matches_per_goalkeeper = matches_per_goalkeeper.rename(columns={'match_id': 'matches_played'})
-        
-        # Grouper par joueur et équipe, sommer les statistiques
-        goalkeeper_stats = goalkeepers.groupby(['player_name', 'team_name']).agg({
-            'saves': 'sum'
-        }).reset_index()
-        
-        # Fusionner avec le nombre de matchs
-        goalkeeper_stats = goalkeeper_stats.merge(
-            matches_per_goalkeeper,
-            on=['player_name', 'team_name'],
-            how='left'
-        )
-        
-        # Calculer la moyenne d'arrêts par match
-        goalkeeper_stats['Moy arrêts/match'] = goalkeeper_stats.apply(
-            lambda row: round(row['saves'] / row['matches_played'], 2) if row['matches_played'] > 0 else 0,
-            axis=1
-        )
-        
-        # Renommer les colonnes
-        goalkeeper_stats = goalkeeper_stats.rename(columns={
-            'player_name': 'Gardien',
-            'team_name': 'Équipe',
-            'saves': 'Arrêts',
-            'matches_played': 'Matchs'
-        })
-        
-        # Trier par arrêts (ordre décroissant)
-        goalkeeper_stats = goalkeeper_stats.sort_values('Arrêts', ascending=False).reset_index(drop=True)
-        goalkeeper_stats.insert(0, 'Rang', range(1, len(goalkeeper_stats) + 1))
-        
-        # Réorganiser les colonnes
-        goalkeeper_stats = goalkeeper_stats[['Rang', 'Gardien', 'Équipe', 'Arrêts', 'Moy arrêts/match', 'Matchs']]
-        
+    if goalkeeper_stats is not None and goalkeeper_stats.empty:
+        st.info("Aucun gardien n'atteint ce nombre de tirs subis.")
+    elif goalkeeper_stats is not None:
         # Options de pagination
         st.markdown("#### Options d'affichage")
         col1, col2 = st.columns([1, 3])
@@ -86,7 +109,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         
         # Appliquer le filtre d'équipe
         if selected_team_gk != 'Toutes les équipes':
-            filtered_gk_stats = goalkeeper_stats[goalkeeper_stats['Équipe'] == selected_team_gk].copy()
+            filtered_gk_stats = goalkeeper_stats[goalkeeper_stats['Équipe'] == selected_team_gk]
             filtered_gk_stats['Rang'] = range(1, len(filtered_gk_stats) + 1)
         else:
             filtered_gk_stats = goalkeeper_stats
@@ -116,7 +139,10 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         st.dataframe(
             display_gk_stats,
             use_container_width=True,
-            hide_index=True
+            hide_index=True,
+            column_config={
+                "% arrêts": st.column_config.NumberColumn("% arrêts", format="%.1f%%", help="Arrêts / tirs subis (arrêts + buts encaissés)"),
+            }
         )
         
         # Statistiques rapides
@@ -129,14 +155,14 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
             st.metric(
                 "Meilleur gardien",
                 top_goalkeeper['Gardien'],
-                f"{int(top_goalkeeper['Arrêts'])} arrêts"
+                f"{top_goalkeeper['% arrêts']:.1f}% d'arrêts" if sort_by == "% arrêts" else f"{int(top_goalkeeper['Arrêts'])} arrêts"
             )
         
         with col2:
-            avg_saves = filtered_gk_stats['Arrêts'].mean()
+            total_shots_faced = filtered_gk_stats['Tirs subis'].sum()
             st.metric(
-                "Moyenne d'arrêts",
-                f"{avg_saves:.1f}"
+                "% d'arrêts global",
+                f"{100 * filtered_gk_stats['Arrêts'].sum() / total_shots_faced:.1f}%" if total_shots_faced > 0 else "-"
             )
         
         with col3:
@@ -149,7 +175,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         # Option de téléchargement
         st.download_button(
             label="📥 Télécharger les statistiques des gardiens CSV",
-            data=filtered_gk_stats.to_csv(index=False).encode('utf-8'),
+            data=to_csv_bytes(filtered_gk_stats),
             file_name='stats_gardiens.csv',
             mime='text/csv',
         )
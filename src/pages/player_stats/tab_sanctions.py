@@ -3,84 +3,51 @@ Tab: Classement des sanctions
 """
 import streamlit as st
 import pandas as pd
+from src.pages.utils import to_csv_bytes
 
 
-def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
-    """Render the sanctions ranking tab"""
-    st.markdown("### ⚠️ Classement des sanctions")
+@st.cache_data(show_spinner=False)
+def build_sanctions_table(season_stats: pd.DataFrame) -> pd.DataFrame:
+    """Build the player sanctions ranking table (None when there is no sanction)"""
+    # Filtrer les joueurs qui ont au moins une sanction
+    sanctions_stats = season_stats[season_stats['total_sanctions'] > 0]
+    if sanctions_stats.empty:
+        return None
     
-    # Filtrer les joueurs (non officiels)
-    all_players = player_stats_df[player_stats_df['is_official'] == False].copy()
+    # Moyenne de sanctions par match
+    sanctions_stats['Moy sanctions/match'] = sanctions_stats['sanctions_per_match'].round(2)
     
-    # Filtrer les joueurs qui ont au moins une sanction
-    players_with_sanctions = all_players[
-        (all_players['yellow_cards'] > 0) | 
-        (all_players['two_minutes'] > 0) | 
-        (all_players['red_cards'] > 0) | 
-        (all_players['blue_cards'] > 0)
+    # Renommer les colonnes
+    sanctions_stats = sanctions_stats.rename(columns={
+        'player_name': 'Joueur',
+        'team_name': 'Équipe',
+        'yellow_cards': 'Jaunes',
+        'two_minutes': '2 min',
+        'red_cards': 'Rouges',
+        'blue_cards': 'Bleues',
+        'total_sanctions': 'Total',
+        'matches_played': 'Matchs'
+    })
+    
+    # Trier par total de sanctions (ordre décroissant - plus de sanctions = moins discipliné)
+    sanctions_stats = sanctions_stats.sort_values('Total', ascending=False).reset_index(drop=True)
+    sanctions_stats.insert(0, 'Rang', range(1, len(sanctions_stats) + 1))
+    
+    # Réorganiser les colonnes
+    sanctions_stats = sanctions_stats[
+        ['Rang', 'Joueur', 'Équipe', 'Total', 'Moy sanctions/match', 'Jaunes', '2 min', 'Rouges', 'Bleues', 'Matchs']
     ]
     
-    if not players_with_sanctions.empty:
-        # D'abord, calculer le nombre de matchs joués par joueur
-        matches_per_player = all_players.merge(
-            players_with_sanctions[['player_name', 'team_name']].drop_duplicates(),
-            on=['player_name', 'team_name'],
-            how='inner'
-        ).groupby(['player_name', 'team_name']).agg({
-            'match_id': 'nunique'
-        }).reset_index()
-        matches_per_player = matches_per_player.rename(columns={'match_id': 'matches_played'})
-        
-        # Grouper par joueur et équipe, sommer toutes les sanctions
-        sanctions_stats = players_with_sanctions.groupby(['player_name', 'team_name']).agg({
-            'yellow_cards': 'sum',
-            'two_minutes': 'sum',
-            'red_cards': 'sum',
-            'blue_cards': 'sum'
-        }).reset_index()
-        
-        # Calculer le total des sanctions
-        sanctions_stats['total_sanctions'] = (
-            sanctions_stats['yellow_cards'] + 
-            sanctions_stats['two_minutes'] + 
-            sanctions_stats['red_cards'] + 
-            sanctions_stats['blue_cards']
-        )
-        
-        # Fusionner avec le nombre de matchs
-        sanctions_stats = sanctions_stats.merge(
-            matches_per_player,
-            on=['player_name', 'team_name'],
-            how='left'
-        )
-        
-        # Calculer la moyenne de sanctions par match
-        sanctions_stats['Moy sanctions/match'] = sanctions_stats.apply(
-            lambda row: round(row['total_sanctions'] / row['matches_played'], 2) if row['matches_played'] > 0 else 0,
-            axis=1
-        )
-        
-        # Renommer les colonnes
-        sanctions_stats = sanctions_stats.rename(columns={
-            'player_name': 'Joueur',
-            'team_name': 'Équipe',
-            'yellow_cards': 'Jaunes',
-            'two_minutes': '2 min',
-            'red_cards': 'Rouges',
-            'blue_cards': 'Bleues',
-            'total_sanctions': 'Total',
-            'matches_played': 'Matchs'
-        })
-        
-        # Trier par total de sanctions (ordre décroissant - plus de sanctions = moins discipliné)
-        sanctions_stats = sanctions_stats.sort_values('Total', ascending=False).reset_index(drop=True)
-        sanctions_stats.insert(0, 'Rang', range(1, len(sanctions_stats) + 1))
-        
-        # Réorganiser les colonnes
-        sanctions_stats = sanctions_stats[
-            ['Rang', 'Joueur', 'Équipe', 'Total', 'Moy sanctions/match', 'Jaunes', '2 min', 'Rouges', 'Bleues', 'Matchs']
-        ]
-        
+    return sanctions_stats
+
+
+def render(season_stats: pd.DataFrame):
+    """Render the sanctions ranking tab"""
+    st.markdown("### ⚠️ Classement des sanctions")
+    
+    sanctions_stats = build_sanctions_table(season_stats)
+    
+    if sanctions_stats is not None:
         # Options de pagination
         st.markdown("#### Options d'affichage")
         col1, col2 = st.columns([1, 3])
@@ -104,7 +71,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         
         # Appliquer le filtre d'équipe
         if selected_team_sanctions != 'Toutes les équipes':
-            filtered_sanctions = sanctions_stats[sanctions_stats['Équipe'] == selected_team_sanctions].copy()
+            filtered_sanctions = sanctions_stats[sanctions_stats['Équipe'] == selected_team_sanctions]
             filtered_sanctions['Rang'] = range(1, len(filtered_sanctions) + 1)
         else:
             filtered_sanctions = sanctions_stats
@@ -252,7 +219,7 @@ def render(player_stats_df: pd.DataFrame, matches_df: pd.DataFrame, teams_df: pd
         # Bouton de téléchargement
         st.download_button(
             label="📥 Télécharger les statistiques CSV",
-            data=filtered_sanctions.to_csv(index=False).encode('utf-8'),
+            data=to_csv_bytes(filtered_sanctions),
             file_name='classement_sanctions.csv',
             mime='text/csv',
         )
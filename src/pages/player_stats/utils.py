@@ -0,0 +1,66 @@
+"""
+Utility functions for player statistics
+"""
+import streamlit as st
+import pandas as pd
+from src.database import get_player_stats
+from src.metrics import safe_rate
+
+
+# Colonnes de totaux de la vue player_season_stats
+SEASON_TOTAL_COLUMNS = [
+    'matches_played', 'goals', 'shots', 'goals_7m', 'saves',
+    'yellow_cards', 'two_minutes', 'red_cards', 'blue_cards'
+]
+
+
+@st.cache_data(show_spinner=False)
+def calculate_player_season_stats(season_totals_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build one line per player and team from the player_season_stats view.
+
+    The view holds one row per league; the rows of a player in several leagues
+    are summed (their matches are distinct, so matches_played adds up). The
+    player ranking tabs, the team tabs and the Club Report widgets slice this
+    table. Rates are left unrounded, callers round them for display.
+    """
+    if season_totals_df.empty:
+        season_totals_df = pd.DataFrame(columns=['player_id', 'player_name', 'team_name'] + SEASON_TOTAL_COLUMNS)
+
+    # Un joueur = un player_id (homonymes séparés) ; lignes sans player_id regroupées par nom
+    season_stats = season_totals_df.groupby(
+        ['player_id', 'player_name', 'team_name'], observed=True, dropna=False
+    )[SEASON_TOTAL_COLUMNS].sum().reset_index()
+
+    # Total des sanctions
+    season_stats['total_sanctions'] = (
+        season_stats['yellow_cards'] +
+        season_stats['two_minutes'] +
+        season_stats['red_cards'] +
+        season_stats['blue_cards']
+    )
+
+    # Taux par match et efficacité
+    season_stats['efficiency'] = safe_rate(season_stats['goals'], season_stats['shots'], scale=100, decimals=None)
+    season_stats['goals_per_match'] = safe_rate(season_stats['goals'], season_stats['matches_played'], decimals=None)
+    season_stats['goals_7m_per_match'] = safe_rate(season_stats['goals_7m'], season_stats['matches_played'], decimals=None)
+    season_stats['saves_per_match'] = safe_rate(season_stats['saves'], season_stats['matches_played'], decimals=None)
+    season_stats['sanctions_per_match'] = safe_rate(season_stats['total_sanctions'], season_stats['matches_played'], decimals=None)
+
+    return season_stats
+
+
+@st.cache_data(show_spinner=False)
+def load_player_match_stats(league_id: int, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    player_stats rows of the league (one per player and match, officials excluded)
+    for the best performances tabs.
+
+    The table is downloaded on a cache miss only. matches_df is part of the
+    cache key: an import or re-import changes it (new match, new fingerprint)
+    and triggers a reload.
+    """
+    player_stats_df = get_player_stats(league_id)
+    if player_stats_df.empty:
+        return player_stats_df
+    return player_stats_df[player_stats_df['is_official'] == False]
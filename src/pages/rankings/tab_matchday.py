@@ -0,0 +1,88 @@
+"""
+Tab: Classement à la journée N
+"""
+import streamlit as st
+import pandas as pd
+import altair as alt
+from src.analytics.form import team_match_results
+from src.analytics.standings import standings_history
+from src.pages.utils import to_csv_bytes
+
+
+@st.cache_data(show_spinner=False)
+def build_standings_history(matches_df: pd.DataFrame, teams_df: pd.DataFrame) -> pd.DataFrame:
+    """Standings after every matchday, in one pass, with the team names (None without dated results)"""
+    history = standings_history(team_match_results(matches_df))
+    if history.empty:
+        return None
+
+    history['team_name'] = history['team_id'].map(teams_df.set_index('id')['name']).fillna('N/A')
+    return history
+
+
+def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+    """Render the matchday standings tab"""
+    st.markdown("### Classement à la journée")
+    st.caption("Une journée correspond à une date de match ; les matchs sans date ne sont pas comptés.")
+
+    history = build_standings_history(matches_df, teams_df)
+
+    if history is None:
+        st.info("Aucun match terminé et daté trouvé.")
+        return
+
+    matchdays = history.drop_duplicates('matchday').set_index('matchday')['match_date']
+    matchday = st.select_slider(
+        "Journée",
+        options=matchdays.index.tolist(),
+        value=matchdays.index[-1],
+        format_func=lambda day: f"J{day} ({matchdays[day].strftime('%d/%m/%Y')})",
+        key="standings_matchday"
+    )
+
+    snapshot = history[history['matchday'] == matchday]
+    standings_df = pd.DataFrame({
+        'Rang': snapshot['rank'],
+        'Équipe': snapshot['team_name'],
+        'Pts': snapshot['points'],
+        'J': snapshot['played'],
+        'V': snapshot['wins'],
+        'N': snapshot['draws'],
+        'D': snapshot['losses'],
+        'BP': snapshot['goals_for'],
+        'BC': snapshot['goals_against'],
+        'Diff': snapshot['goal_diff'],
+    })
+
+    st.dataframe(
+        standings_df,
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.download_button(
+        label="📥 Télécharger le classement de la journée CSV",
+        data=to_csv_bytes(standings_df),
+        file_name=f'classement_journee_{matchday}.csv',
+        mime='text/csv',
+    )
+
+    # Évolution des positions jusqu'à la journée choisie
+    st.markdown("#### 📈 Évolution des positions")
+    chart_data = history[history['matchday'] <= matchday]
+    chart_data = pd.DataFrame({
+        'Journée': chart_data['matchday'],
+        'Date': chart_data['match_date'].dt.strftime('%d/%m/%Y'),
+        'Équipe': chart_data['team_name'],
+        'Rang': chart_data['rank'],
+        'Pts': chart_data['points'],
+    })
+
+    chart = alt.Chart(chart_data).mark_line(point=True).encode(
+        x=alt.X('Journée:Q', axis=alt.Axis(tickMinStep=1)),
+        y=alt.Y('Rang:Q', scale=alt.Scale(reverse=True, domainMin=1), axis=alt.Axis(tickMinStep=1)),
+        color=alt.Color('Équipe:N', sort=standings_df['Équipe'].tolist()),
+        tooltip=['Équipe:N', 'Journée:Q', 'Date:N', 'Rang:Q', 'Pts:Q']
+    )
+
+    st.altair_chart(chart, use_container_width=True)
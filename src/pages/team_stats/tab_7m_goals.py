@@ -3,55 +3,48 @@ Tab: Buts 7m (7-meter goals)
 """
 import streamlit as st
 import pandas as pd
-from .utils import calculate_team_matches
+from src.metrics import per_match
+from src.pages.utils import to_csv_bytes
+from .utils import aggregate_by_team
 
 
-def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd.DataFrame, stats_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_7m_goals_table(season_stats: pd.DataFrame, stats_df: pd.DataFrame) -> pd.DataFrame:
+    """Build the team 7m goals ranking (None when there is no 7m goal)"""
+    # Sommer les buts 7m par équipe (équipes avec au moins 1 but 7m)
+    goals_7m_stats = aggregate_by_team(season_stats, stats_df, ['goals_7m'])
+    goals_7m_stats = goals_7m_stats[goals_7m_stats['goals_7m'] > 0]
+    if goals_7m_stats.empty:
+        return None
+    
+    # Calculer la moyenne de buts 7m par match
+    goals_7m_stats['Moy 7m'] = per_match(goals_7m_stats['goals_7m'], goals_7m_stats['matches'])
+    
+    # Renommer les colonnes
+    goals_7m_stats = goals_7m_stats.rename(columns={
+        'team_name': 'Équipe',
+        'goals_7m': 'Buts 7m',
+        'matches': 'Matchs'
+    })
+    
+    # Trier par buts 7m (ordre décroissant)
+    goals_7m_stats = goals_7m_stats.sort_values('Buts 7m', ascending=False).reset_index(drop=True)
+    goals_7m_stats.insert(0, 'Rang', range(1, len(goals_7m_stats) + 1))
+    
+    # Réorganiser les colonnes
+    goals_7m_stats = goals_7m_stats[['Rang', 'Équipe', 'Buts 7m', 'Moy 7m', 'Matchs']]
+    
+    return goals_7m_stats
+
+
+def render(stats_df: pd.DataFrame, season_stats: pd.DataFrame):
     """Render the 7-meter goals tab"""
     st.markdown("### 🎯 Classement des buts 7m")
     
-    if not player_stats_df.empty:
-        # Filtrer les joueurs avec des buts 7m
-        players_with_7m = player_stats_df[
-            (player_stats_df['is_official'] == False) & 
-            (player_stats_df['goals_7m'] > 0)
-        ].copy()
+    if not season_stats.empty:
+        goals_7m_stats = build_7m_goals_table(season_stats, stats_df)
         
-        if not players_with_7m.empty:
-            # Grouper par équipe et sommer les buts 7m
-            goals_7m_stats = players_with_7m.groupby('team_name').agg({
-                'goals_7m': 'sum'
-            }).reset_index()
-            
-            # Calculer le nombre de matchs par équipe
-            matches_per_team = calculate_team_matches(matches_df, teams_df)
-            
-            # Fusionner avec les stats de buts 7m
-            goals_7m_stats = goals_7m_stats.merge(matches_per_team, on='team_name', how='left')
-            
-            # Remplir les matchs manquants avec 0
-            goals_7m_stats['matches'] = goals_7m_stats['matches'].fillna(0).astype(int)
-            
-            # Calculer la moyenne de buts 7m par match
-            goals_7m_stats['Moy 7m'] = goals_7m_stats.apply(
-                lambda row: round(row['goals_7m'] / row['matches'], 2) if row['matches'] > 0 else 0,
-                axis=1
-            )
-            
-            # Renommer les colonnes
-            goals_7m_stats = goals_7m_stats.rename(columns={
-                'team_name': 'Équipe',
-                'goals_7m': 'Buts 7m',
-                'matches': 'Matchs'
-            })
-            
-            # Trier par buts 7m (ordre décroissant)
-            goals_7m_stats = goals_7m_stats.sort_values('Buts 7m', ascending=False).reset_index(drop=True)
-            goals_7m_stats.insert(0, 'Rang', range(1, len(goals_7m_stats) + 1))
-            
-            # Réorganiser les colonnes
-            goals_7m_stats = goals_7m_stats[['Rang', 'Équipe', 'Buts 7m', 'Moy 7m', 'Matchs']]
-            
+        if goals_7m_stats is not None:
             st.dataframe(
                 goals_7m_stats,
                 use_container_width=True,
@@ -82,7 +75,7 @@ def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd
             
             st.download_button(
                 label="📥 Télécharger les statistiques CSV",
-                data=goals_7m_stats.to_csv(index=False).encode('utf-8'),
+                data=to_csv_bytes(goals_7m_stats),
                 file_name='stats_buts_7m.csv',
                 mime='text/csv',
             )
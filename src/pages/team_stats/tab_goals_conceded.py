@@ -3,15 +3,16 @@ Tab: Buts encaissés
 """
 import streamlit as st
 import pandas as pd
+from src.pages.utils import to_csv_bytes
 
 
-def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd.DataFrame, stats_df: pd.DataFrame):
+def render(stats_df: pd.DataFrame, season_stats: pd.DataFrame):
     """Render the goals conceded tab"""
     st.markdown("### 🛡️ Classement des buts encaissés")
     
     if stats_df is not None:
         # Trier par buts encaissés (ordre croissant = meilleure défense)
-        goals_against_df = stats_df[['Équipe', 'J', 'Buts encaissés', 'Moy encaissés', 'Encaissés dom.', 'Encaissés ext.']].copy()
+        goals_against_df = stats_df[['Équipe', 'J', 'Buts encaissés', 'Moy encaissés', 'Encaissés dom.', 'Encaissés ext.']]
         goals_against_df = goals_against_df.sort_values('Buts encaissés', ascending=True).reset_index(drop=True)
         goals_against_df.insert(0, 'Rang', range(1, len(goals_against_df) + 1))
         
@@ -45,7 +46,7 @@ def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd
         
         st.download_button(
             label="📥 Télécharger les statistiques CSV",
-            data=goals_against_df.to_csv(index=False).encode('utf-8'),
+            data=to_csv_bytes(goals_against_df),
             file_name='stats_buts_encaisses.csv',
             mime='text/csv',
         )
@@ -3,15 +3,16 @@ Tab: Buts marqués
 """
 import streamlit as st
 import pandas as pd
+from src.pages.utils import to_csv_bytes
 
 
-def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd.DataFrame, stats_df: pd.DataFrame):
+def render(stats_df: pd.DataFrame, season_stats: pd.DataFrame):
     """Render the goals scored tab"""
     st.markdown("### 🏆 Classement des buts marqués")
     
     if stats_df is not None:
         # Trier par buts marqués
-        goals_for_df = stats_df[['Équipe', 'J', 'Buts marqués', 'Moy marqués', 'Buts dom.', 'Buts ext.']].copy()
+        goals_for_df = stats_df[['Équipe', 'J', 'Buts marqués', 'Moy marqués', 'Buts dom.', 'Buts ext.']]
         goals_for_df = goals_for_df.sort_values('Buts marqués', ascending=False).reset_index(drop=True)
         goals_for_df.insert(0, 'Rang', range(1, len(goals_for_df) + 1))
         
@@ -45,7 +46,7 @@ def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd
         
         st.download_button(
             label="📥 Télécharger les statistiques CSV",
-            data=goals_for_df.to_csv(index=False).encode('utf-8'),
+            data=to_csv_bytes(goals_for_df),
             file_name='stats_buts_marques.csv',
             mime='text/csv',
         )
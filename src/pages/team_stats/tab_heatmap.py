@@ -0,0 +1,97 @@
+"""
+Tab: Carte de chaleur (actions par tranche de 5 minutes)
+"""
+import streamlit as st
+import pandas as pd
+import altair as alt
+from src.analytics.heatmap import HEATMAP_METRICS, bucket_label, heatmap_counts, heatmap_long
+from src.database import get_players
+from src.pages.utils import to_csv_bytes
+
+
+@st.cache_data(show_spinner=False)
+def build_heatmap(buckets_df: pd.DataFrame, teams_df: pd.DataFrame, metric: str, team_id: int = None,
+                  players_df: pd.DataFrame = None):
+    """
+    Build the heatmap of a metric, per team (team_id None) or per player of a team.
+    Players are grouped by player_id and named after their players row
+    (players_df, the team's players); counts without player_id keep the
+    match-sheet name.
+
+    Returns (table, long) with the wide table shown to the user and the long
+    format used by the chart, or (None, None) when nothing was recorded.
+    """
+    if buckets_df.empty:
+        return None, None
+
+    if team_id is None:
+        counts = heatmap_counts(buckets_df, HEATMAP_METRICS[metric], 'team_id')
+        row_labels = teams_df.set_index('id')['name']
+    else:
+        team_buckets = buckets_df[buckets_df['team_id'] == team_id]
+        player_names = players_df.set_index('id')['name'] if not players_df.empty else pd.Series(dtype=object)
+        player = team_buckets['player_id'].map(player_names).astype(object)
+        team_buckets = team_buckets.assign(player=player.fillna(team_buckets['player_name'].astype(object)))
+        counts = heatmap_counts(team_buckets, HEATMAP_METRICS[metric], 'player')
+        row_labels = None
+
+    if counts.empty:
+        return None, None
+
+    # Lignes triées par total décroissant
+    counts = counts.loc[counts.sum(axis=1).sort_values(ascending=False, kind='stable').index]
+    long = heatmap_long(counts, row_labels)
+
+    table = counts.rename(columns=bucket_label).rename_axis(columns=None)
+    table.insert(0, 'Total', counts.sum(axis=1))
+    table.index = table.index.map(row_labels) if row_labels is not None else table.index.astype(str)
+    table = table.rename_axis('Équipe' if team_id is None else 'Joueur').reset_index()
+
+    return table, long
+
+
+def render(buckets_df: pd.DataFrame, teams_df: pd.DataFrame):
+    """Render the heatmap tab"""
+    st.markdown("### 🔥 Carte de chaleur par tranche de 5 minutes")
+
+    if buckets_df.empty:
+        st.info("Aucune action enregistrée pour cette compétition.")
+        return
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        metric = st.radio("Indicateur", options=list(HEATMAP_METRICS), horizontal=True, key="heatmap_metric")
+    with col2:
+        team_names = teams_df[teams_df['id'].isin(buckets_df['team_id'].unique())].set_index('id')['name'].sort_values()
+        selected_team = st.selectbox(
+            "Équipe",
+            options=[None] + team_names.index.tolist(),
+            format_func=lambda team_id: "Toutes les équipes" if team_id is None else team_names[team_id],
+            key="heatmap_team"
+        )
+
+    players_df = get_players(selected_team) if selected_team is not None else None
+    table, long = build_heatmap(buckets_df, teams_df, metric, selected_team, players_df)
+
+    if table is None:
+        st.info("Aucune action enregistrée pour cet indicateur.")
+        return
+
+    row_title = 'Équipe' if selected_team is None else 'Joueur'
+    chart = alt.Chart(long).mark_rect().encode(
+        x=alt.X('interval:N', title='Minutes', sort=alt.SortField('bucket')),
+        y=alt.Y('row:N', title=row_title, sort=table[row_title].tolist()),
+        color=alt.Color('count:Q', title=metric, scale=alt.Scale(scheme='orangered')),
+        tooltip=[alt.Tooltip('row:N', title=row_title), alt.Tooltip('interval:N', title='Minutes'), alt.Tooltip('count:Q', title=metric)]
+    ).properties(height=max(200, 22 * len(table)))
+
+    st.altair_chart(chart, use_container_width=True)
+
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        label="📥 Télécharger les statistiques CSV",
+        data=to_csv_bytes(table),
+        file_name='carte_de_chaleur.csv',
+        mime='text/csv',
+    )
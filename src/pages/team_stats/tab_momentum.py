@@ -0,0 +1,96 @@
+"""
+Tab: Dynamique de match
+"""
+import streamlit as st
+import pandas as pd
+from src.analytics.score_progression import match_momentum, team_momentum
+from src.database import get_actions
+from src.metrics import per_match, percentage
+from src.pages.utils import to_csv_bytes
+
+# Colonnes du déroulé nécessaires au calcul (chargement allégé)
+MOMENTUM_ACTION_COLUMNS = "id,match_id,time_seconds,score_home,score_away"
+
+
+@st.cache_data(show_spinner=False)
+def build_season_momentum(league_id: int, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score progression summary of every match of the season, in one pass.
+
+    The actions of the league are downloaded on a cache miss only and just the
+    per-match summary is kept. matches_df is part of the cache key: an import
+    or re-import changes it (new match, new fingerprint) and triggers a reload.
+    """
+    return match_momentum(get_actions(league_id, MOMENTUM_ACTION_COLUMNS))
+
+
+@st.cache_data(show_spinner=False)
+def build_momentum_table(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame) -> pd.DataFrame:
+    """Build the per-team momentum table (None when no match has a scored timeline)"""
+    momentum = build_season_momentum(league_id, matches_df)
+    if momentum.empty:
+        return None
+
+    team_matches = team_momentum(momentum, matches_df)
+    team_stats = team_matches.groupby('team_id').agg(
+        matches=('match_id', 'size'),
+        lead_changes=('lead_changes', 'sum'),
+        seconds_leading=('seconds_leading', 'sum'),
+        seconds_trailing=('seconds_trailing', 'sum'),
+        seconds_tied=('seconds_tied', 'sum'),
+        largest_lead=('largest_lead', 'max'),
+        largest_deficit=('largest_deficit', 'max'),
+        longest_run=('longest_run', 'max'),
+        longest_run_conceded=('longest_run_conceded', 'max'),
+    ).reset_index()
+
+    seconds_played = team_stats['seconds_leading'] + team_stats['seconds_trailing'] + team_stats['seconds_tied']
+
+    momentum_table = pd.DataFrame({
+        'Équipe': team_stats['team_id'].map(teams_df.set_index('id')['name']),
+        'Matchs': team_stats['matches'],
+        '% en tête': percentage(team_stats['seconds_leading'], seconds_played, decimals=1),
+        '% mené': percentage(team_stats['seconds_trailing'], seconds_played, decimals=1),
+        '% égalité': percentage(team_stats['seconds_tied'], seconds_played, decimals=1),
+        'Chgts leader/match': per_match(team_stats['lead_changes'], team_stats['matches']),
+        'Plus gros écart': team_stats['largest_lead'],
+        'Plus gros retard': team_stats['largest_deficit'],
+        'Meilleure série': team_stats['longest_run'],
+        'Pire série subie': team_stats['longest_run_conceded'],
+    })
+
+    # Trier par temps passé en tête (ordre décroissant)
+    momentum_table = momentum_table.sort_values('% en tête', ascending=False).reset_index(drop=True)
+    momentum_table.insert(0, 'Rang', range(1, len(momentum_table) + 1))
+
+    return momentum_table
+
+
+def render(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+    """Render the momentum tab"""
+    st.markdown("### 📈 Dynamique de match")
+    st.caption("Temps passé en tête, menée ou à égalité et séries de buts, calculés sur le déroulé de chaque match.")
+
+    momentum_table = build_momentum_table(league_id, matches_df, teams_df)
+
+    if momentum_table is None:
+        st.info("Aucun déroulé de match avec score disponible.")
+        return
+
+    st.dataframe(
+        momentum_table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "% en tête": st.column_config.ProgressColumn("% en tête", format="%.1f%%", min_value=0, max_value=100),
+            "% mené": st.column_config.NumberColumn("% mené", format="%.1f%%"),
+            "% égalité": st.column_config.NumberColumn("% égalité", format="%.1f%%"),
+        }
+    )
+
+    st.download_button(
+        label="📥 Télécharger les statistiques CSV",
+        data=to_csv_bytes(momentum_table),
+        file_name='stats_dynamique.csv',
+        mime='text/csv',
+    )
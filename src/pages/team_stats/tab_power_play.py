@@ -0,0 +1,85 @@
+"""
+Tab: Supériorité numérique
+"""
+import streamlit as st
+import pandas as pd
+from src.analytics.power_play import power_play_summary, team_power_play
+from src.database import get_actions
+from src.metrics import per_match
+from src.pages.utils import to_csv_bytes
+
+# Colonnes du déroulé nécessaires au calcul (chargement allégé)
+POWER_PLAY_ACTION_COLUMNS = "id,match_id,time_seconds,action_type,team"
+
+
+@st.cache_data(show_spinner=False)
+def build_season_power_play(league_id: int, matches_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Power-play summary of every match of the season, in one pass.
+
+    Like the momentum tab, the actions are downloaded on a cache miss only and
+    matches_df (changed by every import or re-import) is part of the cache key.
+    """
+    return power_play_summary(get_actions(league_id, POWER_PLAY_ACTION_COLUMNS))
+
+
+@st.cache_data(show_spinner=False)
+def build_power_play_table(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame) -> pd.DataFrame:
+    """Build the per-team power-play table (None when no match has a timed timeline)"""
+    summary = build_season_power_play(league_id, matches_df)
+    if summary.empty:
+        return None
+
+    team_stats = team_power_play(summary, matches_df).groupby('team_id').agg(
+        matches=('match_id', 'size'),
+        **{column: (column, 'sum') for column in summary.columns}
+    ).reset_index()
+
+    power_play_table = pd.DataFrame({
+        'Équipe': team_stats['team_id'].map(teams_df.set_index('id')['name']),
+        'Matchs': team_stats['matches'],
+        'Exclusions/match': per_match(team_stats['suspensions'], team_stats['matches']),
+        'Min. en supériorité': (team_stats['seconds_superiority'] / 60).round(1),
+        'Buts en supériorité': team_stats['goals_superiority'],
+        'Encaissés en supériorité': team_stats['conceded_superiority'],
+        'Bilan supériorité': team_stats['goals_superiority'] - team_stats['conceded_superiority'],
+        'Min. en infériorité': (team_stats['seconds_inferiority'] / 60).round(1),
+        'Buts en infériorité': team_stats['goals_inferiority'],
+        'Encaissés en infériorité': team_stats['conceded_inferiority'],
+        'Bilan infériorité': team_stats['goals_inferiority'] - team_stats['conceded_inferiority'],
+    })
+
+    # Trier par bilan en supériorité (ordre décroissant)
+    power_play_table = power_play_table.sort_values('Bilan supériorité', ascending=False).reset_index(drop=True)
+    power_play_table.insert(0, 'Rang', range(1, len(power_play_table) + 1))
+
+    return power_play_table
+
+
+def render(league_id: int, matches_df: pd.DataFrame, teams_df: pd.DataFrame):
+    """Render the power-play tab"""
+    st.markdown("### ⚖️ Supériorité numérique")
+    st.caption("Buts marqués et encaissés pendant les exclusions de 2 minutes (exclusions simultanées cumulées).")
+
+    power_play_table = build_power_play_table(league_id, matches_df, teams_df)
+
+    if power_play_table is None:
+        st.info("Aucun déroulé de match chronométré disponible.")
+        return
+
+    st.dataframe(
+        power_play_table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Min. en supériorité": st.column_config.NumberColumn("Min. en supériorité", format="%.1f"),
+            "Min. en infériorité": st.column_config.NumberColumn("Min. en infériorité", format="%.1f"),
+        }
+    )
+
+    st.download_button(
+        label="📥 Télécharger les statistiques CSV",
+        data=to_csv_bytes(power_play_table),
+        file_name='stats_superiorite_numerique.csv',
+        mime='text/csv',
+    )
@@ -3,59 +3,60 @@ Tab: Arrêts (Saves)
 """
 import streamlit as st
 import pandas as pd
-from .utils import calculate_team_matches
+from src.metrics import per_match, percentage
+from src.pages.utils import to_csv_bytes
+from .utils import aggregate_by_team
 
 
-def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd.DataFrame, stats_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_saves_table(season_stats: pd.DataFrame, stats_df: pd.DataFrame) -> pd.DataFrame:
+    """Build the team saves ranking (None when there is no goalkeeper)"""
+    # Sommer les arrêts par équipe (équipes avec au moins 1 arrêt)
+    saves_stats = aggregate_by_team(season_stats, stats_df, ['saves'])
+    saves_stats = saves_stats[saves_stats['saves'] > 0]
+    if saves_stats.empty:
+        return None
+    
+    # Calculer la moyenne d'arrêts par match
+    saves_stats['Moy arrêts'] = per_match(saves_stats['saves'], saves_stats['matches'])
+    
+    # Pourcentage d'arrêts sur les tirs subis (arrêts + buts encaissés)
+    goals_against_per_team = pd.Series(dtype=int) if stats_df is None else stats_df.set_index('Équipe')['Buts encaissés']
+    goals_against = saves_stats['team_name'].astype(str).map(goals_against_per_team).fillna(0)
+    saves_stats['% arrêts'] = percentage(saves_stats['saves'], saves_stats['saves'] + goals_against, decimals=1)
+    
+    # Renommer les colonnes
+    saves_stats = saves_stats.rename(columns={
+        'team_name': 'Équipe',
+        'saves': 'Arrêts',
+        'matches': 'Matchs'
+    })
+    
+    # Trier par arrêts (ordre décroissant)
+    saves_stats = saves_stats.sort_values('Arrêts', ascending=False).reset_index(drop=True)
+    saves_stats.insert(0, 'Rang', range(1, len(saves_stats) + 1))
+    
+    # Réorganiser les colonnes
+    saves_stats = saves_stats[['Rang', 'Équipe', 'Arrêts', 'Moy arrêts', '% arrêts', 'Matchs']]
+    
+    return saves_stats
+
+
+def render(stats_df: pd.DataFrame, season_stats: pd.DataFrame):
     """Render the saves tab"""
     st.markdown("### 🧤 Classement des arrêts")
     
-    if not player_stats_df.empty:
-        # Filtrer les gardiens (joueurs avec arrêts > 0)
-        goalkeepers = player_stats_df[
-            (player_stats_df['is_official'] == False) & 
-            (player_stats_df['saves'] > 0)
-        ].copy()
+    if not season_stats.empty:
+        saves_stats = build_saves_table(season_stats, stats_df)
         
-        if not goalkeepers.empty:
-            # Grouper par équipe et sommer les arrêts
-            saves_stats = goalkeepers.groupby('team_name').agg({
-                'saves': 'sum'
-            }).reset_index()
-            
-            # Calculer le nombre de matchs par équipe
-            matches_per_team = calculate_team_matches(matches_df, teams_df)
-            
-            # Fusionner avec les stats d'arrêts
-            saves_stats = saves_stats.merge(matches_per_team, on='team_name', how='left')
-            
-            # Remplir les matchs manquants avec 0
-            saves_stats['matches'] = saves_stats['matches'].fillna(0).astype(int)
-            
-            # Calculer la moyenne d'arrêts par match
-            saves_stats['Moy arrêts'] = saves_stats.apply(
-                lambda row: round(row['saves'] / row['matches'], 2) if row['matches'] > 0 else 0,
-                axis=1
-            )
-            
-            # Renommer les colonnes
-            saves_stats = saves_stats.rename(columns={
-                'team_name': 'Équipe',
-                'saves': 'Arrêts',
-                'matches': 'Matchs'
-            })
-            
-            # Trier par arrêts (ordre décroissant)
-            saves_stats = saves_stats.sort_values('Arrêts', ascending=False).reset_index(drop=True)
-            saves_stats.insert(0, 'Rang', range(1, len(saves_stats) + 1))
-            
-            # Réorganiser les colonnes
-            saves_stats = saves_stats[['Rang', 'Équipe', 'Arrêts', 'Moy arrêts', 'Matchs']]
-            
+        if saves_stats is not None:
             st.dataframe(
                 saves_stats,
                 use_container_width=True,
-                hide_index=True
+                hide_index=True,
+                column_config={
+                    "% arrêts": st.column_config.NumberColumn("% arrêts", format="%.1f%%", help="Arrêts / tirs subis (arrêts + buts encaissés)"),
+                }
             )
             
             # Statistiques rapides
@@ -82,7 +83,7 @@ def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd
             
             st.download_button(
                 label="📥 Télécharger les statistiques CSV",
-                data=saves_stats.to_csv(index=False).encode('utf-8'),
+                data=to_csv_bytes(saves_stats),
                 file_name='stats_arrets.csv',
                 mime='text/csv',
             )
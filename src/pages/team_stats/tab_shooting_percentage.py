@@ -3,52 +3,49 @@ Tab: Pourcentage de réussite
 """
 import streamlit as st
 import pandas as pd
+from src.metrics import percentage
+from src.pages.utils import to_csv_bytes
 
 
-def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd.DataFrame, stats_df: pd.DataFrame):
+@st.cache_data(show_spinner=False)
+def build_shooting_table(season_stats: pd.DataFrame) -> pd.DataFrame:
+    """Build the team shooting percentage ranking (None when there is no player)"""
+    # Grouper par équipe et sommer les buts et tirs de la saison
+    shooting_stats = season_stats.groupby('team_name', observed=True)[['goals', 'shots']].sum().reset_index()
+    
+    # Filtrer les équipes avec au moins 1 tir
+    shooting_stats = shooting_stats[shooting_stats['shots'] > 0]
+    if shooting_stats.empty:
+        return None
+    
+    # Calculer le pourcentage de réussite
+    shooting_stats['% Réussite'] = percentage(shooting_stats['goals'], shooting_stats['shots'])
+    
+    # Renommer les colonnes
+    shooting_stats = shooting_stats.rename(columns={
+        'team_name': 'Équipe',
+        'goals': 'Buts',
+        'shots': 'Tirs'
+    })
+    
+    # Trier par pourcentage de réussite
+    shooting_stats = shooting_stats.sort_values('% Réussite', ascending=False).reset_index(drop=True)
+    shooting_stats.insert(0, 'Rang', range(1, len(shooting_stats) + 1))
+    
+    # Réorganiser les colonnes pour mettre % Réussite après Équipe
+    shooting_stats = shooting_stats[['Rang', 'Équipe', '% Réussite', 'Buts', 'Tirs']]
+    
+    return shooting_stats
+
+
+def render(stats_df: pd.DataFrame, season_stats: pd.DataFrame):
     """Render the shooting percentage tab"""
     st.markdown("### 🎯 Classement du pourcentage de réussite")
     
-    if not player_stats_df.empty:
-        # Filtrer les joueurs (non officiels)
-        players = player_stats_df[player_stats_df['is_official'] == False].copy()
+    if not season_stats.empty:
+        shooting_stats = build_shooting_table(season_stats)
         
-        if not players.empty:
-            # Grouper par équipe, match et joueur pour éviter les doublons, puis sommer par équipe
-            unique_stats = players.groupby(['match_id', 'team_name', 'player_id']).agg({
-                'goals': 'max',  # Utiliser max au cas où il y aurait des doublons
-                'shots': 'max'
-            }).reset_index()
-            
-            # Ensuite, grouper par équipe et sommer tous les matchs
-            shooting_stats = unique_stats.groupby('team_name').agg({
-                'goals': 'sum',
-                'shots': 'sum'
-            }).reset_index()
-            
-            # Filtrer les équipes avec au moins 1 tir
-            shooting_stats = shooting_stats[shooting_stats['shots'] > 0].copy()
-            
-            # Calculer le pourcentage de réussite
-            shooting_stats['% Réussite'] = (
-                (shooting_stats['goals'] / shooting_stats['shots'] * 100)
-                .round(2)
-            )
-            
-            # Renommer les colonnes
-            shooting_stats = shooting_stats.rename(columns={
-                'team_name': 'Équipe',
-                'goals': 'Buts',
-                'shots': 'Tirs'
-            })
-            
-            # Trier par pourcentage de réussite
-            shooting_stats = shooting_stats.sort_values('% Réussite', ascending=False).reset_index(drop=True)
-            shooting_stats.insert(0, 'Rang', range(1, len(shooting_stats) + 1))
-            
-            # Réorganiser les colonnes pour mettre % Réussite après Équipe
-            shooting_stats = shooting_stats[['Rang', 'Équipe', '% Réussite', 'Buts', 'Tirs']]
-            
+        if shooting_stats is not None:
             st.dataframe(
                 shooting_stats,
                 use_container_width=True,
@@ -79,7 +76,7 @@ def render(matches_df: pd.DataFrame, teams_df: pd.DataFrame, player_stats_df: pd
             
             st.download_button(
                 label="📥 Télécharger les statistiques CSV",
-                data=shooting_stats.to_csv(index=False).encode('utf-8'),
+                data=to_csv_bytes(shooting_stats),
                 file_name='stats_pourcentage_reussite.csv',
                 mime='text/csv',
             )
@@ -1,85 +1,65 @@
 """
 Utility functions for team statistics
 """
+import streamlit as st
 import pandas as pd
+from src.metrics import per_match
 
+# Colonnes de totaux de la vue team_goal_stats
+GOAL_TOTAL_COLUMNS = [
+    'played', 'goals_for', 'goals_against',
+    'home_goals_for', 'away_goals_for', 'home_goals_against', 'away_goals_against'
+]
 
-def calculate_team_matches(matches_df: pd.DataFrame, teams_df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate the number of matches played by each team"""
-    team_matches = []
-    for team_id in teams_df['id'].unique():
-        team_name = teams_df[teams_df['id'] == team_id]['name'].iloc[0]
-        # Compter les matchs à domicile et à l'extérieur
-        home_matches = matches_df[
-            (matches_df['home_team_id'] == team_id) & 
-            (matches_df['final_score_home'].notna())
-        ]
-        away_matches = matches_df[
-            (matches_df['away_team_id'] == team_id) & 
-            (matches_df['final_score_away'].notna())
-        ]
-        total_matches = len(home_matches) + len(away_matches)
-        if total_matches > 0:
-            team_matches.append({'team_name': team_name, 'matches': total_matches})
-    
-    return pd.DataFrame(team_matches)
 
+@st.cache_data(show_spinner=False)
+def calculate_goal_stats(goal_totals_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate goal statistics for all teams from the team_goal_stats view.
 
-def calculate_goal_stats(matches_df: pd.DataFrame, teams_df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate goal statistics for all teams"""
-    goal_stats = []
-    
-    for team_id in teams_df['id'].unique():
-        team_name = teams_df[teams_df['id'] == team_id]['name'].iloc[0]
-        
-        # Matchs à domicile
-        home_matches = matches_df[matches_df['home_team_id'] == team_id]
-        # Matchs à l'extérieur
-        away_matches = matches_df[matches_df['away_team_id'] == team_id]
-        
-        # Initialiser les compteurs
-        total_goals_for = 0
-        total_goals_against = 0
-        home_goals_for = 0
-        away_goals_for = 0
-        home_goals_against = 0
-        away_goals_against = 0
-        matches_played = 0
-        
-        # Calculer les buts à domicile
-        for _, match in home_matches.iterrows():
-            if pd.notna(match['final_score_home']) and pd.notna(match['final_score_away']):
-                home_goals_for += match['final_score_home']
-                home_goals_against += match['final_score_away']
-                total_goals_for += match['final_score_home']
-                total_goals_against += match['final_score_away']
-                matches_played += 1
-        
-        # Calculer les buts à l'extérieur
-        for _, match in away_matches.iterrows():
-            if pd.notna(match['final_score_home']) and pd.notna(match['final_score_away']):
-                away_goals_for += match['final_score_away']
-                away_goals_against += match['final_score_home']
-                total_goals_for += match['final_score_away']
-                total_goals_against += match['final_score_home']
-                matches_played += 1
-        
-        if matches_played > 0:
-            goal_stats.append({
-                'Équipe': team_name,
-                'J': matches_played,
-                'Buts marqués': int(total_goals_for),
-                'Buts encaissés': int(total_goals_against),
-                'Diff': int(total_goals_for - total_goals_against),
-                'Moy marqués': round(total_goals_for / matches_played, 2),
-                'Moy encaissés': round(total_goals_against / matches_played, 2),
-                'Buts dom.': int(home_goals_for),
-                'Buts ext.': int(away_goals_for),
-                'Encaissés dom.': int(home_goals_against),
-                'Encaissés ext.': int(away_goals_against),
-            })
-    
-    if goal_stats:
-        return pd.DataFrame(goal_stats)
-    else:
+    The view holds one row per league and team; the rows of a team in several
+    leagues are summed.
+    """
+    if goal_totals_df.empty:
         return None
+
+    totals = goal_totals_df.groupby('team_name', observed=True)[GOAL_TOTAL_COLUMNS].sum(min_count=1).fillna(0).reset_index()
+    totals = totals[totals['played'] > 0]
+
+    if totals.empty:
+        return None
+
+    return pd.DataFrame({
+        'Équipe': totals['team_name'],
+        'J': totals['played'].astype(int),
+        'Buts marqués': totals['goals_for'].astype(int),
+        'Buts encaissés': totals['goals_against'].astype(int),
+        'Diff': (totals['goals_for'] - totals['goals_against']).astype(int),
+        'Moy marqués': per_match(totals['goals_for'], totals['played']),
+        'Moy encaissés': per_match(totals['goals_against'], totals['played']),
+        'Buts dom.': totals['home_goals_for'].astype(int),
+        'Buts ext.': totals['away_goals_for'].astype(int),
+        'Encaissés dom.': totals['home_goals_against'].astype(int),
+        'Encaissés ext.': totals['away_goals_against'].astype(int),
+    }).reset_index(drop=True)
+
+
+def aggregate_by_team(season_stats: pd.DataFrame, stats_df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    Sum player season totals per team and add the number of matches played.
+
+    Args:
+        season_stats: Player season aggregate (calculate_player_season_stats)
+        stats_df: Team goal statistics (calculate_goal_stats), for the 'J' column
+        columns: Player total columns to sum
+
+    Returns:
+        DataFrame with team_name, the summed columns and matches
+    """
+    team_stats = season_stats.groupby('team_name', observed=True)[columns].sum().reset_index()
+
+    # Nombre de matchs par équipe
+    matches_per_team = pd.Series(dtype=int) if stats_df is None else stats_df.set_index('Équipe')['J']
+    team_stats['matches'] = team_stats['team_name'].astype(str).map(matches_per_team).fillna(0).astype(int)
+
+    return team_stats
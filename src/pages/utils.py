@@ -0,0 +1,129 @@
+"""
+Shared helpers for the Streamlit pages
+"""
+import streamlit as st
+import pandas as pd
+from src.database import get_leagues
+from src.analytics.form import team_match_results, team_form, team_form_summary
+
+
+def format_league(league: dict) -> str:
+    """Display label of a league: name, group and season"""
+    label = league['name']
+    if league.get('group_name'):
+        label += f" - {league['group_name']}"
+    if league.get('season'):
+        label += f" ({league['season']})"
+    return label
+
+
+def league_selector():
+    """
+    Global competition selector, shown in the sidebar of every page.
+
+    The choice is kept in st.session_state['league_id'] so it follows the user
+    from page to page; pages pass it to the src.database loaders, which filter
+    on it server-side. Returns the selected league id, or None for all
+    competitions.
+    """
+    leagues_df = get_leagues()
+    leagues = {} if leagues_df.empty else {
+        league['id']: format_league(league)
+        for league in leagues_df.sort_values(['season', 'name'], ascending=[False, True]).to_dict('records')
+    }
+
+    options = [None] + list(leagues)
+    current = st.session_state.get('league_id')
+    if current not in options:
+        current = None
+
+    league_id = st.selectbox(
+        "🏆 Compétition",
+        options=options,
+        index=options.index(current),
+        format_func=lambda option: "Toutes les compétitions" if option is None else leagues[option]
+    )
+    st.session_state['league_id'] = league_id
+    return league_id
+
+
+def lazy_tabs(labels: list, key: str) -> str:
+    """
+    Tab bar that only runs the selected tab.
+
+    st.tabs executes the code of every tab on each rerun even though a single one
+    is visible; this horizontal selector returns the selected label so the page
+    computes and renders that tab only. Tab tables are built by cached functions,
+    so switching back to a tab reuses its previous results.
+    """
+    return st.radio(
+        "Onglet",
+        options=labels,
+        horizontal=True,
+        key=key,
+        label_visibility="collapsed"
+    )
+
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Encode a table as CSV for a download button (cached across reruns)"""
+    return df.to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False)
+def build_match_labels(matches_df: pd.DataFrame, teams_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Match dimension table indexed by match_id.
+
+    Holds the home/away team names, final scores, date and the preformatted
+    "Home X - Y Away\\n(dd/mm/yyyy)" label, so tables that show the match of a
+    player_stats row do a single indexed lookup instead of joining matches and
+    teams (twice) and formatting every row.
+    """
+    team_names = teams_df.set_index('id')['name']
+
+    match_labels = matches_df[['id', 'match_date', 'final_score_home', 'final_score_away']]
+    match_labels['home_team_name'] = matches_df['home_team_id'].map(team_names)
+    match_labels['away_team_name'] = matches_df['away_team_id'].map(team_names)
+
+    # Construire le libellé du match sur deux lignes
+    complete = (
+        match_labels['home_team_name'].notna() &
+        match_labels['away_team_name'].notna() &
+        match_labels['final_score_home'].notna() &
+        match_labels['final_score_away'].notna()
+    )
+    rows = match_labels[complete]
+    match_labels['label'] = 'N/A'
+    match_labels.loc[complete, 'label'] = (
+        rows['home_team_name'] + ' ' +
+        rows['final_score_home'].astype(int).astype(str) + ' - ' +
+        rows['final_score_away'].astype(int).astype(str) + ' ' +
+        rows['away_team_name'] + '\n(' +
+        pd.to_datetime(rows['match_date']).dt.strftime('%d/%m/%Y') + ')'
+    )
+
+    return match_labels.set_index('id')
+
+
+@st.cache_data(show_spinner=False)
+def build_team_form(matches_df: pd.DataFrame, venue: str = None, score_type: str = 'final') -> tuple:
+    """
+    Form of every team, computed once for all teams and shared by the pages.
+
+    Args:
+        matches_df: Matches of the selected league
+        venue: 'home' or 'away' to keep only those matches of each team
+        score_type: 'final' or 'halftime'
+
+    Returns:
+        (history, summary): the team_form table (one row per team and match)
+        and the team_form_summary table indexed by team_id
+    """
+    results = team_match_results(matches_df, score_type)
+    if venue is not None:
+        results = results[results['venue'] == venue]
+
+    history = team_form(results)
+    return history, team_form_summary(history)
@@ -0,0 +1,193 @@
+"""
+Compare the query plans of the dashboard / import access paths before and after
+the index migrations (src/sql/migrations/002_composite_indexes.sql and
+003_action_clock.sql), on a local Postgres seeded with synthetic seasons.
+
+Requires psql and a scratch database (its tables are DROPPED and recreated):
+    createdb hb_bench
+    python src/scripts/bench-indexes.py --dsn postgresql://localhost/hb_bench
+"""
+import os
+import json
+import argparse
+import subprocess
+
+SQL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sql'))
+
+# Migrations comparées à l'état d'origine, appliquées dans l'ordre
+INDEX_MIGRATIONS = ['002_composite_indexes.sql', '003_action_clock.sql']
+
+# Index set of create_tables.sql before migration 002 (single-column indexes)
+BASELINE_INDEXES_SQL = """
+DROP INDEX IF EXISTS idx_matches_teams_date;
+DROP INDEX IF EXISTS idx_matches_league_id;
+DROP INDEX IF EXISTS idx_actions_match_period_time;
+DROP INDEX IF EXISTS idx_actions_match_time_seconds;
+DROP INDEX IF EXISTS idx_player_stats_match_team;
+CREATE INDEX IF NOT EXISTS idx_leagues_name ON leagues(name);
+CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name);
+CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);
+CREATE INDEX IF NOT EXISTS idx_matches_league ON matches(league_id);
+CREATE INDEX IF NOT EXISTS idx_matches_home_team ON matches(home_team_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_match ON player_stats(match_id);
+CREATE INDEX IF NOT EXISTS idx_actions_match ON actions(match_id);
+ANALYZE;
+"""
+
+SEED_SQL = """
+-- Une ligue par niveau et par saison
+INSERT INTO leagues (name, group_id, season)
+SELECT 'Nationale ' || l, 'G' || l, (2014 + s) || '-' || (2015 + s)
+FROM generate_series(1, {leagues}) l, generate_series(1, {seasons}) s;
+
+-- Les mêmes clubs chaque saison
+INSERT INTO teams (name)
+SELECT 'Club ' || l || '-' || t
+FROM generate_series(1, {leagues}) l, generate_series(1, {teams}) t;
+
+INSERT INTO players (name, name_key, team_id)
+SELECT 'Joueur ' || t.id || '-' || p, player_name_key('Joueur ' || t.id || '-' || p), t.id
+FROM teams t, generate_series(1, {players}) p;
+
+-- Championnat aller-retour
+INSERT INTO matches (league_id, home_team_id, away_team_id, match_date,
+                     ht_score_home, ht_score_away, final_score_home, final_score_away)
+SELECT lg.id, h.id, a.id,
+       make_date(split_part(lg.season, '-', 1)::int, 9, 1) + (random() * 250)::int,
+       ht.home, ht.away, ht.home + 8 + (random() * 10)::int, ht.away + 8 + (random() * 10)::int
+FROM leagues lg
+JOIN teams h ON h.name LIKE 'Club ' || split_part(lg.name, ' ', 2) || '-%'
+JOIN teams a ON a.name LIKE 'Club ' || split_part(lg.name, ' ', 2) || '-%' AND a.id <> h.id
+CROSS JOIN LATERAL (SELECT 8 + (random() * 10)::int AS home, 8 + (random() * 10)::int AS away) ht;
+
+INSERT INTO player_stats (match_id, player_id, team_id, team_name, player_name, is_official,
+                          goals, shots, goals_7m, yellow_cards, two_minutes, red_cards, blue_cards, saves)
+SELECT m.id, p.id, t.id, t.name, p.name, FALSE,
+       (random() * 8)::int, 8 + (random() * 8)::int, (random() * 2)::int,
+       (random() * 0.6)::int, (random() * 0.7)::int, 0, 0,
+       CASE WHEN p.name LIKE '%-1' THEN (random() * 15)::int ELSE 0 END
+FROM matches m
+JOIN teams t ON t.id IN (m.home_team_id, m.away_team_id)
+JOIN players p ON p.team_id = t.id;
+
+INSERT INTO actions (match_id, period, time, time_seconds, score, score_home, score_away,
+                     action, action_type, team, player_number, player_name)
+SELECT m.id, CASE WHEN c.seconds < 1800 THEN 1 ELSE 2 END,
+       lpad((c.seconds / 60)::text, 2, '0') || ':' || lpad((c.seconds % 60)::text, 2, '0'), c.seconds,
+       (g / 2) || '-' || ((g - 1) / 2), g / 2, (g - 1) / 2,
+       'But', 'Goal', CASE WHEN g % 2 = 0 THEN 'Home' ELSE 'Away' END, ((g % 16) + 1)::text, NULL
+FROM matches m, generate_series(1, {actions}) g
+CROSS JOIN LATERAL (SELECT (g * 3600 / ({actions} + 1)) AS seconds) c;
+
+ANALYZE;
+"""
+
+# Paramètres représentatifs, tirés des données générées
+PARAMS_SQL = """
+SELECT json_build_object(
+    'match_id', m.id, 'home_team_id', m.home_team_id, 'away_team_id', m.away_team_id,
+    'match_date', m.match_date, 'league_id', m.league_id
+)
+FROM matches m
+ORDER BY m.id DESC
+LIMIT 1;
+"""
+
+# Chemins d'accès réels (requête d'origine entre parenthèses)
+QUERIES = {
+    "match duplicate check (create_match_in_db)":
+        "SELECT * FROM matches WHERE home_team_id = {home_team_id} AND away_team_id = {away_team_id} "
+        "AND match_date = '{match_date}'",
+    "player index of both teams (resolve_player_ids)":
+        "SELECT id, team_id, name_key FROM players WHERE team_id IN ({home_team_id}, {away_team_id})",
+    "match actions (get_match_details)":
+        "SELECT * FROM actions WHERE match_id = {match_id} ORDER BY time_seconds, id",
+    "match player stats (get_match_details / sync_table_rows)":
+        "SELECT * FROM player_stats WHERE match_id = {match_id} ORDER BY team_id",
+    "league match ids (get_player_stats)":
+        "SELECT id FROM matches WHERE league_id = {league_id}",
+    "league player stats (get_player_stats)":
+        "SELECT * FROM player_stats WHERE match_id IN (SELECT id FROM matches WHERE league_id = {league_id})",
+}
+
+
+def psql(dsn, sql=None, file=None):
+    """Run SQL through psql and return its unaligned output"""
+    command = ['psql', dsn, '-v', 'ON_ERROR_STOP=1', '-q', '-At']
+    command += ['-f', file] if file else ['-c', sql]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return result.stdout.strip()
+
+
+def _plan_nodes(plan):
+    """Walk a JSON plan tree"""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+def explain(dsn, query, repeat):
+    """Best execution time, scan nodes and indexes used by a query"""
+    best = None
+    for _ in range(repeat):
+        output = psql(dsn, f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+        plan = json.loads(output)[0]
+        if best is None or plan['Execution Time'] < best['Execution Time']:
+            best = plan
+    nodes = list(_plan_nodes(best['Plan']))
+    scans = sorted({node['Node Type'] for node in nodes if 'Scan' in node['Node Type']})
+    indexes = sorted({node['Index Name'] for node in nodes if 'Index Name' in node})
+    return {
+        'ms': best['Execution Time'],
+        'scans': ', '.join(scans),
+        'indexes': ', '.join(indexes) or '-',
+    }
+
+
+def run_plans(dsn, params, repeat):
+    """EXPLAIN every access path"""
+    return {name: explain(dsn, query.format(**params), repeat) for name, query in QUERIES.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query plans before/after the index migrations on synthetic seasons')
+    parser.add_argument('--dsn', default=os.getenv('BENCH_DATABASE_URL', 'postgresql://localhost/hb_bench'),
+                        help='Scratch database (tables are dropped!), default: $BENCH_DATABASE_URL or postgresql://localhost/hb_bench')
+    parser.add_argument('--leagues', type=int, default=4, help='Leagues per season (default: 4)')
+    parser.add_argument('--seasons', type=int, default=5, help='Number of seasons (default: 5)')
+    parser.add_argument('--teams', type=int, default=12, help='Teams per league (default: 12)')
+    parser.add_argument('--players', type=int, default=16, help='Players per team (default: 16)')
+    parser.add_argument('--actions', type=int, default=120, help='Actions per match (default: 120)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query, best kept (default: 5)')
+    args = parser.parse_args()
+
+    print(f"🗄️  Création du schéma dans {args.dsn}...")
+    psql(args.dsn, file=os.path.join(SQL_DIR, 'create_tables.sql'))
+
+    print("🌱 Génération des saisons synthétiques...")
+    psql(args.dsn, SEED_SQL.format(**vars(args)))
+    counts = psql(args.dsn, "SELECT (SELECT count(*) FROM matches) || ' matches, ' || "
+                            "(SELECT count(*) FROM player_stats) || ' player_stats, ' || "
+                            "(SELECT count(*) FROM actions) || ' actions'")
+    print(f"   {counts}")
+    params = json.loads(psql(args.dsn, PARAMS_SQL))
+
+    print("📉 Index d'origine (une colonne)...")
+    psql(args.dsn, BASELINE_INDEXES_SQL)
+    before = run_plans(args.dsn, params, args.repeat)
+
+    print(f"📈 Après les migrations {', '.join(INDEX_MIGRATIONS)}...")
+    for migration in INDEX_MIGRATIONS:
+        psql(args.dsn, file=os.path.join(SQL_DIR, 'migrations', migration))
+    after = run_plans(args.dsn, params, args.repeat)
+
+    for name in QUERIES:
+        print(f"\n{name}")
+        for label, result in (('avant', before[name]), ('après', after[name])):
+            print(f"   {label:6} {result['ms']:8.3f} ms  {result['scans']:<30} {result['indexes']}")
+
+
+if __name__ == "__main__":
+    main()
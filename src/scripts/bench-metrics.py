@@ -0,0 +1,81 @@
+"""
+Benchmark the vectorized rate helpers of src/metrics.py against the row-wise
+apply(lambda, axis=1) they replace.
+
+Usage: python src/scripts/bench-metrics.py [--rows 100000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.metrics import per_match, percentage
+
+
+def make_player_rows(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic player aggregate rows (some with 0 shots / 0 matches)"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'goals': rng.integers(0, 120, n_rows),
+        'shots': rng.integers(0, 250, n_rows),
+        'matches_played': rng.integers(0, 26, n_rows)
+    })
+
+
+def rates_apply(df: pd.DataFrame) -> pd.DataFrame:
+    """Previous implementation: one Python call per row and per column"""
+    out = pd.DataFrame(index=df.index)
+    out['% Réussite'] = df.apply(
+        lambda row: round(row['goals'] / row['shots'] * 100, 2) if row['shots'] > 0 else 0,
+        axis=1
+    )
+    out['Moy buts/match'] = df.apply(
+        lambda row: round(row['goals'] / row['matches_played'], 2) if row['matches_played'] > 0 else 0,
+        axis=1
+    )
+    return out
+
+
+def rates_vectorized(df: pd.DataFrame) -> pd.DataFrame:
+    """src/metrics.py implementation"""
+    out = pd.DataFrame(index=df.index)
+    out['% Réussite'] = percentage(df['goals'], df['shots'])
+    out['Moy buts/match'] = per_match(df['goals'], df['matches_played'])
+    return out
+
+
+def best_time(func, df: pd.DataFrame, repeat: int) -> float:
+    """Best wall time over `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark apply(axis=1) vs vectorized rate columns')
+    parser.add_argument('--rows', type=int, default=100_000, help='Number of player rows (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per implementation, best time kept (default: 5)')
+    args = parser.parse_args()
+
+    df = make_player_rows(args.rows)
+
+    # Les deux implémentations doivent donner les mêmes valeurs
+    pd.testing.assert_frame_equal(rates_apply(df), rates_vectorized(df), check_dtype=False)
+
+    apply_time = best_time(rates_apply, df, args.repeat)
+    vectorized_time = best_time(rates_vectorized, df, args.repeat)
+
+    print(f"📊 {args.rows} lignes joueurs, 2 colonnes de taux (meilleur de {args.repeat})")
+    print(f"   apply(axis=1) : {apply_time * 1000:9.1f} ms")
+    print(f"   vectorisé     : {vectorized_time * 1000:9.1f} ms")
+    print(f"   ⚡ Accélération : x{apply_time / vectorized_time:.0f}")
+
+
+if __name__ == "__main__":
+    main()
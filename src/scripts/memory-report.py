@@ -0,0 +1,106 @@
+"""
+Report the memory footprint of the DataFrames a dashboard session loads, with
+the raw JSON types (object columns) and with the compact types of src/dtypes.py.
+
+Usage: python src/scripts/memory-report.py [--matches 1500] [--teams 48] [--players 16]
+"""
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.dtypes import compact_dtypes, MATCH_COUNT_COLUMNS
+
+ACTION_TYPES = ['Goal', 'Goal_7m', 'Shot', 'Save', 'Suspension_2min', 'Warning', 'Timeout']
+
+
+def make_session_tables(n_matches: int, n_teams: int, n_players: int, seed: int = 0) -> dict:
+    """Synthetic rows shaped like the Supabase responses (Python str/int/bool values)"""
+    rng = np.random.default_rng(seed)
+    team_names = [f"Club {t}" for t in range(n_teams)]
+    home = rng.integers(0, n_teams, n_matches)
+    away = (home + rng.integers(1, n_teams, n_matches)) % n_teams
+
+    # Une ligne par joueur et par match
+    match_ids = np.repeat(np.arange(n_matches), 2 * n_players)
+    team_ids = np.where(np.arange(len(match_ids)) % (2 * n_players) < n_players,
+                        home[match_ids], away[match_ids])
+    numbers = np.arange(len(match_ids)) % n_players + 1
+    player_stats = pd.DataFrame({
+        'id': np.arange(len(match_ids)),
+        'match_id': match_ids,
+        'team_id': team_ids,
+        'team_name': [team_names[t] for t in team_ids],
+        'player_name': [f"JOUEUR{t}-{n} prenom" for t, n in zip(team_ids, numbers)],
+        'is_official': (numbers == n_players).tolist(),
+        'is_captain': (numbers == 7).tolist(),
+        **{column: rng.integers(0, 8, len(match_ids)).tolist() for column in MATCH_COUNT_COLUMNS},
+    }).astype(object)
+
+    # ~120 actions par match
+    action_match_ids = np.repeat(np.arange(n_matches), 120)
+    seconds = np.tile(np.linspace(0, 3599, 120).astype(int), n_matches)
+    sides = rng.integers(0, 2, len(action_match_ids))
+    action_numbers = rng.integers(1, n_players, len(action_match_ids))
+    action_teams = np.where(sides == 0, home[action_match_ids], away[action_match_ids])
+    actions = pd.DataFrame({
+        'id': np.arange(len(action_match_ids)),
+        'match_id': action_match_ids,
+        'period': np.where(seconds < 1800, 1, 2),
+        'time': [f"{s // 60:02d}:{s % 60:02d}" for s in seconds],
+        'time_seconds': seconds,
+        'score': [f"{s // 200}-{s // 240}" for s in seconds],
+        'score_home': seconds // 200,
+        'score_away': seconds // 240,
+        'action_type': rng.choice(ACTION_TYPES, len(action_match_ids)),
+        'team': np.where(sides == 0, 'Home', 'Away'),
+        'player_number': action_numbers.astype(str),
+        'player_name': [f"JOUEUR{t}-{n} prenom" for t, n in zip(action_teams, action_numbers)],
+    }).astype(object)
+
+    # Vue player_season_stats (une seule ligue)
+    player_season_stats = player_stats[player_stats['is_official'] == False].groupby(
+        ['player_name', 'team_name']
+    ).agg(
+        matches_played=('match_id', 'nunique'),
+        **{column: (column, 'sum') for column in MATCH_COUNT_COLUMNS}
+    ).reset_index().assign(league_id=1).astype(object)
+
+    return {
+        "player_stats": player_stats,
+        "actions": actions,
+        "player_season_stats": player_season_stats,
+    }
+
+
+def footprint_mb(df: pd.DataFrame) -> float:
+    """Deep memory usage in MB"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory footprint of the loaded DataFrames, raw vs compact dtypes')
+    parser.add_argument('--matches', type=int, default=1500, help='Number of matches (default: 1500)')
+    parser.add_argument('--teams', type=int, default=48, help='Number of teams (default: 48)')
+    parser.add_argument('--players', type=int, default=16, help='Players per team sheet (default: 16)')
+    args = parser.parse_args()
+
+    tables = make_session_tables(args.matches, args.teams, args.players)
+
+    print(f"🧠 Session type : {args.matches} matchs, {args.teams} équipes")
+    print(f"   {'table':<22}{'lignes':>10}{'avant (MB)':>13}{'après (MB)':>13}")
+    total_before = total_after = 0
+    for table_name, df in tables.items():
+        before = footprint_mb(df)
+        after = footprint_mb(compact_dtypes(df.copy(), table_name))
+        total_before += before
+        total_after += after
+        print(f"   {table_name:<22}{len(df):>10}{before:>13.1f}{after:>13.1f}")
+    print(f"   {'total':<22}{'':>10}{total_before:>13.1f}{total_after:>13.1f}")
+    print(f"   📉 Réduction : x{total_before / total_after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
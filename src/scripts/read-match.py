@@ -1,10 +1,25 @@
 import camelot
 import pandas as pd
 from supabase import create_client, Client
-import sys
 import requests
 import os
+import re
+import math
+import time
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import cProfile
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
 from dotenv import load_dotenv
+from pypdf import PdfReader
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTChar
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,6 +33,58 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+class ImportProfiler:
+    """Per-stage wall/CPU timings and Supabase round trips for one match import"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.stages = {}
+        self.round_trips = 0
+        self.fields = {}
+    
+    @contextmanager
+    def stage(self, name):
+        """Time a stage; repeated stages are accumulated"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        round_trips_start = self.round_trips
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'round_trips': 0})
+            stage['wall_seconds'] += time.perf_counter() - wall_start
+            stage['cpu_seconds'] += time.process_time() - cpu_start
+            stage['round_trips'] += self.round_trips - round_trips_start
+    
+    def annotate(self, **fields):
+        """Attach extra fields (match ID, row counts...) to the profile record"""
+        self.fields.update(fields)
+    
+    def to_record(self, **fields):
+        stages = {
+            name: {key: round(value, 4) if isinstance(value, float) else value for key, value in stage.items()}
+            for name, stage in self.stages.items()
+        }
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            **fields,
+            **self.fields,
+            'wall_seconds': round(sum(stage['wall_seconds'] for stage in self.stages.values()), 4),
+            'cpu_seconds': round(sum(stage['cpu_seconds'] for stage in self.stages.values()), 4),
+            'round_trips': self.round_trips,
+            'stages': stages,
+        }
+
+# Profil de l'import en cours (remis à zéro pour chaque match)
+profiler = ImportProfiler()
+
+def execute(query):
+    """Execute a Supabase query, counting the round trip in the current import profile"""
+    profiler.round_trips += 1
+    return query.execute()
+
 def download_pdf(url, output_path="temp_match.pdf"):
     """Download PDF from URL"""
     print(f"Downloading PDF from: {url}")
@@ -34,9 +101,73 @@ def download_pdf(url, output_path="temp_match.pdf"):
         print(f"✗ Error downloading PDF: {e}")
         return None
 
-def extract_match_stats(pdf_path):
-    # Lire toutes les pages
-    tables = camelot.read_pdf(pdf_path, pages='all', flavor='lattice')
+# Marqueur du déroulé du match, comparé sans accents ni espaces (voir _normalize_text)
+ACTIONS_MARKER = 'derouledumatch'
+
+def _normalize_text(text):
+    """Lowercase text and strip accents and whitespace for marker lookups"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ''.join(text.split()).lower()
+
+def locate_sections(pdf_path):
+    """
+    Pre-scan the PDF text layer to find which pages hold each section.
+
+    Returns a dict with the page numbers (1-based) to hand to Camelot:
+    - 'info': match info and player tables (first page up to the timeline start)
+    - 'actions': the Déroulé du Match timeline (timeline start up to the last page)
+    Falls back to every page when the text layer is missing or a marker is not found.
+    """
+    try:
+        reader = PdfReader(pdf_path)
+        page_texts = [_normalize_text(page.extract_text()) for page in reader.pages]
+    except Exception as e:
+        print(f"⚠️  Text pre-scan failed ({e}), falling back to all pages")
+        return {'info': 'all', 'actions': 'all'}
+    
+    all_pages = list(range(1, len(page_texts) + 1))
+    
+    actions_start = None
+    for page_number, text in enumerate(page_texts, start=1):
+        if ACTIONS_MARKER in text:
+            actions_start = page_number
+            break
+    
+    if actions_start is None:
+        return {'info': all_pages, 'actions': all_pages}
+    
+    # Le tableau des joueurs peut partager la page avec le début du déroulé
+    return {
+        'info': all_pages[:actions_start],
+        'actions': all_pages[actions_start - 1:],
+    }
+
+@lru_cache(maxsize=64)
+def _read_page_tables(pdf_path, page, mtime_ns, size):
+    """Run Camelot lattice extraction on a single page (cached per file version)"""
+    return tuple(camelot.read_pdf(pdf_path, pages=str(page), flavor='lattice'))
+
+def read_tables(pdf_path, pages='all'):
+    """
+    Extract lattice tables from the given pages (list of page numbers or 'all').
+    Pages are parsed at most once per file version, so the extractors below
+    share the Camelot work instead of re-reading the whole PDF each time.
+    """
+    if pages == 'all':
+        return list(camelot.read_pdf(pdf_path, pages='all', flavor='lattice'))
+    
+    stat = os.stat(pdf_path)
+    tables = []
+    for page in pages:
+        tables.extend(_read_page_tables(pdf_path, page, stat.st_mtime_ns, stat.st_size))
+    return tables
+
+def extract_match_stats(pdf_path, pages=None):
+    # Lire uniquement les pages qui contiennent les tableaux des joueurs
+    if pages is None:
+        pages = locate_sections(pdf_path)['info']
+    tables = read_tables(pdf_path, pages)
     print("Tables trouvées:", len(tables))
     if len(tables) == 0:
         raise ValueError("Aucun tableau trouvé — vérifier le PDF ou le paramètre flavor")
@@ -137,6 +268,13 @@ def extract_match_stats(pdf_path):
                 if not player_number or player_number == 'nan' or player_number == '':
                     is_official = True
             
+            # Numéro de maillot (clé de rapprochement avec les actions du match)
+            shirt_number = None
+            if 'number' in col_indices:
+                number_val = str(row.iloc[col_indices['number']]).strip()
+                if number_val.isdigit():
+                    shirt_number = int(number_val)
+            
             # Vérifier si le joueur est capitaine (colonne Capt contient 'X')
             is_captain = False
             if 'captain' in col_indices:
@@ -176,6 +314,7 @@ def extract_match_stats(pdf_path):
             player_data = {
                 'team': team_name,
                 'player_name': name_val,
+                'player_number': shirt_number,
                 'is_official': is_official,
                 'is_captain': is_captain,
                 'goals': row.iloc[col_indices.get('goals', 10)] if 'goals' in col_indices else '',
@@ -219,9 +358,11 @@ def extract_match_stats(pdf_path):
     
     return df
 
-def extract_match_actions(pdf_path):
-    # Lire toutes les pages
-    tables = camelot.read_pdf(pdf_path, pages='all', flavor='lattice')
+def extract_match_actions(pdf_path, pages=None):
+    # Lire uniquement les pages du déroulé du match
+    if pages is None:
+        pages = locate_sections(pdf_path)['actions']
+    tables = read_tables(pdf_path, pages)
     print("Tables trouvées:", len(tables))
     if len(tables) == 0:
         raise ValueError("Aucun tableau trouvé — vérifier le PDF ou le paramètre flavor")
@@ -315,6 +456,186 @@ def extract_match_actions(pdf_path):
     
     return pd.DataFrame(actions)
 
+TIME_PATTERN = re.compile(r'^\d{1,2}:\d{2}$')
+SCORE_PATTERN = re.compile(r'^\d+-\d+$')
+
+def _iter_chars(layout_obj):
+    """Recursively yield every LTChar of a pdfminer layout object"""
+    if isinstance(layout_obj, LTChar):
+        yield layout_obj
+        return
+    try:
+        children = iter(layout_obj)
+    except TypeError:
+        return
+    for child in children:
+        yield from _iter_chars(child)
+
+def _group_rows(chars):
+    """Group characters into text rows (top to bottom) using their vertical center"""
+    rows = []
+    for char in sorted(chars, key=lambda c: -(c.y0 + c.y1) / 2):
+        center = (char.y0 + char.y1) / 2
+        tolerance = max(char.height * 0.5, 1.0)
+        if rows and abs(rows[-1]['center'] - center) <= tolerance:
+            rows[-1]['chars'].append(char)
+        else:
+            rows.append({'center': center, 'chars': [char]})
+    return [sorted(row['chars'], key=lambda c: c.x0) for row in rows]
+
+def _split_cells(chars):
+    """
+    Split a sorted run of characters into cells wherever the horizontal gap is wide.
+    Returns a list of (text, x0) tuples.
+    """
+    cells = []
+    current = []
+    for char in chars:
+        if current:
+            gap = char.x0 - current[-1].x1
+            if gap > max(char.height * 0.6, 2.0):
+                cells.append(current)
+                current = []
+        current.append(char)
+    if current:
+        cells.append(current)
+    return [(''.join(c.get_text() for c in cell), cell[0].x0) for cell in cells]
+
+def extract_match_actions_text(pdf_path, pages=None):
+    """
+    Extract the Déroulé du Match timeline from the PDF text layer.
+
+    Faster alternative to the Camelot lattice extraction: characters are read
+    with their positions via pdfminer, grouped into rows, and split into the
+    two Temps/Score/Action column blocks located from the 'Temps' headers.
+    Returns the same columns as extract_match_actions.
+    """
+    if pages is None:
+        pages = locate_sections(pdf_path)['actions']
+    page_numbers = None if pages == 'all' else [page - 1 for page in pages]
+    
+    actions = []
+    block_starts = None
+    found_section = False
+    
+    for page_layout in extract_pages(pdf_path, page_numbers=page_numbers):
+        for row in _group_rows(list(_iter_chars(page_layout))):
+            # Ignorer tout ce qui précède "Déroulé du Match"
+            if not found_section:
+                row_text = ''.join(c.get_text() for c in row)
+                found_section = ACTIONS_MARKER in _normalize_text(row_text)
+                continue
+            
+            # Ligne d'en-tête: repérer le début de chaque bloc Temps/Score/Action
+            cells = _split_cells(row)
+            cell_texts = [text.strip() for text, _ in cells]
+            if 'Temps' in cell_texts and 'Score' in cell_texts:
+                block_starts = [x0 for text, x0 in cells if text.strip() == 'Temps']
+                continue
+            
+            if not block_starts:
+                continue
+            
+            # Répartir les caractères entre les blocs (gauche / droite)
+            blocks = [[] for _ in block_starts]
+            for char in row:
+                block_idx = 0
+                for idx, start in enumerate(block_starts):
+                    if char.x0 >= start - 2:
+                        block_idx = idx
+                blocks[block_idx].append(char)
+            
+            for block_idx, block_chars in enumerate(blocks):
+                block_cells = [text.strip() for text, _ in _split_cells(block_chars)]
+                block_cells = [cell for cell in block_cells if cell]
+                if not block_cells:
+                    continue
+                
+                if TIME_PATTERN.match(block_cells[0]):
+                    time_val = block_cells[0]
+                    rest = block_cells[1:]
+                    score_val = ''
+                    if rest and SCORE_PATTERN.match(''.join(rest[0].split())):
+                        score_val = ''.join(rest[0].split())
+                        rest = rest[1:]
+                    # Même format que Camelot: action sans espaces ni retours à la ligne
+                    action_clean = ''.join(''.join(rest).split())
+                    if not action_clean:
+                        continue
+                    
+                    minutes = int(time_val.split(':')[0])
+                    actions.append({
+                        'period': 2 if minutes >= 30 else 1,
+                        'time': time_val,
+                        'score': score_val,
+                        'action': action_clean,
+                        '_block': block_idx,
+                    })
+                else:
+                    # Suite d'une action sur plusieurs lignes dans la même cellule
+                    for previous in reversed(actions):
+                        if previous['_block'] == block_idx:
+                            previous['action'] += ''.join(''.join(block_cells).split())
+                            break
+    
+    df = pd.DataFrame(actions)
+    if df.empty:
+        print("Section 'Déroulé du Match' non trouvée dans la couche texte")
+        return pd.DataFrame()
+    return df.drop(columns=['_block'])
+
+def _comparable_actions(df):
+    """Normalize an actions DataFrame into a list of tuples for extractor comparison"""
+    if df.empty:
+        return []
+    return [
+        (int(row['period']), str(row['time']).strip(),
+         ''.join(str(row['score']).split()), ''.join(str(row['action']).split()))
+        for _, row in df.iterrows()
+    ]
+
+def validate_action_extractors(pdf_paths):
+    """
+    Run both action extractors on each PDF and report differences and timings.
+    Returns True when the text-layer extractor matches Camelot on every sheet.
+    """
+    all_match = True
+    camelot_total = 0.0
+    text_total = 0.0
+    
+    for pdf_path in pdf_paths:
+        sections = locate_sections(pdf_path)
+        
+        start = time.perf_counter()
+        camelot_actions = _comparable_actions(extract_match_actions(pdf_path, sections['actions']))
+        camelot_elapsed = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        text_actions = _comparable_actions(extract_match_actions_text(pdf_path, sections['actions']))
+        text_elapsed = time.perf_counter() - start
+        
+        camelot_total += camelot_elapsed
+        text_total += text_elapsed
+        
+        if camelot_actions == text_actions:
+            print(f"✓ {pdf_path}: {len(text_actions)} actions identical "
+                  f"(camelot {camelot_elapsed:.2f}s, text {text_elapsed:.2f}s)")
+            continue
+        
+        all_match = False
+        print(f"✗ {pdf_path}: camelot {len(camelot_actions)} actions, text {len(text_actions)} actions")
+        mismatches = [
+            (i, c, t) for i, (c, t) in enumerate(zip(camelot_actions, text_actions)) if c != t
+        ]
+        for i, c, t in mismatches[:5]:
+            print(f"    #{i}: camelot={c}")
+            print(f"    #{i}: text   ={t}")
+    
+    print("\n" + "="*50)
+    print(f"{len(pdf_paths)} PDFs - camelot {camelot_total:.2f}s, text {text_total:.2f}s")
+    print("All extractors agree" if all_match else "Differences found between extractors")
+    return all_match
+
 def parse_action_details(action_str):
     """
     Parse une chaîne d'action pour extraire le type d'action, l'équipe et le joueur.
@@ -419,12 +740,31 @@ def parse_action_details(action_str):
         'player_name': player_name
     }
 
-def extract_match_info(pdf_path):
+ACTION_TIME_PATTERN = r'^\s*(\d{1,3})\s*:\s*(\d{2})\s*$'
+ACTION_SCORE_PATTERN = r'^\s*(\d+)\s*-\s*(\d+)\s*$'
+
+def add_action_clock(df_actions):
+    """
+    Add the integer columns derived from the time and score texts:
+    time_seconds (elapsed match time, "12:34" -> 754) and score_home / score_away
+    ("12-10" -> 12, 10). Unparsable values are left empty.
+    """
+    time_parts = df_actions['time'].astype(str).str.extract(ACTION_TIME_PATTERN).astype('Int64')
+    df_actions['time_seconds'] = time_parts[0] * 60 + time_parts[1]
+    
+    score_parts = df_actions['score'].astype(str).str.extract(ACTION_SCORE_PATTERN).astype('Int64')
+    df_actions['score_home'] = score_parts[0]
+    df_actions['score_away'] = score_parts[1]
+    return df_actions
+
+def extract_match_info(pdf_path, pages=None):
     """Extract match information including teams, scores, date, and league"""
     import re
     from datetime import datetime
     
-    tables = camelot.read_pdf(pdf_path, pages='all', flavor='lattice')
+    if pages is None:
+        pages = locate_sections(pdf_path)['info']
+    tables = read_tables(pdf_path, pages)
     df_raw = pd.concat([t.df for t in tables], ignore_index=True)
     
     # Find team names
@@ -519,8 +859,14 @@ def extract_match_info(pdf_path):
         'final_score_away': final_score_away
     }
 
-def create_match_in_db(match_info):
-    """Create league, teams and match in database, return match_id and team IDs"""
+def create_match_in_db(match_info, update=False, fingerprint=None):
+    """
+    Create league, teams and match in database, return match_id and team IDs.
+
+    When the match already exists, the import is aborted (all IDs None) unless
+    update is True, in which case the existing IDs are returned along with the
+    stored match row so the caller can apply a diff-based update.
+    """
     print("\n" + "="*50)
     print("Creating match in database...")
     
@@ -536,7 +882,7 @@ def create_match_in_db(match_info):
         if match_info.get('season'):
             query = query.eq("season", match_info['season'])
         
-        league_response = query.execute()
+        league_response = execute(query)
         
         if league_response.data:
             league_id = league_response.data[0]['id']
@@ -552,7 +898,7 @@ def create_match_in_db(match_info):
             if match_info.get('season'):
                 league_data['season'] = match_info['season']
             
-            league_response = supabase.table("leagues").insert(league_data).execute()
+            league_response = execute(supabase.table("leagues").insert(league_data))
             league_id = league_response.data[0]['id']
             
             # Build display info
@@ -561,41 +907,26 @@ def create_match_in_db(match_info):
             print(f"✓ League '{match_info['league_name']}'{group_info} created (ID: {league_id}){season_info}")
     
     # Get or create home team
-    home_team_response = supabase.table("teams").select("*").eq("name", match_info['home_team']).execute()
+    home_team_response = execute(supabase.table("teams").select("*").eq("name", match_info['home_team']))
     if home_team_response.data:
         home_team_id = home_team_response.data[0]['id']
         print(f"✓ Home team '{match_info['home_team']}' found (ID: {home_team_id})")
     else:
-        home_team_response = supabase.table("teams").insert({"name": match_info['home_team']}).execute()
+        home_team_response = execute(supabase.table("teams").insert({"name": match_info['home_team']}))
         home_team_id = home_team_response.data[0]['id']
         print(f"✓ Home team '{match_info['home_team']}' created (ID: {home_team_id})")
     
     # Get or create away team
-    away_team_response = supabase.table("teams").select("*").eq("name", match_info['away_team']).execute()
+    away_team_response = execute(supabase.table("teams").select("*").eq("name", match_info['away_team']))
     if away_team_response.data:
         away_team_id = away_team_response.data[0]['id']
         print(f"✓ Away team '{match_info['away_team']}' found (ID: {away_team_id})")
     else:
-        away_team_response = supabase.table("teams").insert({"name": match_info['away_team']}).execute()
+        away_team_response = execute(supabase.table("teams").insert({"name": match_info['away_team']}))
         away_team_id = away_team_response.data[0]['id']
         print(f"✓ Away team '{match_info['away_team']}' created (ID: {away_team_id})")
     
-    # Check if match already exists (same teams and date)
     match_date_str = str(match_info['match_date']) if match_info['match_date'] else None
-    existing_match = supabase.table("matches").select("*").eq("home_team_id", home_team_id).eq("away_team_id", away_team_id).eq("match_date", match_date_str).execute()
-    
-    if existing_match.data:
-        # Match already exists
-        match_id = existing_match.data[0]['id']
-        print(f"⚠️  Match already exists (ID: {match_id})")
-        print(f"  Date: {match_info['match_date']}")
-        print(f"  {match_info['home_team']} vs {match_info['away_team']}")
-        print(f"  Halftime: {existing_match.data[0]['ht_score_home']} - {existing_match.data[0]['ht_score_away']}")
-        print(f"  Final: {existing_match.data[0]['final_score_home']} - {existing_match.data[0]['final_score_away']}")
-        print(f"\n⛔ Aborting to prevent duplicate data. Delete the match first if you want to re-import.")
-        return None, None, None, None, None
-    
-    # Create match
     match_data = {
         "league_id": league_id,
         "home_team_id": home_team_id,
@@ -604,10 +935,43 @@ def create_match_in_db(match_info):
         "ht_score_home": match_info['ht_score_home'],
         "ht_score_away": match_info['ht_score_away'],
         "final_score_home": match_info['final_score_home'],
-        "final_score_away": match_info['final_score_away']
+        "final_score_away": match_info['final_score_away'],
+        "fingerprint": fingerprint
     }
     
-    match_response = supabase.table("matches").insert(match_data).execute()
+    # Check if match already exists (same teams and date)
+    existing_match = execute(supabase.table("matches").select("*").eq("home_team_id", home_team_id).eq("away_team_id", away_team_id).eq("match_date", match_date_str))
+    
+    if existing_match.data and update:
+        # Match already exists - le ré-import se fait par différences
+        existing = existing_match.data[0]
+        match_id = existing['id']
+        # L'empreinte n'est mise à jour qu'une fois les stats et actions synchronisées
+        changes = {
+            key: value for key, value in match_data.items()
+            if key != 'fingerprint' and existing.get(key) != value
+        }
+        if changes:
+            execute(supabase.table("matches").update(changes).eq("id", match_id))
+            print(f"✓ Match already exists (ID: {match_id}) - updated: {', '.join(changes)}")
+        else:
+            print(f"✓ Match already exists (ID: {match_id}) - match row unchanged")
+        return match_id, home_team_id, away_team_id, match_info['home_team'], match_info['away_team'], existing
+    
+    if existing_match.data:
+        # Match already exists
+        match_id = existing_match.data[0]['id']
+        print(f"⚠️  Match already exists (ID: {match_id})")
+        print(f"  Date: {match_info['match_date']}")
+        print(f"  {match_info['home_team']} vs {match_info['away_team']}")
+        print(f"  Halftime: {existing_match.data[0]['ht_score_home']} - {existing_match.data[0]['ht_score_away']}")
+        print(f"  Final: {existing_match.data[0]['final_score_home']} - {existing_match.data[0]['final_score_away']}")
+        print("\n⛔ Aborting to prevent duplicate data. Use --update to re-import it.")
+        return None, None, None, None, None, None
+    
+    # Create match - l'empreinte n'est enregistrée qu'une fois les stats et actions importées,
+    # un import interrompu reste ainsi réparable avec --update
+    match_response = execute(supabase.table("matches").insert({**match_data, "fingerprint": None}))
     match_id = match_response.data[0]['id']
     print(f"✓ Match created (ID: {match_id})")
     if match_info.get('league_name'):
@@ -617,15 +981,46 @@ def create_match_in_db(match_info):
     print(f"  Halftime: {match_info['ht_score_home']} - {match_info['ht_score_away']}")
     print(f"  Final: {match_info['final_score_home']} - {match_info['final_score_away']}")
     
-    return match_id, home_team_id, away_team_id, match_info['home_team'], match_info['away_team']
+    return match_id, home_team_id, away_team_id, match_info['home_team'], match_info['away_team'], None
 
-def upload_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_id, home_team_name, away_team_name):
-    """Upload match stats and actions to Supabase"""
-    print("\n" + "="*50)
-    print("Uploading data to Supabase...")
+# Clé d'identité d'un joueur : même normalisation que la fonction SQL player_name_key
+# (create_tables.sql), pour rapprocher "JUQUEL Loïc" (feuille) et "JUQUEL loic" (actions)
+PLAYER_KEY_ACCENTS = str.maketrans('àáâãäåçèéêëìíîïñòóôõöùúûüýÿ', 'aaaaaaceeeeiiiinooooouuuuyy')
+
+def normalize_player_name(name):
+    """Return the identity key of a player name (no accents, case, spaces or punctuation)"""
+    if not name:
+        return ''
+    return re.sub(r'[^a-z0-9]', '', str(name).lower().translate(PLAYER_KEY_ACCENTS))
+
+def resolve_player_ids(player_names_by_team):
+    """
+    Get or create the players rows of the given names, matched on their identity key.
+    One query per import for the existing players of both teams, one insert for the new ones.
+    Returns a dict {(team_id, name_key): player_id}.
+    """
+    team_ids = list(player_names_by_team)
+    if not team_ids:
+        return {}
     
-    # Upload match stats
-    print(f"Uploading {len(df_stats)} player records to 'player_stats' table...")
+    existing = execute(supabase.table("players").select("id,team_id,name_key").in_("team_id", team_ids)).data or []
+    player_ids = {(row['team_id'], row['name_key']): row['id'] for row in existing}
+    
+    new_players = {}
+    for team_id, names in player_names_by_team.items():
+        for name in names:
+            name_key = normalize_player_name(name)
+            if name_key and (team_id, name_key) not in player_ids:
+                new_players.setdefault((team_id, name_key), {"name": name, "name_key": name_key, "team_id": team_id})
+    
+    if new_players:
+        created = execute(supabase.table("players").insert(list(new_players.values()))).data
+        player_ids.update({(row['team_id'], row['name_key']): row['id'] for row in created})
+    
+    return player_ids
+
+def prepare_stats_records(df_stats, match_id, home_team_id, away_team_id, home_team_name, away_team_name):
+    """Build player_stats rows (match/team/player IDs resolved) from the extracted stats"""
     stats_records = df_stats.to_dict('records')
     
     # Add match_id and team_id to each record
@@ -650,97 +1045,464 @@ def upload_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_i
         # Rename 'team' to 'team_name' to match schema
         record['team_name'] = record.pop('team')
         
-        # Get or create player record (only for non-officials)
+        if record.get('player_number') is not None:
+            record['player_number'] = int(record['player_number'])
+    
+    # Get or create player records (only for non-officials), by identity key
+    player_names_by_team = {}
+    for record in stats_records:
+        if not record.get('is_official', False) and record['team_id'] is not None:
+            player_names_by_team.setdefault(record['team_id'], []).append(record['player_name'])
+    player_ids = resolve_player_ids(player_names_by_team)
+    
+    # Add player_id to each record
+    for record in stats_records:
         player_id = None
         if not record.get('is_official', False) and record['team_id'] is not None:
-            player_name = record['player_name']
-            
-            # Check if player already exists
-            existing_player = supabase.table("players").select("*").eq("name", player_name).eq("team_id", record['team_id']).execute()
-            
-            if existing_player.data:
-                player_id = existing_player.data[0]['id']
-            else:
-                # Create new player
-                player_data = {
-                    "name": player_name,
-                    "team_id": record['team_id']
-                }
-                new_player = supabase.table("players").insert(player_data).execute()
-                player_id = new_player.data[0]['id']
-        
-        # Add player_id to the record
+            player_id = player_ids.get((record['team_id'], normalize_player_name(record['player_name'])))
         record['player_id'] = player_id
     
+    return stats_records
+
+def prepare_action_records(df_actions, match_id, stats_records, home_team_id, away_team_id):
+    """
+    Build actions rows from the extracted and parsed actions.
+    The player of each action is resolved to the player_id of the match's player_stats
+    row with the same team and shirt number, or else the same name key.
+    """
+    actions_records = df_actions.to_dict('records')
+    
+    # Index des joueurs du match : (équipe, numéro) puis (équipe, clé du nom)
+    players_by_number = {}
+    players_by_key = {}
+    for record in stats_records:
+        if record.get('player_id') is None:
+            continue
+        if record.get('player_number') is not None:
+            players_by_number[(record['team_id'], record['player_number'])] = record['player_id']
+        players_by_key[(record['team_id'], normalize_player_name(record['player_name']))] = record['player_id']
+    team_ids = {'Home': home_team_id, 'Away': away_team_id}
+    
+    # Add match_id to each record and convert NaN to None for JSON serialization
+    for record in actions_records:
+        # Add match_id
+        record['match_id'] = match_id
+        
+        # Convert NaN to None for JSON serialization
+        for key, value in record.items():
+            if pd.isna(value):
+                record[key] = None
+        
+        team_id = team_ids.get(record.get('team'))
+        player_number = record.get('player_number')
+        player_id = None
+        if team_id is not None and player_number is not None and str(player_number).isdigit():
+            player_id = players_by_number.get((team_id, int(player_number)))
+        if player_id is None and team_id is not None and record.get('player_name'):
+            player_id = players_by_key.get((team_id, normalize_player_name(record['player_name'])))
+        record['player_id'] = player_id
+    
+    return actions_records
+
+# Actions comptées par tranche de 5 minutes pour les cartes de chaleur du dashboard
+BUCKET_SECONDS = 5 * 60
+BUCKET_ACTION_TYPES = ('Goal', 'Goal_7m', 'Shot', 'Save', 'Suspension_2min')
+
+def action_bucket_records(df_actions, actions_records, match_id, home_team_id, away_team_id):
+    """
+    Count the actions of a match per team, player, action type and 5-minute interval.
+    Players are keyed by the player_id of their actions rows (prepare_action_records);
+    the name is kept only for the actions without player_id.
+    """
+    if df_actions.empty or 'time_seconds' not in df_actions.columns:
+        return []
+    
+    counted = df_actions[
+        df_actions['action_type'].isin(BUCKET_ACTION_TYPES) &
+        df_actions['team'].isin(['Home', 'Away']) &
+        df_actions['time_seconds'].notna()
+    ]
+    if counted.empty:
+        return []
+    
+    # La dernière seconde (60:00) appartient à la dernière tranche
+    time_seconds = counted['time_seconds'].astype(int)
+    player_ids = pd.Series([record['player_id'] for record in actions_records], index=df_actions.index, dtype='Int64')[counted.index]
+    buckets = pd.DataFrame({
+        'team_id': counted['team'].map({'Home': home_team_id, 'Away': away_team_id}),
+        'player_id': player_ids,
+        # Orthographes d'un même joueur comptées ensemble : nom gardé sans player_id
+        'player_name': counted['player_name'].fillna('').where(player_ids.isna(), ''),
+        'action_type': counted['action_type'],
+        'bucket': (time_seconds.where(time_seconds != 3600, 3599) // BUCKET_SECONDS),
+    })
+    counts = buckets.groupby(['team_id', 'player_id', 'player_name', 'action_type', 'bucket'], dropna=False).size().reset_index(name='count')
+    
+    records = counts.to_dict('records')
+    for record in records:
+        record['match_id'] = match_id
+        record['player_id'] = None if pd.isna(record['player_id']) else int(record['player_id'])
+        record['player_name'] = record['player_name'] or None
+    return records
+
+def write_action_buckets(df_actions, actions_records, match_id, home_team_id, away_team_id):
+    """Replace the interval counts of a match (only this match is recomputed)"""
+    records = action_bucket_records(df_actions, actions_records, match_id, home_team_id, away_team_id)
     try:
-        response_stats = supabase.table("player_stats").insert(stats_records).execute()
-        print(f"✓ Successfully uploaded {len(stats_records)} player records")
+        execute(supabase.table("action_buckets").delete().eq("match_id", match_id))
+        if records:
+            execute(supabase.table("action_buckets").insert(records))
+        print(f"✓ action_buckets: {len(records)} interval counts")
     except Exception as e:
-        print(f"✗ Error uploading player stats: {e}")
+        print(f"⚠️  Could not write action_buckets (run src/sql/migrations/004_action_buckets.sql): {e}")
+
+# PostgREST renvoie au plus 1000 lignes par requête
+SUPABASE_PAGE_SIZE = 1000
+
+def fetch_pages(build_query):
+    """
+    Yield all the rows of a query, one page of SUPABASE_PAGE_SIZE rows per request
+    (same paging as query_to_dataframe in src/database.py).
+    build_query returns a fresh, ordered query for each page.
+    """
+    offset = 0
+    while True:
+        rows = execute(build_query().range(offset, offset + SUPABASE_PAGE_SIZE - 1)).data or []
+        yield from rows
+        if len(rows) < SUPABASE_PAGE_SIZE:
+            return
+        offset += SUPABASE_PAGE_SIZE
+
+def filter_league(query, league_id):
+    """Restrict a query to the rows of one league (matches without league have a NULL league_id)"""
+    if league_id is None:
+        return query.is_("league_id", "null")
+    return query.eq("league_id", league_id)
+
+# Face-à-face : bilan de chaque paire d'équipes (team_a_id < team_b_id) par ligue
+HEAD_TO_HEAD_LAST_MEETINGS = 5
+
+def head_to_head_record(pair_matches, league_id, team_a_id, team_b_id):
+    """Aggregate the scored matches between two teams into a head_to_head row (None if none is scored)"""
+    scored = [
+        match for match in pair_matches
+        if match['final_score_home'] is not None and match['final_score_away'] is not None
+    ]
+    if not scored:
+        return None
     
-    # Upload match actions (if any)
-    if not df_actions.empty:
-        print(f"\nUploading {len(df_actions)} action records to 'actions' table...")
-        actions_records = df_actions.to_dict('records')
-        
-        # Add match_id to each record and convert NaN to None
-        for record in actions_records:
-            # Add match_id
-            record['match_id'] = match_id
+    record = {
+        'league_id': league_id, 'team_a_id': team_a_id, 'team_b_id': team_b_id,
+        'matches': len(scored), 'team_a_wins': 0, 'draws': 0, 'team_b_wins': 0,
+        'team_a_goals': 0, 'team_b_goals': 0,
+    }
+    for match in scored:
+        if match['home_team_id'] == team_a_id:
+            team_a_goals, team_b_goals = match['final_score_home'], match['final_score_away']
+        else:
+            team_a_goals, team_b_goals = match['final_score_away'], match['final_score_home']
+        record['team_a_goals'] += team_a_goals
+        record['team_b_goals'] += team_b_goals
+        if team_a_goals > team_b_goals:
+            record['team_a_wins'] += 1
+        elif team_a_goals == team_b_goals:
+            record['draws'] += 1
+        else:
+            record['team_b_wins'] += 1
+    
+    # Rencontres les plus récentes en premier (matchs sans date en dernier)
+    recent = sorted(scored, key=lambda match: (match['match_date'] or '', match['id']), reverse=True)
+    record['last_match_date'] = max((match['match_date'] for match in scored if match['match_date']), default=None)
+    record['last_match_ids'] = [match['id'] for match in recent[:HEAD_TO_HEAD_LAST_MEETINGS]]
+    return record
+
+def update_head_to_head(match_id):
+    """Rewrite the head-to-head row of the two teams of a match (only this pair is recomputed)"""
+    try:
+        with profiler.stage('head_to_head'):
+            match = execute(supabase.table("matches").select("league_id,home_team_id,away_team_id").eq("id", match_id)).data[0]
+            team_a_id, team_b_id = sorted((match['home_team_id'], match['away_team_id']))
             
-            # Convert NaN to None for JSON serialization
-            for key, value in record.items():
-                if pd.isna(value):
-                    record[key] = None
+            pair_matches = execute(filter_league(
+                supabase.table("matches")
+                .select("id,home_team_id,away_team_id,match_date,final_score_home,final_score_away")
+                .in_("home_team_id", [team_a_id, team_b_id])
+                .in_("away_team_id", [team_a_id, team_b_id]),
+                match['league_id']
+            )).data or []
+            record = head_to_head_record(pair_matches, match['league_id'], team_a_id, team_b_id)
+            
+            execute(filter_league(
+                supabase.table("head_to_head").delete().eq("team_a_id", team_a_id).eq("team_b_id", team_b_id),
+                match['league_id']
+            ))
+            if record:
+                execute(supabase.table("head_to_head").insert(record))
+        print(f"✓ head_to_head: {record['matches'] if record else 0} meetings between teams {team_a_id} and {team_b_id}")
+    except Exception as e:
+        print(f"⚠️  Could not update head_to_head (run src/sql/migrations/006_head_to_head.sql): {e}")
+
+# Cote Elo des équipes : une ligne par équipe et match, rejouée par ligue à partir
+# de la date de chaque match importé
+ELO_INITIAL_RATING = 1500
+ELO_K = 20
+ELO_HOME_ADVANTAGE = 50
+
+def elo_update(home_rating, away_rating, home_goals, away_goals):
+    """
+    New (home, away) ratings after a match.
+    The change is weighted by the goal margin (log of the margin, damped when the
+    favourite wins so strong teams do not inflate their rating on easy wins).
+    """
+    home_strength = home_rating + ELO_HOME_ADVANTAGE
+    expected_home = 1 / (1 + 10 ** ((away_rating - home_strength) / 400))
+    
+    goal_diff = home_goals - away_goals
+    if goal_diff == 0:
+        score_home, margin_weight = 0.5, 1.0
+    else:
+        score_home = 1.0 if goal_diff > 0 else 0.0
+        winner_advantage = (home_strength - away_rating) if goal_diff > 0 else (away_rating - home_strength)
+        margin_weight = math.log(abs(goal_diff) + 1) * 2.2 / (winner_advantage * 0.001 + 2.2)
+    
+    change = ELO_K * margin_weight * (score_home - expected_home)
+    return home_rating + change, away_rating - change
+
+def team_rating_records(league_matches, start_ratings, league_id):
+    """
+    Replay scored, dated matches (any order) from the ratings of their teams
+    before the first one (start_ratings: team_id -> rating, new teams start at
+    ELO_INITIAL_RATING) and return the team_ratings rows.
+    """
+    ratings = dict(start_ratings)
+    records = []
+    for match in sorted(league_matches, key=lambda match: (match['match_date'], match['id'])):
+        home_team_id, away_team_id = match['home_team_id'], match['away_team_id']
+        home_before = ratings.get(home_team_id, ELO_INITIAL_RATING)
+        away_before = ratings.get(away_team_id, ELO_INITIAL_RATING)
+        home_after, away_after = elo_update(home_before, away_before, match['final_score_home'], match['final_score_away'])
+        ratings[home_team_id], ratings[away_team_id] = home_after, away_after
         
+        for team_id, before, after in ((home_team_id, home_before, home_after), (away_team_id, away_before, away_after)):
+            records.append({
+                'league_id': league_id, 'team_id': team_id, 'match_id': match['id'],
+                'match_date': match['match_date'], 'rating_before': before, 'rating': after,
+            })
+    return records
+
+def update_team_ratings(match_id):
+    """
+    Update the Elo ratings of the league of a match.
+    Only the matches played from its date on are replayed, starting from the
+    ratings stored before that date: a match imported in date order computes
+    one match, a late import of an older match replays what follows it.
+    """
+    try:
+        with profiler.stage('team_ratings'):
+            match = execute(supabase.table("matches").select("league_id,match_date").eq("id", match_id)).data[0]
+            if not match['match_date']:
+                print("⚠️  Match without date - Elo ratings not updated")
+                return
+            league_id = match['league_id']
+            
+            # Match réimporté avec une autre date : rejouer aussi depuis l'ancienne date
+            previous = execute(supabase.table("team_ratings").select("match_date").eq("match_id", match_id).limit(1)).data or []
+            replay_from = min([match['match_date']] + [row['match_date'] for row in previous])
+            
+            replayed = [
+                row for row in fetch_pages(lambda: filter_league(
+                    supabase.table("matches")
+                    .select("id,home_team_id,away_team_id,match_date,final_score_home,final_score_away")
+                    .gte("match_date", replay_from),
+                    league_id
+                ).order("match_date").order("id"))
+                if row['final_score_home'] is not None and row['final_score_away'] is not None
+            ]
+            
+            # Dernière cote de chaque équipe rejouée avant la date de reprise (plus récentes d'abord)
+            team_ids = sorted({row[column] for row in replayed for column in ('home_team_id', 'away_team_id')})
+            start_ratings = {}
+            if team_ids:
+                for row in fetch_pages(lambda: filter_league(
+                    supabase.table("team_ratings").select("team_id,rating")
+                    .in_("team_id", team_ids).lt("match_date", replay_from),
+                    league_id
+                ).order("match_date", desc=True).order("match_id", desc=True)):
+                    start_ratings.setdefault(row['team_id'], row['rating'])
+                    if len(start_ratings) == len(team_ids):
+                        break
+            
+            records = team_rating_records(replayed, start_ratings, league_id)
+            
+            execute(filter_league(supabase.table("team_ratings").delete().gte("match_date", replay_from), league_id))
+            if records:
+                execute(supabase.table("team_ratings").insert(records))
+        print(f"✓ team_ratings: {len(replayed)} matches replayed from {replay_from}")
+    except Exception as e:
+        print(f"⚠️  Could not update team_ratings (run src/sql/migrations/007_team_ratings.sql): {e}")
+
+def upload_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_id, home_team_name, away_team_name, fingerprint):
+    """
+    Upload match stats and actions to Supabase.
+    Returns True when every row was uploaded; the fingerprint of the sheet is
+    only stored on the match in that case, so a failed upload is not taken for
+    an unchanged sheet by a later --update.
+    """
+    print("\n" + "="*50)
+    print("Uploading data to Supabase...")
+    
+    # Upload match stats
+    print(f"Uploading {len(df_stats)} player records to 'player_stats' table...")
+    with profiler.stage('resolve_players'):
+        stats_records = prepare_stats_records(df_stats, match_id, home_team_id, away_team_id, home_team_name, away_team_name)
+    
+    with profiler.stage('upload'):
         try:
-            response_actions = supabase.table("actions").insert(actions_records).execute()
-            print(f"✓ Successfully uploaded {len(actions_records)} action records")
+            execute(supabase.table("player_stats").insert(stats_records))
+            print(f"✓ Successfully uploaded {len(stats_records)} player records")
         except Exception as e:
-            print(f"✗ Error uploading actions: {e}")
-    else:
-        print("\n⚠️  No actions to upload (actions section not found in PDF)")
+            print(f"✗ Error uploading player stats: {e}")
+            return False
+        
+        # Upload match actions (if any)
+        actions_records = []
+        if not df_actions.empty:
+            print(f"\nUploading {len(df_actions)} action records to 'actions' table...")
+            actions_records = prepare_action_records(df_actions, match_id, stats_records, home_team_id, away_team_id)
+            
+            try:
+                execute(supabase.table("actions").insert(actions_records))
+                print(f"✓ Successfully uploaded {len(actions_records)} action records")
+            except Exception as e:
+                print(f"✗ Error uploading actions: {e}")
+                return False
+        else:
+            print("\n⚠️  No actions to upload (actions section not found in PDF)")
+        
+        write_action_buckets(df_actions, actions_records, match_id, home_team_id, away_team_id)
+        
+        execute(supabase.table("matches").update({"fingerprint": fingerprint}).eq("id", match_id))
     
     print("\n" + "="*50)
     print("Upload complete!")
+    return True
 
-# Main execution
-if __name__ == "__main__":
-    # Check for command-line argument
-    if len(sys.argv) > 1:
-        pdf_input = sys.argv[1]
+def fingerprint_match(match_info, df_stats, df_actions):
+    """Return a SHA-256 fingerprint of everything parsed from a match sheet"""
+    def records(df):
+        if df.empty:
+            return []
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+    
+    payload = {
+        'match': match_info,
+        'stats': records(df_stats),
+        'actions': records(df_actions),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+# Colonnes identifiant une ligne (clé) et colonnes comparées lors d'un ré-import
+STATS_KEY = ('team_name', 'player_name', 'is_official')
+STATS_FIELDS = ('team_id', 'player_id', 'player_number', 'is_captain', 'goals', 'shots', 'goals_7m',
+                'yellow_cards', 'two_minutes', 'red_cards', 'blue_cards', 'saves')
+ACTIONS_KEY = ('period', 'time', 'action')
+ACTIONS_FIELDS = ('score', 'action_type', 'team', 'player_number', 'player_name', 'player_id',
+                  'time_seconds', 'score_home', 'score_away')
+
+def _keyed_rows(rows, key_columns):
+    """Index rows by key; repeated keys get an occurrence number so duplicates stay distinct"""
+    keyed = {}
+    for row in rows:
+        base_key = tuple(row.get(col) for col in key_columns)
+        occurrence = 0
+        while (base_key, occurrence) in keyed:
+            occurrence += 1
+        keyed[(base_key, occurrence)] = row
+    return keyed
+
+def sync_table_rows(table_name, match_id, new_records, key_columns, compared_fields):
+    """
+    Bring the rows of a match in table_name in line with new_records, writing only
+    the differences: changed rows are updated, new rows inserted, missing rows deleted.
+    Returns a dict with the number of inserted, updated and deleted rows.
+    """
+    existing = execute(supabase.table(table_name).select("*").eq("match_id", match_id)).data or []
+    existing_by_key = _keyed_rows(existing, key_columns)
+    new_by_key = _keyed_rows(new_records, key_columns)
+    
+    to_insert = [record for key, record in new_by_key.items() if key not in existing_by_key]
+    to_delete = [row['id'] for key, row in existing_by_key.items() if key not in new_by_key]
+    updated = 0
+    
+    for key, record in new_by_key.items():
+        row = existing_by_key.get(key)
+        if row is None:
+            continue
+        changes = {field: record.get(field) for field in compared_fields if row.get(field) != record.get(field)}
+        if changes:
+            execute(supabase.table(table_name).update(changes).eq("id", row['id']))
+            updated += 1
+    
+    if to_insert:
+        execute(supabase.table(table_name).insert(to_insert))
+    if to_delete:
+        execute(supabase.table(table_name).delete().in_("id", to_delete))
+    
+    counts = {'inserted': len(to_insert), 'updated': updated, 'deleted': len(to_delete)}
+    print(f"✓ {table_name}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['deleted']} deleted")
+    return counts
+
+def sync_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_id, home_team_name, away_team_name, fingerprint):
+    """Diff-based re-import of an existing match: only changed player_stats/actions rows are written"""
+    print("\n" + "="*50)
+    print("Syncing data with Supabase...")
+    
+    with profiler.stage('resolve_players'):
+        stats_records = prepare_stats_records(df_stats, match_id, home_team_id, away_team_id, home_team_name, away_team_name)
+    
+    with profiler.stage('upload'):
+        sync_table_rows("player_stats", match_id, stats_records, STATS_KEY, STATS_FIELDS)
         
-        # Check if input is a URL
-        if pdf_input.startswith('http://') or pdf_input.startswith('https://'):
-            print("="*50)
-            print(f"Processing PDF from URL: {pdf_input}")
-            print("="*50)
-            pdf_path = download_pdf(pdf_input)
-            
-            if pdf_path is None:
-                print("Failed to download PDF. Exiting.")
-                exit(1)
-        else:
-            # Assume it's a local file path
-            pdf_path = pdf_input
-            if not os.path.exists(pdf_path):
-                print(f"Error: File '{pdf_path}' not found.")
-                exit(1)
-    else:
-        # Default to match.pdf
-        pdf_path = "match.pdf"
-        if not os.path.exists(pdf_path):
-            print("Error: No PDF specified and default 'match.pdf' not found.")
-            print("\nUsage:")
-            print("  python read-match.py <pdf_url_or_path>")
-            print("\nExample:")
-            print("  python read-match.py https://media-ffhb-fdm.ffhandball.fr/fdm/V/A/G/A/VAGAHYB.pdf")
-            exit(1)
+        actions_records = prepare_action_records(df_actions, match_id, stats_records, home_team_id, away_team_id) if not df_actions.empty else []
+        sync_table_rows("actions", match_id, actions_records, ACTIONS_KEY, ACTIONS_FIELDS)
+        write_action_buckets(df_actions, actions_records, match_id, home_team_id, away_team_id)
+        
+        # Enregistrer l'empreinte seulement une fois les données à jour
+        execute(supabase.table("matches").update({"fingerprint": fingerprint}).eq("id", match_id))
     
+    print("\n" + "="*50)
+    print("Sync complete!")
+
+def refresh_season_stats(match_id):
+    """
+    Recompute the season aggregates read by the dashboard (src/sql/create_views.sql)
+    for the league of a match only; the other leagues are left untouched.
+    A failure (e.g. aggregates not created yet) is reported without failing the import.
+    """
+    try:
+        with profiler.stage('refresh_views'):
+            league_id = execute(supabase.table("matches").select("league_id").eq("id", match_id)).data[0]['league_id']
+            execute(supabase.rpc('refresh_league_season_stats', {'p_league_id': league_id}))
+        print("✓ Season statistics refreshed for the league of the match")
+    except Exception as e:
+        print(f"⚠️  Could not refresh season statistics (run src/sql/create_views.sql, import with the service_role key): {e}")
+
+def process_match(pdf_path, actions_extractor="camelot", export_csv=True, update=False):
+    """
+    Run the full import of one match sheet: extraction, match creation and upload.
+    Returns 'imported', or 'duplicate' when the match already exists in the database.
+    With update=True an existing match is re-imported by differences instead and
+    'updated' or 'unchanged' is returned. 'failed' is returned when the upload of
+    a new match failed (the match is left without fingerprint, --update repairs it).
+    """
     # Step 1: Extract match information
     print("\n" + "="*50)
     print("STEP 1: Extracting match information...")
-    match_info = extract_match_info(pdf_path)
+    with profiler.stage('locate_sections'):
+        sections = locate_sections(pdf_path)
+    print(f"Pages - info: {sections['info']}, actions: {sections['actions']}")
+    with profiler.stage('extract_info'):
+        match_info = extract_match_info(pdf_path, sections['info'])
     if match_info.get('league_name'):
         print(f"League: {match_info['league_name']}")
         if match_info.get('league_group_name'):
@@ -753,30 +1515,26 @@ if __name__ == "__main__":
     print(f"Halftime Score: {match_info['ht_score_home']} - {match_info['ht_score_away']}")
     print(f"Final Score: {match_info['final_score_home']} - {match_info['final_score_away']}")
     
-    # Step 2: Create match in database
-    match_id, home_team_id, away_team_id, home_team_name, away_team_name = create_match_in_db(match_info)
-    
-    # Check if match creation was aborted due to duplicate
-    if match_id is None:
-        print("\n" + "="*50)
-        print("Script aborted - match already exists in database")
-        print("="*50)
-        exit(0)
-    
-    # Step 3: Extract match stats
+    # Step 2: Extract match stats
     print("\n" + "="*50)
-    print("STEP 3: Extracting player statistics...")
-    df_stats = extract_match_stats(pdf_path)
+    print("STEP 2: Extracting player statistics...")
+    with profiler.stage('extract_stats'):
+        df_stats = extract_match_stats(pdf_path, sections['info'])
     print(df_stats)
     
     # Export to CSV
-    df_stats.to_csv("match_stats.csv", index=False)
-    print(f"\nData exported to match_stats.csv - {len(df_stats)} players found")
+    if export_csv:
+        df_stats.to_csv("match_stats.csv", index=False)
+        print(f"\nData exported to match_stats.csv - {len(df_stats)} players found")
     
-    # Step 4: Extract and export match actions
+    # Step 3: Extract and export match actions
     print("\n" + "="*50)
-    print("STEP 4: Extracting match actions...")
-    df_actions = extract_match_actions(pdf_path)
+    print("STEP 3: Extracting match actions...")
+    with profiler.stage('extract_actions'):
+        if actions_extractor == "text":
+            df_actions = extract_match_actions_text(pdf_path, sections['actions'])
+        else:
+            df_actions = extract_match_actions(pdf_path, sections['actions'])
     
     # Check if actions were found
     if df_actions.empty or 'action' not in df_actions.columns:
@@ -786,23 +1544,367 @@ if __name__ == "__main__":
     else:
         # Parse action details
         print("Parsing action details...")
-        action_details = df_actions['action'].apply(parse_action_details)
-        df_actions['action_type'] = action_details.apply(lambda x: x['action_type'])
-        df_actions['team'] = action_details.apply(lambda x: x['team'])
-        df_actions['player_number'] = action_details.apply(lambda x: x['player_number'])
-        df_actions['player_name'] = action_details.apply(lambda x: x['player_name'])
+        with profiler.stage('parse_actions'):
+            action_details = df_actions['action'].apply(parse_action_details)
+            df_actions['action_type'] = action_details.apply(lambda x: x['action_type'])
+            df_actions['team'] = action_details.apply(lambda x: x['team'])
+            df_actions['player_number'] = action_details.apply(lambda x: x['player_number'])
+            df_actions['player_name'] = action_details.apply(lambda x: x['player_name'])
+            df_actions = add_action_clock(df_actions)
         
         print(df_actions.head(20))
-        df_actions.to_csv("match_actions.csv", index=False)
-        print(f"\nActions exported to match_actions.csv - {len(df_actions)} actions found")
+        if export_csv:
+            df_actions.to_csv("match_actions.csv", index=False)
+            print(f"\nActions exported to match_actions.csv - {len(df_actions)} actions found")
+    
+    # Step 4: Create match in database
+    profiler.annotate(
+        match_date=str(match_info['match_date']),
+        home_team=match_info['home_team'],
+        away_team=match_info['away_team'],
+        player_rows=len(df_stats),
+        action_rows=len(df_actions),
+    )
+    fingerprint = fingerprint_match(match_info, df_stats, df_actions)
+    with profiler.stage('create_match'):
+        match_id, home_team_id, away_team_id, home_team_name, away_team_name, existing_match = create_match_in_db(
+            match_info, update=update, fingerprint=fingerprint
+        )
+    profiler.annotate(match_id=match_id)
     
-    # Step 5: Upload to Supabase
+    # Check if match creation was aborted due to duplicate
+    if match_id is None:
+        print("\n" + "="*50)
+        print("Import aborted - match already exists in database")
+        print("="*50)
+        return 'duplicate'
+    
+    # Step 5: Upload to Supabase (ou synchronisation si le match existe déjà)
     print("\n" + "="*50)
+    if existing_match is not None:
+        if existing_match.get('fingerprint') == fingerprint:
+            print("STEP 5: Match sheet unchanged since last import - nothing to upload")
+            return 'unchanged'
+        print("STEP 5: Syncing changes with Supabase...")
+        sync_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_id, home_team_name, away_team_name, fingerprint)
+        update_head_to_head(match_id)
+        update_team_ratings(match_id)
+        refresh_season_stats(match_id)
+        return 'updated'
+    
     print("STEP 5: Uploading to Supabase...")
-    upload_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_id, home_team_name, away_team_name)
+    if not upload_to_supabase(df_stats, df_actions, match_id, home_team_id, away_team_id, home_team_name, away_team_name, fingerprint):
+        print("\n⛔ Upload incomplete - run the import again with --update to repair this match")
+        return 'failed'
+    update_head_to_head(match_id)
+    update_team_ratings(match_id)
+    refresh_season_stats(match_id)
+    
+    return 'imported'
+
+def run_profiled_import(pdf_path, source, profile_log=None, cprofile_dir=None, **import_options):
+    """
+    Run process_match and emit its profile (per-stage wall/CPU time, Supabase
+    round trips) as one JSON line appended to profile_log. With cprofile_dir,
+    a cProfile dump of the import is also written per match.
+    The caller resets the profiler beforehand so a download stage is included.
+    """
+    status = 'failed'
+    cprofile_path = None
+    cprofiler = cProfile.Profile() if cprofile_dir else None
+    try:
+        if cprofiler:
+            cprofiler.enable()
+        status = process_match(pdf_path, **import_options)
+        return status
+    finally:
+        if cprofiler:
+            cprofiler.disable()
+            os.makedirs(cprofile_dir, exist_ok=True)
+            name = os.path.splitext(os.path.basename(pdf_path))[0]
+            cprofile_path = os.path.join(cprofile_dir, f"{name}-{int(time.time())}.prof")
+            cprofiler.dump_stats(cprofile_path)
+        
+        record = profiler.to_record(source=source, status=status, cprofile=cprofile_path)
+        slowest = max(record['stages'].items(), key=lambda item: item[1]['wall_seconds'], default=None)
+        print(f"\n⏱️  {record['wall_seconds']:.2f}s wall / {record['cpu_seconds']:.2f}s CPU, "
+              f"{record['round_trips']} Supabase round trips"
+              + (f" - slowest stage: {slowest[0]} ({slowest[1]['wall_seconds']:.2f}s)" if slowest else ""))
+        if profile_log:
+            with open(profile_log, 'a') as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+class IngestionStats:
+    """Throughput and latency counters for the ingestion daemon"""
+    
+    def __init__(self, stats_path=None):
+        self.stats_path = stats_path
+        self.started_at = time.time()
+        self.counts = {'imported': 0, 'updated': 0, 'unchanged': 0, 'duplicate': 0, 'failed': 0}
+        self.total_processing = 0.0
+        self.max_processing = 0.0
+        self.last_processing = None
+        self.total_latency = 0.0
+    
+    def record(self, status, processing_seconds, latency_seconds):
+        """Record one processed sheet (latency = time from detection to end of upload)"""
+        self.counts[status] += 1
+        self.total_processing += processing_seconds
+        self.max_processing = max(self.max_processing, processing_seconds)
+        self.last_processing = processing_seconds
+        self.total_latency += latency_seconds
+        self.write()
+    
+    def snapshot(self):
+        processed = sum(self.counts.values())
+        uptime = time.time() - self.started_at
+        return {
+            'uptime_seconds': round(uptime, 1),
+            'processed': processed,
+            **self.counts,
+            'throughput_per_minute': round(processed / uptime * 60, 2) if uptime > 0 else 0,
+            'avg_processing_seconds': round(self.total_processing / processed, 2) if processed else None,
+            'max_processing_seconds': round(self.max_processing, 2),
+            'last_processing_seconds': round(self.last_processing, 2) if self.last_processing is not None else None,
+            'avg_latency_seconds': round(self.total_latency / processed, 2) if processed else None,
+        }
+    
+    def write(self):
+        snapshot = self.snapshot()
+        print(f"📈 {snapshot['processed']} sheets ({snapshot['imported']} imported, "
+              f"{snapshot['updated']} updated, {snapshot['unchanged']} unchanged, "
+              f"{snapshot['duplicate']} duplicates, {snapshot['failed']} failed) - "
+              f"avg {snapshot['avg_processing_seconds']}s, {snapshot['throughput_per_minute']}/min")
+        if self.stats_path:
+            with open(self.stats_path, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+
+def _read_queue(queue_file, offset):
+    """Return the complete lines appended to the queue file since offset, and the new offset"""
+    if not os.path.exists(queue_file):
+        return [], offset
+    with open(queue_file, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    # Ne consommer que les lignes terminées (la dernière peut être en cours d'écriture)
+    end = data.rfind(b'\n') + 1
+    lines = [line.strip() for line in data[:end].decode('utf-8').splitlines()]
+    return [line for line in lines if line and not line.startswith('#')], offset + end
+
+def unique_target_path(target_dir, name):
+    """
+    Path of name in target_dir, suffixed with the current time (and a counter)
+    when a file of that name is already there, so earlier sheets are kept.
+    """
+    path = os.path.join(target_dir, name)
+    if not os.path.exists(path):
+        return path
+    stem, extension = os.path.splitext(name)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(target_dir, f"{stem}_{stamp}{extension}")
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(target_dir, f"{stem}_{stamp}_{counter}{extension}")
+        counter += 1
+    return path
+
+def run_ingestion_daemon(watch_dir=None, queue_file=None, poll_interval=2.0,
+                         actions_extractor="camelot", stats_path=None, update=False,
+                         profile_log=None, cprofile_dir=None):
+    """
+    Long-running ingestion loop keeping camelot, pandas and the Supabase client warm.
+
+    - watch_dir: new PDFs dropped in the folder are imported once their size is
+      stable, then moved to processed/ or failed/
+    - queue_file: each line appended (URL or local path) is imported; the read
+      offset is kept in <queue_file>.offset so restarts resume where they stopped
+    """
+    stats = IngestionStats(stats_path)
+    
+    if watch_dir:
+        for sub_dir in ('processed', 'failed'):
+            os.makedirs(os.path.join(watch_dir, sub_dir), exist_ok=True)
+    
+    queue_offset = 0
+    offset_path = f"{queue_file}.offset" if queue_file else None
+    if offset_path and os.path.exists(offset_path):
+        with open(offset_path) as f:
+            queue_offset = int(f.read().strip() or 0)
+    
+    # Fichiers vus: chemin -> (taille, instant de détection)
+    pending = {}
+    # Fichiers importés mais impossibles à déplacer: ignorés tant qu'ils sont là
+    unmovable = set()
+    temp_dir = tempfile.mkdtemp(prefix="read-match-")
+    
+    print(f"👀 Watching {watch_dir or '-'} / queue {queue_file or '-'} (poll every {poll_interval}s, Ctrl+C to stop)")
+    
+    def ingest(source, detected_at):
+        profiler.reset()
+        start = time.perf_counter()
+        try:
+            pdf_path = source
+            if source.startswith(('http://', 'https://')):
+                with profiler.stage('download'):
+                    pdf_path = download_pdf(source, os.path.join(temp_dir, "queued_match.pdf"))
+                if pdf_path is None:
+                    raise ValueError("download failed")
+            elif not os.path.exists(source):
+                raise FileNotFoundError(source)
+            status = run_profiled_import(
+                pdf_path, source, profile_log, cprofile_dir,
+                actions_extractor=actions_extractor, export_csv=False, update=update
+            )
+        except Exception as e:
+            print(f"✗ Failed to import {source}: {e}")
+            status = 'failed'
+        stats.record(status, time.perf_counter() - start, time.time() - detected_at)
+        return status
+    
+    try:
+        while True:
+            if watch_dir:
+                names = sorted(os.listdir(watch_dir))
+                listed = {os.path.join(watch_dir, name) for name in names}
+                # Oublier les fichiers supprimés ou renommés entre deux passages
+                for path in list(pending):
+                    if path not in listed:
+                        del pending[path]
+                unmovable &= listed
+                
+                for name in names:
+                    path = os.path.join(watch_dir, name)
+                    if not name.lower().endswith('.pdf') or path in unmovable:
+                        continue
+                    try:
+                        if not os.path.isfile(path):
+                            continue
+                        size = os.path.getsize(path)
+                    except OSError as e:
+                        print(f"⚠️  Could not read {path}: {e}")
+                        pending.pop(path, None)
+                        continue
+                    previous = pending.get(path)
+                    if previous is None or previous[0] != size or size == 0:
+                        # Attendre que la copie du fichier soit terminée
+                        pending[path] = (size, previous[1] if previous else time.time())
+                        continue
+                    
+                    status = ingest(path, previous[1])
+                    del pending[path]
+                    target_dir = 'failed' if status == 'failed' else 'processed'
+                    try:
+                        os.replace(path, unique_target_path(os.path.join(watch_dir, target_dir), name))
+                    except OSError as e:
+                        print(f"⚠️  Could not move {path} to {target_dir}/: {e}")
+                        unmovable.add(path)
+            
+            if queue_file:
+                entries, queue_offset = _read_queue(queue_file, queue_offset)
+                for entry in entries:
+                    ingest(entry, time.time())
+                if entries:
+                    with open(offset_path, 'w') as f:
+                        f.write(str(queue_offset))
+            
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("\n⏹️  Ingestion stopped")
+        stats.write()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a handball match sheet (PDF) into Supabase")
+    parser.add_argument("pdf_input", nargs="?", help="URL or local path of the match PDF (default: match.pdf)")
+    parser.add_argument(
+        "--actions-extractor",
+        choices=["camelot", "text"],
+        default="camelot",
+        help="Extractor for the Déroulé du Match timeline: Camelot lattice tables or the faster PDF text layer"
+    )
+    parser.add_argument(
+        "--validate-actions",
+        metavar="DIR",
+        help="Compare both action extractors on every PDF in DIR and exit"
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Re-import matches that already exist, writing only the rows that changed"
+    )
+    parser.add_argument("--watch", metavar="DIR", help="Run as a daemon importing every PDF dropped in DIR")
+    parser.add_argument("--queue", metavar="FILE", help="Run as a daemon importing every URL/path appended to FILE")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Daemon polling interval in seconds")
+    parser.add_argument("--stats-file", default="ingest_stats.json", help="Daemon throughput/latency counters (JSON)")
+    parser.add_argument(
+        "--profile-log",
+        default="import_profile.jsonl",
+        help="Append per-match stage timings and Supabase round trips to this JSON lines file ('' to disable)"
+    )
+    parser.add_argument("--cprofile", metavar="DIR", help="Write a cProfile dump of each match import to DIR")
+    args = parser.parse_args()
+    
+    if args.validate_actions:
+        pdf_paths = sorted(
+            os.path.join(args.validate_actions, name)
+            for name in os.listdir(args.validate_actions)
+            if name.lower().endswith('.pdf')
+        )
+        if not pdf_paths:
+            print(f"Error: No PDF found in '{args.validate_actions}'.")
+            exit(1)
+        exit(0 if validate_action_extractors(pdf_paths) else 1)
+    
+    if args.watch or args.queue:
+        run_ingestion_daemon(args.watch, args.queue, args.poll_interval, args.actions_extractor,
+                             args.stats_file, args.update, args.profile_log, args.cprofile)
+        exit(0)
+    
+    is_url = bool(args.pdf_input) and args.pdf_input.startswith(('http://', 'https://'))
+    profiler.reset()
+    
+    if args.pdf_input:
+        pdf_input = args.pdf_input
+        
+        # Check if input is a URL
+        if is_url:
+            print("="*50)
+            print(f"Processing PDF from URL: {pdf_input}")
+            print("="*50)
+            with profiler.stage('download'):
+                pdf_path = download_pdf(pdf_input)
+            
+            if pdf_path is None:
+                print("Failed to download PDF. Exiting.")
+                exit(1)
+        else:
+            # Assume it's a local file path
+            pdf_path = pdf_input
+            if not os.path.exists(pdf_path):
+                print(f"Error: File '{pdf_path}' not found.")
+                exit(1)
+    else:
+        # Default to match.pdf
+        pdf_path = "match.pdf"
+        if not os.path.exists(pdf_path):
+            print("Error: No PDF specified and default 'match.pdf' not found.")
+            print("\nUsage:")
+            print("  python read-match.py <pdf_url_or_path> [--actions-extractor camelot|text]")
+            print("  python read-match.py --validate-actions <pdf_dir>")
+            print("  python read-match.py --watch <drop_dir> [--queue <queue_file>]")
+            print("\nExample:")
+            print("  python read-match.py https://media-ffhb-fdm.ffhandball.fr/fdm/V/A/G/A/VAGAHYB.pdf")
+            exit(1)
+    
+    run_profiled_import(
+        pdf_path, args.pdf_input or pdf_path, args.profile_log, args.cprofile,
+        actions_extractor=args.actions_extractor, update=args.update
+    )
     
     # Cleanup: Remove temporary PDF if it was downloaded
-    if len(sys.argv) > 1 and (sys.argv[1].startswith('http://') or sys.argv[1].startswith('https://')):
+    if is_url:
         if os.path.exists("temp_match.pdf"):
             os.remove("temp_match.pdf")
             print("\n✓ Temporary PDF file cleaned up")
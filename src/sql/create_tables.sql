@@ -2,6 +2,9 @@
 -- Run this in Supabase SQL Editor
 
 -- Drop existing tables to recreate them with proper structure
+DROP TABLE IF EXISTS team_ratings CASCADE;
+DROP TABLE IF EXISTS head_to_head CASCADE;
+DROP TABLE IF EXISTS action_buckets CASCADE;
 DROP TABLE IF EXISTS actions CASCADE;
 DROP TABLE IF EXISTS player_stats CASCADE;
 DROP TABLE IF EXISTS matches CASCADE;
@@ -27,13 +30,28 @@ CREATE TABLE teams (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
--- Table for players
+-- Player identity key: the name without accents, case, spaces or punctuation, so
+-- the spellings of the match sheet ("JUQUEL Loïc") and of the actions rebuilt by
+-- read-match.py ("JUQUEL loic") give the same key (see normalize_player_name)
+CREATE OR REPLACE FUNCTION player_name_key(name TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT regexp_replace(
+        translate(lower(name), 'àáâãäåçèéêëìíîïñòóôõöùúûüýÿ', 'aaaaaaceeeeiiiinooooouuuuyy'),
+        '[^a-z0-9]', '', 'g'
+    )
+$$;
+
+-- Table for players (one row per person and team, whatever the spelling)
 CREATE TABLE players (
     id BIGSERIAL PRIMARY KEY,
     name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
     team_id BIGINT REFERENCES teams(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    UNIQUE(name, team_id)
+    UNIQUE(team_id, name_key)
 );
 
 -- Table for matches
@@ -47,6 +65,7 @@ CREATE TABLE matches (
     ht_score_away INTEGER,
     final_score_home INTEGER,
     final_score_away INTEGER,
+    fingerprint TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -58,6 +77,7 @@ CREATE TABLE player_stats (
     team_id BIGINT REFERENCES teams(id),
     team_name TEXT NOT NULL,
     player_name TEXT NOT NULL,
+    player_number SMALLINT,
     is_official BOOLEAN DEFAULT FALSE,
     is_captain BOOLEAN DEFAULT FALSE,
     goals INTEGER DEFAULT 0,
@@ -77,35 +97,87 @@ CREATE TABLE actions (
     match_id BIGINT REFERENCES matches(id) ON DELETE CASCADE,
     period INTEGER NOT NULL,
     time TEXT NOT NULL,
+    time_seconds INTEGER,
     score TEXT,
+    score_home INTEGER,
+    score_away INTEGER,
     action TEXT,
     action_type TEXT,
     team TEXT,
     player_number TEXT,
     player_name TEXT,
+    player_id BIGINT REFERENCES players(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Table for action counts per 5-minute interval (written by read-match.py for each match)
+CREATE TABLE action_buckets (
+    id BIGSERIAL PRIMARY KEY,
+    match_id BIGINT REFERENCES matches(id) ON DELETE CASCADE,
+    team_id BIGINT REFERENCES teams(id),
+    player_id BIGINT REFERENCES players(id),
+    player_name TEXT,
+    action_type TEXT NOT NULL,
+    bucket SMALLINT NOT NULL,
+    count INTEGER NOT NULL
+);
+
+-- Table for head-to-head records: one row per league and pair of teams
+-- (team_a_id < team_b_id), rewritten by read-match.py for the pair of each
+-- imported match; last_match_ids lists the most recent meetings first
+CREATE TABLE head_to_head (
+    id BIGSERIAL PRIMARY KEY,
+    league_id BIGINT REFERENCES leagues(id) ON DELETE CASCADE,
+    team_a_id BIGINT REFERENCES teams(id),
+    team_b_id BIGINT REFERENCES teams(id),
+    matches INTEGER NOT NULL,
+    team_a_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    team_b_wins INTEGER NOT NULL,
+    team_a_goals INTEGER NOT NULL,
+    team_b_goals INTEGER NOT NULL,
+    last_match_date DATE,
+    last_match_ids BIGINT[] NOT NULL,
+    UNIQUE(league_id, team_a_id, team_b_id),
+    CHECK (team_a_id < team_b_id)
+);
+
+-- Table for Elo team ratings: one row per team and scored, dated match, with
+-- the rating before and after the match; read-match.py only replays a league
+-- from the date of each imported match
+CREATE TABLE team_ratings (
+    id BIGSERIAL PRIMARY KEY,
+    league_id BIGINT REFERENCES leagues(id) ON DELETE CASCADE,
+    team_id BIGINT REFERENCES teams(id),
+    match_id BIGINT REFERENCES matches(id) ON DELETE CASCADE,
+    match_date DATE NOT NULL,
+    rating_before DOUBLE PRECISION NOT NULL,
+    rating DOUBLE PRECISION NOT NULL,
+    UNIQUE(match_id, team_id)
+);
+
 -- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_leagues_name ON leagues(name);
-CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name);
-CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);
+-- (players, teams and leagues lookups use the indexes of their UNIQUE constraints)
 CREATE INDEX IF NOT EXISTS idx_players_team ON players(team_id);
-CREATE INDEX IF NOT EXISTS idx_matches_league ON matches(league_id);
-CREATE INDEX IF NOT EXISTS idx_matches_home_team ON matches(home_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_league_id ON matches(league_id, id);
+CREATE INDEX IF NOT EXISTS idx_matches_teams_date ON matches(home_team_id, away_team_id, match_date);
 CREATE INDEX IF NOT EXISTS idx_matches_away_team ON matches(away_team_id);
 CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(match_date);
-CREATE INDEX IF NOT EXISTS idx_player_stats_match ON player_stats(match_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_match_team ON player_stats(match_id, team_id);
 CREATE INDEX IF NOT EXISTS idx_player_stats_player ON player_stats(player_id);
 CREATE INDEX IF NOT EXISTS idx_player_stats_team ON player_stats(team_id);
 CREATE INDEX IF NOT EXISTS idx_player_stats_team_name ON player_stats(team_name);
 CREATE INDEX IF NOT EXISTS idx_player_stats_player_name ON player_stats(player_name);
 CREATE INDEX IF NOT EXISTS idx_player_stats_is_official ON player_stats(is_official);
-CREATE INDEX IF NOT EXISTS idx_actions_match ON actions(match_id);
+CREATE INDEX IF NOT EXISTS idx_actions_match_time_seconds ON actions(match_id, time_seconds);
 CREATE INDEX IF NOT EXISTS idx_actions_period ON actions(period);
 CREATE INDEX IF NOT EXISTS idx_actions_action_type ON actions(action_type);
 CREATE INDEX IF NOT EXISTS idx_actions_team ON actions(team);
 CREATE INDEX IF NOT EXISTS idx_actions_player_name ON actions(player_name);
+CREATE INDEX IF NOT EXISTS idx_actions_player ON actions(player_id);
+CREATE INDEX IF NOT EXISTS idx_action_buckets_match ON action_buckets(match_id);
+CREATE INDEX IF NOT EXISTS idx_action_buckets_team_type ON action_buckets(team_id, action_type);
+CREATE INDEX IF NOT EXISTS idx_team_ratings_league_date ON team_ratings(league_id, match_date);
 
 -- Enable Row Level Security (optional but recommended)
 ALTER TABLE leagues ENABLE ROW LEVEL SECURITY;
@@ -114,6 +186,9 @@ ALTER TABLE players ENABLE ROW LEVEL SECURITY;
 ALTER TABLE matches ENABLE ROW LEVEL SECURITY;
 ALTER TABLE player_stats ENABLE ROW LEVEL SECURITY;
 ALTER TABLE actions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE action_buckets ENABLE ROW LEVEL SECURITY;
+ALTER TABLE head_to_head ENABLE ROW LEVEL SECURITY;
+ALTER TABLE team_ratings ENABLE ROW LEVEL SECURITY;
 
 -- Create policies to allow all operations (adjust based on your needs)
 CREATE POLICY "Enable read access for all users" ON leagues FOR SELECT USING (true);
@@ -146,6 +221,21 @@ CREATE POLICY "Enable insert access for all users" ON actions FOR INSERT WITH CH
 CREATE POLICY "Enable update access for all users" ON actions FOR UPDATE USING (true);
 CREATE POLICY "Enable delete access for all users" ON actions FOR DELETE USING (true);
 
+CREATE POLICY "Enable read access for all users" ON action_buckets FOR SELECT USING (true);
+CREATE POLICY "Enable insert access for all users" ON action_buckets FOR INSERT WITH CHECK (true);
+CREATE POLICY "Enable update access for all users" ON action_buckets FOR UPDATE USING (true);
+CREATE POLICY "Enable delete access for all users" ON action_buckets FOR DELETE USING (true);
+
+CREATE POLICY "Enable read access for all users" ON head_to_head FOR SELECT USING (true);
+CREATE POLICY "Enable insert access for all users" ON head_to_head FOR INSERT WITH CHECK (true);
+CREATE POLICY "Enable update access for all users" ON head_to_head FOR UPDATE USING (true);
+CREATE POLICY "Enable delete access for all users" ON head_to_head FOR DELETE USING (true);
+
+CREATE POLICY "Enable read access for all users" ON team_ratings FOR SELECT USING (true);
+CREATE POLICY "Enable insert access for all users" ON team_ratings FOR INSERT WITH CHECK (true);
+CREATE POLICY "Enable update access for all users" ON team_ratings FOR UPDATE USING (true);
+CREATE POLICY "Enable delete access for all users" ON team_ratings FOR DELETE USING (true);
+
 -- Display success message
 DO $$ 
 BEGIN
@@ -154,4 +244,7 @@ BEGIN
     RAISE NOTICE 'matches: stores match information with home/away teams';
     RAISE NOTICE 'player_stats: stores player/official statistics linked to matches';
     RAISE NOTICE 'actions: stores chronological match actions linked to matches';
+    RAISE NOTICE 'action_buckets: stores action counts per 5-minute interval';
+    RAISE NOTICE 'head_to_head: stores the record of each pair of teams';
+    RAISE NOTICE 'team_ratings: stores the Elo rating of each team after each match';
 END $$;
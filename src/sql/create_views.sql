@@ -0,0 +1,375 @@
+-- SQL to create the season aggregate tables used by the dashboard
+-- Run this in Supabase SQL Editor after create_tables.sql (re-run it to rebuild
+-- the aggregates, e.g. after a migration)
+--
+-- The dashboard pages read these aggregates instead of downloading the full
+-- matches / player_stats tables. They are plain tables maintained per league:
+-- after each import read-match.py calls refresh_league_season_stats(league_id),
+-- which rewrites only the rows of the league of the imported match (the other
+-- leagues are not rescanned). refresh_season_stats() rebuilds every league.
+
+-- Drop the aggregates (materialized views in earlier versions of this script)
+DO $$
+DECLARE
+    view_name TEXT;
+BEGIN
+    FOR view_name IN
+        SELECT matviewname FROM pg_matviews
+        WHERE schemaname = 'public'
+          AND matviewname IN ('goalkeeper_season_stats', 'player_season_stats', 'team_goal_stats', 'team_standings')
+    LOOP
+        EXECUTE format('DROP MATERIALIZED VIEW %I', view_name);
+    END LOOP;
+END $$;
+
+DROP TABLE IF EXISTS goalkeeper_season_stats;
+DROP TABLE IF EXISTS player_season_stats;
+DROP TABLE IF EXISTS team_goal_stats;
+DROP TABLE IF EXISTS team_standings;
+
+-- Team standings: one row per league, team, venue (home/away) and score type
+-- (final/halftime). The "all matches" standings are the sum of both venues.
+CREATE TABLE team_standings (
+    league_id BIGINT,
+    team_id BIGINT,
+    team_name TEXT,
+    venue TEXT,
+    score_type TEXT,
+    played INTEGER,
+    wins INTEGER,
+    draws INTEGER,
+    losses INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER
+);
+
+-- Team goal stats: final scores of each team, split by venue
+CREATE TABLE team_goal_stats (
+    league_id BIGINT,
+    team_id BIGINT,
+    team_name TEXT,
+    played INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    home_goals_for INTEGER,
+    away_goals_for INTEGER,
+    home_goals_against INTEGER,
+    away_goals_against INTEGER
+);
+
+-- Player season totals: one row per league, player and team (officials excluded)
+-- Players are grouped by player_id and named after their players row (one per
+-- team and name key), so the spellings of a player in different match sheets are
+-- counted together and namesakes stay apart; rows without player_id fall back
+-- to the match-sheet name
+CREATE TABLE player_season_stats (
+    league_id BIGINT,
+    player_id BIGINT,
+    player_name TEXT,
+    team_name TEXT,
+    matches_played INTEGER,
+    goals INTEGER,
+    shots INTEGER,
+    goals_7m INTEGER,
+    saves INTEGER,
+    yellow_cards INTEGER,
+    two_minutes INTEGER,
+    red_cards INTEGER,
+    blue_cards INTEGER
+);
+
+-- Goalkeeper totals: players with at least one save in the league (grouped like
+-- player_season_stats)
+-- Shots faced = saves + goals conceded. Each goal is charged to the goalkeeper on
+-- court, read from the actions timeline; when the timeline does not identify every
+-- goalkeeper who saved for a team, the final score of the opponent is split in
+-- proportion to the saves (same rules as src/analytics/goalkeeping.py).
+CREATE TABLE goalkeeper_season_stats (
+    league_id BIGINT,
+    player_id BIGINT,
+    player_name TEXT,
+    team_name TEXT,
+    matches_played INTEGER,
+    matches_with_saves INTEGER,
+    saves INTEGER,
+    best_saves INTEGER,
+    goals_conceded NUMERIC,
+    shots_faced NUMERIC
+);
+
+-- Create indexes for the dashboard filters (and the per-league rewrites)
+CREATE INDEX IF NOT EXISTS idx_team_standings_league ON team_standings(league_id);
+CREATE INDEX IF NOT EXISTS idx_team_goal_stats_league ON team_goal_stats(league_id);
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_league ON player_season_stats(league_id);
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_team_name ON player_season_stats(team_name);
+CREATE INDEX IF NOT EXISTS idx_goalkeeper_season_stats_league ON goalkeeper_season_stats(league_id);
+
+-- Rewrite the aggregates of one league (NULL: matches without league), called by
+-- read-match.py after an import. Only the matches of that league are read.
+CREATE OR REPLACE FUNCTION refresh_league_season_stats(p_league_id BIGINT)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    DELETE FROM team_standings
+    WHERE league_id = p_league_id OR (p_league_id IS NULL AND league_id IS NULL);
+
+    INSERT INTO team_standings (league_id, team_id, team_name, venue, score_type,
+                                played, wins, draws, losses, goals_for, goals_against)
+    WITH league_matches AS (
+        SELECT *
+        FROM matches
+        WHERE league_id = p_league_id OR (p_league_id IS NULL AND league_id IS NULL)
+    ),
+    team_results AS (
+        SELECT
+            m.league_id,
+            m.home_team_id AS team_id,
+            'home' AS venue,
+            m.final_score_home AS goals_for,
+            m.final_score_away AS goals_against,
+            m.ht_score_home AS ht_goals_for,
+            m.ht_score_away AS ht_goals_against
+        FROM league_matches m
+        UNION ALL
+        SELECT
+            m.league_id,
+            m.away_team_id AS team_id,
+            'away' AS venue,
+            m.final_score_away AS goals_for,
+            m.final_score_home AS goals_against,
+            m.ht_score_away AS ht_goals_for,
+            m.ht_score_home AS ht_goals_against
+        FROM league_matches m
+    ),
+    scored_results AS (
+        SELECT league_id, team_id, venue, 'final' AS score_type, goals_for, goals_against
+        FROM team_results
+        WHERE goals_for IS NOT NULL AND goals_against IS NOT NULL
+        UNION ALL
+        SELECT league_id, team_id, venue, 'halftime' AS score_type, ht_goals_for, ht_goals_against
+        FROM team_results
+        WHERE ht_goals_for IS NOT NULL AND ht_goals_against IS NOT NULL
+    )
+    SELECT
+        r.league_id,
+        r.team_id,
+        t.name AS team_name,
+        r.venue,
+        r.score_type,
+        COUNT(*) AS played,
+        COUNT(*) FILTER (WHERE r.goals_for > r.goals_against) AS wins,
+        COUNT(*) FILTER (WHERE r.goals_for = r.goals_against) AS draws,
+        COUNT(*) FILTER (WHERE r.goals_for < r.goals_against) AS losses,
+        SUM(r.goals_for) AS goals_for,
+        SUM(r.goals_against) AS goals_against
+    FROM scored_results r
+    JOIN teams t ON t.id = r.team_id
+    GROUP BY r.league_id, r.team_id, t.name, r.venue, r.score_type;
+
+    -- team_goal_stats is built from the team_standings rows just written
+    DELETE FROM team_goal_stats
+    WHERE league_id = p_league_id OR (p_league_id IS NULL AND league_id IS NULL);
+
+    INSERT INTO team_goal_stats (league_id, team_id, team_name, played, goals_for, goals_against,
+                                 home_goals_for, away_goals_for, home_goals_against, away_goals_against)
+    SELECT
+        league_id,
+        team_id,
+        team_name,
+        SUM(played) AS played,
+        SUM(goals_for) AS goals_for,
+        SUM(goals_against) AS goals_against,
+        SUM(goals_for) FILTER (WHERE venue = 'home') AS home_goals_for,
+        SUM(goals_for) FILTER (WHERE venue = 'away') AS away_goals_for,
+        SUM(goals_against) FILTER (WHERE venue = 'home') AS home_goals_against,
+        SUM(goals_against) FILTER (WHERE venue = 'away') AS away_goals_against
+    FROM team_standings
+    WHERE score_type = 'final'
+      AND (league_id = p_league_id OR (p_league_id IS NULL AND league_id IS NULL))
+    GROUP BY league_id, team_id, team_name;
+
+    DELETE FROM player_season_stats
+    WHERE league_id = p_league_id OR (p_league_id IS NULL AND league_id IS NULL);
+
+    INSERT INTO player_season_stats (league_id, player_id, player_name, team_name, matches_played,
+                                     goals, shots, goals_7m, saves,
+                                     yellow_cards, two_minutes, red_cards, blue_cards)
+    SELECT
+        m.league_id,
+        ps.player_id,
+        COALESCE(p.name, ps.player_name) AS player_name,
+        ps.team_name,
+        COUNT(DISTINCT ps.match_id) AS matches_played,
+        SUM(ps.goals) AS goals,
+        SUM(ps.shots) AS shots,
+        SUM(ps.goals_7m) AS goals_7m,
+        SUM(ps.saves) AS saves,
+        SUM(ps.yellow_cards) AS yellow_cards,
+        SUM(ps.two_minutes) AS two_minutes,
+        SUM(ps.red_cards) AS red_cards,
+        SUM(ps.blue_cards) AS blue_cards
+    FROM player_stats ps
+    JOIN matches m ON m.id = ps.match_id
+    LEFT JOIN players p ON p.id = ps.player_id
+    WHERE ps.is_official = FALSE
+      AND (m.league_id = p_league_id OR (p_league_id IS NULL AND m.league_id IS NULL))
+    GROUP BY m.league_id, ps.player_id, COALESCE(p.name, ps.player_name), ps.team_name;
+
+    DELETE FROM goalkeeper_season_stats
+    WHERE league_id = p_league_id OR (p_league_id IS NULL AND league_id IS NULL);
+
+    INSERT INTO goalkeeper_season_stats (league_id, player_id, player_name, team_name, matches_played,
+                                         matches_with_saves, saves, best_saves, goals_conceded, shots_faced)
+    WITH timeline AS (
+        SELECT a.id, a.match_id, a.time_seconds, a.action_type, a.team, a.player_id
+        FROM actions a
+        JOIN matches m ON m.id = a.match_id
+        WHERE a.action_type IN ('Save', 'Goal', 'Goal_7m')
+          AND a.team IN ('Home', 'Away')
+          AND a.time_seconds IS NOT NULL
+          AND (m.league_id = p_league_id OR (p_league_id IS NULL AND m.league_id IS NULL))
+    ),
+    timeline_saves AS (
+        SELECT id, match_id, time_seconds, team, player_id
+        FROM timeline
+        WHERE action_type = 'Save' AND player_id IS NOT NULL
+    ),
+    -- Each goal is charged to the goalkeeper of the other team who made the last
+    -- save before it (before their first save: the first goalkeeper to save)
+    goals_on_court AS (
+        SELECT g.match_id, COALESCE(keeper_before.player_id, keeper_after.player_id) AS player_id
+        FROM timeline g
+        LEFT JOIN LATERAL (
+            SELECT s.player_id
+            FROM timeline_saves s
+            WHERE s.match_id = g.match_id
+              AND s.team <> g.team
+              AND (s.time_seconds, s.id) < (g.time_seconds, g.id)
+            ORDER BY s.time_seconds DESC, s.id DESC
+            LIMIT 1
+        ) keeper_before ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT s.player_id
+            FROM timeline_saves s
+            WHERE s.match_id = g.match_id
+              AND s.team <> g.team
+              AND (s.time_seconds, s.id) > (g.time_seconds, g.id)
+            ORDER BY s.time_seconds, s.id
+            LIMIT 1
+        ) keeper_after ON TRUE
+        WHERE g.action_type IN ('Goal', 'Goal_7m')
+    ),
+    keepers_on_court AS (
+        SELECT s.match_id, s.player_id, COUNT(g.player_id) AS goals_conceded
+        FROM (SELECT DISTINCT match_id, player_id FROM timeline_saves) s
+        LEFT JOIN goals_on_court g ON g.match_id = s.match_id AND g.player_id = s.player_id
+        GROUP BY s.match_id, s.player_id
+    ),
+    goalkeeper_rows AS (
+        SELECT
+            m.league_id,
+            ps.match_id,
+            ps.player_id,
+            COALESCE(p.name, ps.player_name) AS player_name,
+            ps.team_name,
+            ps.saves,
+            CASE
+                WHEN ps.team_id = m.home_team_id THEN m.final_score_away
+                WHEN ps.team_id = m.away_team_id THEN m.final_score_home
+            END AS team_conceded,
+            SUM(ps.saves) OVER (PARTITION BY ps.match_id, ps.team_id) AS team_saves,
+            k.goals_conceded AS on_court_conceded,
+            -- Timeline used only when it identifies every goalkeeper who saved for the team
+            COUNT(*) FILTER (WHERE ps.saves > 0 AND k.player_id IS NULL)
+                OVER (PARTITION BY ps.match_id, ps.team_id) = 0 AS team_covered
+        FROM player_stats ps
+        JOIN matches m ON m.id = ps.match_id
+        LEFT JOIN players p ON p.id = ps.player_id
+        LEFT JOIN keepers_on_court k ON k.match_id = ps.match_id AND k.player_id = ps.player_id
+        WHERE ps.is_official = FALSE
+          AND (m.league_id = p_league_id OR (p_league_id IS NULL AND m.league_id IS NULL))
+    ),
+    goalkeeper_matches AS (
+        SELECT
+            league_id,
+            match_id,
+            player_id,
+            player_name,
+            team_name,
+            saves,
+            CASE
+                WHEN team_conceded IS NULL THEN NULL
+                WHEN team_covered THEN COALESCE(on_court_conceded, 0)::NUMERIC
+                ELSE team_conceded * saves::NUMERIC / NULLIF(team_saves, 0)
+            END AS goals_conceded
+        FROM goalkeeper_rows
+    )
+    SELECT
+        league_id,
+        player_id,
+        player_name,
+        team_name,
+        COUNT(DISTINCT match_id) AS matches_played,
+        COUNT(DISTINCT match_id) FILTER (WHERE saves > 0) AS matches_with_saves,
+        SUM(saves) AS saves,
+        MAX(saves) AS best_saves,
+        ROUND(SUM(goals_conceded), 2) AS goals_conceded,
+        ROUND(SUM(saves + goals_conceded), 2) AS shots_faced
+    FROM goalkeeper_matches
+    GROUP BY league_id, player_id, player_name, team_name
+    HAVING SUM(saves) > 0;
+END;
+$$;
+
+-- Rebuild the aggregates of every league
+CREATE OR REPLACE FUNCTION refresh_season_stats()
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    league RECORD;
+BEGIN
+    TRUNCATE team_standings, team_goal_stats, player_season_stats, goalkeeper_season_stats;
+    FOR league IN SELECT DISTINCT league_id FROM matches LOOP
+        PERFORM refresh_league_season_stats(league.league_id);
+    END LOOP;
+END;
+$$;
+
+-- The aggregates are written by the functions above only: read access for all
+ALTER TABLE team_standings ENABLE ROW LEVEL SECURITY;
+ALTER TABLE team_goal_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE player_season_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE goalkeeper_season_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON team_standings FOR SELECT USING (true);
+CREATE POLICY "Enable read access for all users" ON team_goal_stats FOR SELECT USING (true);
+CREATE POLICY "Enable read access for all users" ON player_season_stats FOR SELECT USING (true);
+CREATE POLICY "Enable read access for all users" ON goalkeeper_season_stats FOR SELECT USING (true);
+
+GRANT SELECT ON team_standings, team_goal_stats, player_season_stats, goalkeeper_season_stats TO anon, authenticated;
+
+-- The rewrites are not exposed to the dashboard keys: only the importer
+-- (read-match.py with the service_role key) recomputes a league, the full
+-- rebuild is run from the SQL Editor
+REVOKE EXECUTE ON FUNCTION refresh_league_season_stats(BIGINT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION refresh_season_stats() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_league_season_stats(BIGINT) TO service_role;
+
+-- Initial build
+SELECT refresh_season_stats();
+
+-- Display success message
+DO $$
+BEGIN
+    RAISE NOTICE 'Season aggregates created successfully!';
+    RAISE NOTICE 'team_standings: wins/draws/losses and goals per team, venue and score type';
+    RAISE NOTICE 'team_goal_stats: goals scored/conceded per team';
+    RAISE NOTICE 'player_season_stats: season totals per player';
+    RAISE NOTICE 'goalkeeper_season_stats: season totals and shots faced per goalkeeper';
+END $$;
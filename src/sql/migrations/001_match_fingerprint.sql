@@ -0,0 +1,5 @@
+-- Migration: store a fingerprint of the parsed match sheet on each match
+-- Run this in Supabase SQL Editor on databases created before this change
+
+-- SHA-256 of the parsed match info, player stats and actions (see read-match.py --update)
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS fingerprint TEXT;
@@ -0,0 +1,34 @@
+-- Migration: composite indexes for the dashboard and import access paths
+-- Run this in Supabase SQL Editor on databases created before this change
+--
+-- Each index matches a query actually issued by the code; the single-column
+-- indexes they make redundant (same leading column) are dropped.
+-- players(name, team_id), teams(name) and leagues(name, group_id, season)
+-- lookups are already served by the indexes of their UNIQUE constraints.
+
+-- read-match.py create_match_in_db: duplicate check on (home team, away team, date)
+CREATE INDEX IF NOT EXISTS idx_matches_teams_date ON matches(home_team_id, away_team_id, match_date);
+DROP INDEX IF EXISTS idx_matches_home_team;
+
+-- database.get_matches / get_player_stats: matches of a league (index-only scan on id)
+CREATE INDEX IF NOT EXISTS idx_matches_league_id ON matches(league_id, id);
+DROP INDEX IF EXISTS idx_matches_league;
+
+-- database.get_match_details: actions of a match in chronological order
+CREATE INDEX IF NOT EXISTS idx_actions_match_period_time ON actions(match_id, period, time);
+DROP INDEX IF EXISTS idx_actions_match;
+
+-- database.get_match_details / read-match.py sync_table_rows: player stats of a
+-- match, read back team by team
+CREATE INDEX IF NOT EXISTS idx_player_stats_match_team ON player_stats(match_id, team_id);
+DROP INDEX IF EXISTS idx_player_stats_match;
+
+-- Redundant with the UNIQUE constraint indexes
+DROP INDEX IF EXISTS idx_leagues_name;
+DROP INDEX IF EXISTS idx_teams_name;
+DROP INDEX IF EXISTS idx_players_name;
+
+-- Refresh the planner statistics
+ANALYZE matches;
+ANALYZE actions;
+ANALYZE player_stats;
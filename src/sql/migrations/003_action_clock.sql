@@ -0,0 +1,29 @@
+-- Migration: integer match clock and score columns on actions
+-- Run this in Supabase SQL Editor on databases created before this change
+--
+-- read-match.py now stores the elapsed match time in seconds ("12:34" -> 754)
+-- and the running score split into home / away integers ("12-10" -> 12, 10),
+-- so timelines sort numerically and time windows are integer range scans.
+
+ALTER TABLE actions ADD COLUMN IF NOT EXISTS time_seconds INTEGER;
+ALTER TABLE actions ADD COLUMN IF NOT EXISTS score_home INTEGER;
+ALTER TABLE actions ADD COLUMN IF NOT EXISTS score_away INTEGER;
+
+-- Backfill the rows imported before this change
+UPDATE actions
+SET time_seconds = split_part(btrim(time), ':', 1)::INTEGER * 60 + split_part(btrim(time), ':', 2)::INTEGER
+WHERE time_seconds IS NULL
+  AND btrim(time) ~ '^\d{1,3}:\d{2}$';
+
+UPDATE actions
+SET score_home = split_part(regexp_replace(score, '\s', '', 'g'), '-', 1)::INTEGER,
+    score_away = split_part(regexp_replace(score, '\s', '', 'g'), '-', 2)::INTEGER
+WHERE score_home IS NULL
+  AND regexp_replace(score, '\s', '', 'g') ~ '^\d+-\d+$';
+
+-- database.get_match_details: actions of a match in chronological order
+-- (replaces the text-sorted index of migration 002)
+CREATE INDEX IF NOT EXISTS idx_actions_match_time_seconds ON actions(match_id, time_seconds);
+DROP INDEX IF EXISTS idx_actions_match_period_time;
+
+ANALYZE actions;
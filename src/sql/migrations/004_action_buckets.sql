@@ -0,0 +1,44 @@
+-- Migration: action counts per 5-minute interval for the heatmaps
+-- Run this in Supabase SQL Editor on databases created before this change
+-- (after 003_action_clock.sql, which adds actions.time_seconds)
+--
+-- read-match.py rewrites the rows of a match at each import, the dashboard
+-- reads these counts instead of bucketing every action on each render.
+
+CREATE TABLE IF NOT EXISTS action_buckets (
+    id BIGSERIAL PRIMARY KEY,
+    match_id BIGINT REFERENCES matches(id) ON DELETE CASCADE,
+    team_id BIGINT REFERENCES teams(id),
+    player_name TEXT,
+    action_type TEXT NOT NULL,
+    bucket SMALLINT NOT NULL,
+    count INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_action_buckets_match ON action_buckets(match_id);
+CREATE INDEX IF NOT EXISTS idx_action_buckets_team_type ON action_buckets(team_id, action_type);
+
+ALTER TABLE action_buckets ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON action_buckets FOR SELECT USING (true);
+CREATE POLICY "Enable insert access for all users" ON action_buckets FOR INSERT WITH CHECK (true);
+CREATE POLICY "Enable update access for all users" ON action_buckets FOR UPDATE USING (true);
+CREATE POLICY "Enable delete access for all users" ON action_buckets FOR DELETE USING (true);
+
+-- Backfill the matches imported before this change (same rules as read-match.py
+-- action_bucket_records: the final second 60:00 belongs to the last interval)
+INSERT INTO action_buckets (match_id, team_id, player_name, action_type, bucket, count)
+SELECT
+    a.match_id,
+    CASE a.team WHEN 'Home' THEN m.home_team_id ELSE m.away_team_id END,
+    a.player_name,
+    a.action_type,
+    CASE WHEN a.time_seconds = 3600 THEN 11 ELSE a.time_seconds / 300 END,
+    COUNT(*)
+FROM actions a
+JOIN matches m ON m.id = a.match_id
+WHERE a.action_type IN ('Goal', 'Goal_7m', 'Shot', 'Save', 'Suspension_2min')
+  AND a.team IN ('Home', 'Away')
+  AND a.time_seconds IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM action_buckets b WHERE b.match_id = a.match_id)
+GROUP BY 1, 2, 3, 4, 5;
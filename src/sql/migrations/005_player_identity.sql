@@ -0,0 +1,103 @@
+-- Migration: player identity index
+-- Run this in Supabase SQL Editor on databases created before this change
+--
+-- Players are identified by a normalized name key within their team, so the
+-- spellings of the match sheet and of the actions resolve to the same player.
+-- read-match.py stores the shirt number of each player_stats row and the
+-- player_id of each action and interval count (after 004_action_buckets.sql).
+-- The season aggregates group by player_id: re-run src/sql/create_views.sql
+-- after this migration.
+
+CREATE OR REPLACE FUNCTION player_name_key(name TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT regexp_replace(
+        translate(lower(name), 'àáâãäåçèéêëìíîïñòóôõöùúûüýÿ', 'aaaaaaceeeeiiiinooooouuuuyy'),
+        '[^a-z0-9]', '', 'g'
+    )
+$$;
+
+ALTER TABLE players ADD COLUMN IF NOT EXISTS name_key TEXT;
+ALTER TABLE player_stats ADD COLUMN IF NOT EXISTS player_number SMALLINT;
+ALTER TABLE actions ADD COLUMN IF NOT EXISTS player_id BIGINT REFERENCES players(id);
+ALTER TABLE action_buckets ADD COLUMN IF NOT EXISTS player_id BIGINT REFERENCES players(id);
+
+UPDATE players SET name_key = player_name_key(name) WHERE name_key IS NULL;
+
+-- Spellings of the same player in a team: keep the oldest row
+CREATE TEMP TABLE player_merges AS
+SELECT id, MIN(id) OVER (PARTITION BY team_id, name_key) AS canonical_id
+FROM players;
+
+UPDATE player_stats ps
+SET player_id = pm.canonical_id
+FROM player_merges pm
+WHERE ps.player_id = pm.id
+  AND pm.id <> pm.canonical_id;
+
+DELETE FROM players p
+USING player_merges pm
+WHERE p.id = pm.id
+  AND pm.id <> pm.canonical_id;
+
+DROP TABLE player_merges;
+
+ALTER TABLE players ALTER COLUMN name_key SET NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_players_team_name_key ON players(team_id, name_key);
+
+-- The name key replaces the exact-name key of create_tables.sql: UNIQUE(name, team_id)
+ALTER TABLE players DROP CONSTRAINT IF EXISTS players_name_team_id_key;
+
+-- Actions of the matches imported before this change: player of the acting team
+-- with the same name key
+UPDATE actions a
+SET player_id = p.id
+FROM matches m, players p
+WHERE m.id = a.match_id
+  AND p.team_id = CASE a.team WHEN 'Home' THEN m.home_team_id WHEN 'Away' THEN m.away_team_id END
+  AND p.name_key = player_name_key(a.player_name)
+  AND a.player_id IS NULL
+  AND a.player_name IS NOT NULL;
+
+-- Shirt numbers: the number of the player's actions in the same match
+UPDATE player_stats ps
+SET player_number = numbers.player_number
+FROM (
+    SELECT DISTINCT ON (match_id, player_id) match_id, player_id, player_number::SMALLINT AS player_number
+    FROM actions
+    WHERE player_id IS NOT NULL
+      AND player_number ~ '^\d{1,3}$'
+    ORDER BY match_id, player_id, id
+) numbers
+WHERE ps.match_id = numbers.match_id
+  AND ps.player_id = numbers.player_id
+  AND ps.player_number IS NULL;
+
+-- Interval counts recomputed from the actions, keyed by player_id (same rules as
+-- read-match.py action_bucket_records: the name is kept only without player_id)
+DELETE FROM action_buckets;
+
+INSERT INTO action_buckets (match_id, team_id, player_id, player_name, action_type, bucket, count)
+SELECT
+    a.match_id,
+    CASE a.team WHEN 'Home' THEN m.home_team_id ELSE m.away_team_id END,
+    a.player_id,
+    CASE WHEN a.player_id IS NULL THEN a.player_name END,
+    a.action_type,
+    CASE WHEN a.time_seconds = 3600 THEN 11 ELSE a.time_seconds / 300 END,
+    COUNT(*)
+FROM actions a
+JOIN matches m ON m.id = a.match_id
+WHERE a.action_type IN ('Goal', 'Goal_7m', 'Shot', 'Save', 'Suspension_2min')
+  AND a.team IN ('Home', 'Away')
+  AND a.time_seconds IS NOT NULL
+GROUP BY 1, 2, 3, 4, 5, 6;
+
+CREATE INDEX IF NOT EXISTS idx_actions_player ON actions(player_id);
+
+ANALYZE players;
+ANALYZE player_stats;
+ANALYZE actions;
+ANALYZE action_buckets;
@@ -0,0 +1,67 @@
+-- Migration: head-to-head records of every pair of teams
+-- Run this in Supabase SQL Editor on databases created before this change
+--
+-- read-match.py rewrites the row of the pair of teams of each imported match,
+-- the Club Report looks a pair up instead of filtering all matches.
+
+CREATE TABLE IF NOT EXISTS head_to_head (
+    id BIGSERIAL PRIMARY KEY,
+    league_id BIGINT REFERENCES leagues(id) ON DELETE CASCADE,
+    team_a_id BIGINT REFERENCES teams(id),
+    team_b_id BIGINT REFERENCES teams(id),
+    matches INTEGER NOT NULL,
+    team_a_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    team_b_wins INTEGER NOT NULL,
+    team_a_goals INTEGER NOT NULL,
+    team_b_goals INTEGER NOT NULL,
+    last_match_date DATE,
+    last_match_ids BIGINT[] NOT NULL,
+    UNIQUE(league_id, team_a_id, team_b_id),
+    CHECK (team_a_id < team_b_id)
+);
+
+ALTER TABLE head_to_head ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON head_to_head FOR SELECT USING (true);
+CREATE POLICY "Enable insert access for all users" ON head_to_head FOR INSERT WITH CHECK (true);
+CREATE POLICY "Enable update access for all users" ON head_to_head FOR UPDATE USING (true);
+CREATE POLICY "Enable delete access for all users" ON head_to_head FOR DELETE USING (true);
+
+-- Backfill all pairs in one pass over the scored matches (same rules as
+-- read-match.py head_to_head_record: five most recent meetings kept)
+INSERT INTO head_to_head (league_id, team_a_id, team_b_id, matches, team_a_wins, draws, team_b_wins,
+                          team_a_goals, team_b_goals, last_match_date, last_match_ids)
+SELECT
+    league_id,
+    team_a_id,
+    team_b_id,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE team_a_goals > team_b_goals),
+    COUNT(*) FILTER (WHERE team_a_goals = team_b_goals),
+    COUNT(*) FILTER (WHERE team_a_goals < team_b_goals),
+    SUM(team_a_goals),
+    SUM(team_b_goals),
+    MAX(match_date),
+    (ARRAY_AGG(id ORDER BY match_date DESC NULLS LAST, id DESC))[1:5]
+FROM (
+    SELECT
+        id,
+        league_id,
+        match_date,
+        LEAST(home_team_id, away_team_id) AS team_a_id,
+        GREATEST(home_team_id, away_team_id) AS team_b_id,
+        CASE WHEN home_team_id < away_team_id THEN final_score_home ELSE final_score_away END AS team_a_goals,
+        CASE WHEN home_team_id < away_team_id THEN final_score_away ELSE final_score_home END AS team_b_goals
+    FROM matches
+    WHERE final_score_home IS NOT NULL
+      AND final_score_away IS NOT NULL
+      AND home_team_id <> away_team_id
+) pair_matches
+WHERE NOT EXISTS (
+    SELECT 1 FROM head_to_head h
+    WHERE h.league_id IS NOT DISTINCT FROM pair_matches.league_id
+      AND h.team_a_id = pair_matches.team_a_id
+      AND h.team_b_id = pair_matches.team_b_id
+)
+GROUP BY league_id, team_a_id, team_b_id;
@@ -0,0 +1,94 @@
+-- Migration: Elo team ratings
+-- Run this in Supabase SQL Editor on databases created before this change
+--
+-- read-match.py updates the ratings of the league of each imported match (only
+-- the matches from its date on are replayed), the Club Report reads them.
+-- The backfill below replays every league once with the same rules as
+-- read-match.py (elo_update): start at 1500, K = 20, +50 home advantage,
+-- change weighted by the log of the goal margin.
+
+CREATE TABLE IF NOT EXISTS team_ratings (
+    id BIGSERIAL PRIMARY KEY,
+    league_id BIGINT REFERENCES leagues(id) ON DELETE CASCADE,
+    team_id BIGINT REFERENCES teams(id),
+    match_id BIGINT REFERENCES matches(id) ON DELETE CASCADE,
+    match_date DATE NOT NULL,
+    rating_before DOUBLE PRECISION NOT NULL,
+    rating DOUBLE PRECISION NOT NULL,
+    UNIQUE(match_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_team_ratings_league_date ON team_ratings(league_id, match_date);
+
+ALTER TABLE team_ratings ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON team_ratings FOR SELECT USING (true);
+CREATE POLICY "Enable insert access for all users" ON team_ratings FOR INSERT WITH CHECK (true);
+CREATE POLICY "Enable update access for all users" ON team_ratings FOR UPDATE USING (true);
+CREATE POLICY "Enable delete access for all users" ON team_ratings FOR DELETE USING (true);
+
+-- Backfill: replay the scored, dated matches of each league in date order
+DO $$
+DECLARE
+    m RECORD;
+    home_before DOUBLE PRECISION;
+    away_before DOUBLE PRECISION;
+    expected_home DOUBLE PRECISION;
+    score_home DOUBLE PRECISION;
+    margin_weight DOUBLE PRECISION;
+    change DOUBLE PRECISION;
+BEGIN
+    IF EXISTS (SELECT 1 FROM team_ratings) THEN
+        RAISE NOTICE 'team_ratings already filled - backfill skipped';
+        RETURN;
+    END IF;
+
+    CREATE TEMP TABLE current_ratings (
+        league_id BIGINT,
+        team_id BIGINT,
+        rating DOUBLE PRECISION
+    ) ON COMMIT DROP;
+
+    FOR m IN
+        SELECT id, league_id, home_team_id, away_team_id, match_date, final_score_home, final_score_away
+        FROM matches
+        WHERE final_score_home IS NOT NULL
+          AND final_score_away IS NOT NULL
+          AND match_date IS NOT NULL
+        ORDER BY league_id, match_date, id
+    LOOP
+        SELECT COALESCE(MAX(rating), 1500) INTO home_before FROM current_ratings
+        WHERE league_id IS NOT DISTINCT FROM m.league_id AND team_id = m.home_team_id;
+        SELECT COALESCE(MAX(rating), 1500) INTO away_before FROM current_ratings
+        WHERE league_id IS NOT DISTINCT FROM m.league_id AND team_id = m.away_team_id;
+
+        expected_home := 1 / (1 + power(10, (away_before - (home_before + 50)) / 400));
+        IF m.final_score_home = m.final_score_away THEN
+            score_home := 0.5;
+            margin_weight := 1;
+        ELSIF m.final_score_home > m.final_score_away THEN
+            score_home := 1;
+            margin_weight := ln(m.final_score_home - m.final_score_away + 1) * 2.2
+                / (((home_before + 50) - away_before) * 0.001 + 2.2);
+        ELSE
+            score_home := 0;
+            margin_weight := ln(m.final_score_away - m.final_score_home + 1) * 2.2
+                / ((away_before - (home_before + 50)) * 0.001 + 2.2);
+        END IF;
+        change := 20 * margin_weight * (score_home - expected_home);
+
+        INSERT INTO team_ratings (league_id, team_id, match_id, match_date, rating_before, rating)
+        VALUES
+            (m.league_id, m.home_team_id, m.id, m.match_date, home_before, home_before + change),
+            (m.league_id, m.away_team_id, m.id, m.match_date, away_before, away_before - change);
+
+        DELETE FROM current_ratings
+        WHERE league_id IS NOT DISTINCT FROM m.league_id AND team_id IN (m.home_team_id, m.away_team_id);
+        INSERT INTO current_ratings (league_id, team_id, rating)
+        VALUES
+            (m.league_id, m.home_team_id, home_before + change),
+            (m.league_id, m.away_team_id, away_before - change);
+    END LOOP;
+END $$;
+
+ANALYZE team_ratings;